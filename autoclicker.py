@@ -0,0 +1,123 @@
+"""
+Command-line entry point: `python -m autoclicker [--headless --profile FILE]`.
+
+Without --headless the graphical application is started. With --headless the click engine
+runs a profile straight away, without Tk, until the duration elapses, the mode finishes or
+Ctrl+C / SIGTERM is received.
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+
+from autoclicker_app import add_timer_arguments, add_record_arguments
+from backends import BACKENDS, DEFAULT_BACKEND
+from config import compile_settings
+from engine import ClickEngine, EngineObserver
+from timing import DEFAULT_TIMER
+
+STATUS_INTERVAL_S = 1.0 # How often headless mode prints the live counters
+
+
+class ConsoleObserver(EngineObserver):
+    """Prints engine events to the terminal and signals the end of the session."""
+    def __init__(self):
+        self.finished = threading.Event()
+        self.failed = False
+
+    def on_error(self, title: str, message: str):
+        self.failed = True
+        print(f"{title}: {message}", file=sys.stderr)
+
+    def on_session_finished(self, session_stats: dict):
+        self.finished.set()
+
+
+def load_profile(path: str) -> dict:
+    """
+    Reads a profile file: JSON in the shape of `AutoClickerUI.get_current_settings`, e.g.
+    {"active_config": "Use Left Click Settings", "left": {"mode": "Sabit", "peak_cps": 12, ...}}.
+
+    Raises:
+        ValueError: If the file can't be read or its settings are invalid.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            settings = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Profil okunamadı ({path}): {e}") from e
+    if not isinstance(settings, dict):
+        raise ValueError(f"Profil bir JSON nesnesi olmalı: {path}")
+    return settings
+
+
+def _start_cursor_listener(engine: ClickEngine):
+    # Optional: lets jittered clicks follow the cursor without a position query per click
+    try:
+        from pynput import mouse
+    except ImportError:
+        return None
+    listener = mouse.Listener(on_move=engine.cursor.on_move)
+    listener.daemon = True
+    listener.start()
+    return listener
+
+
+def run_headless(profile_path: str, duration: float | None, backend_name: str,
+                 timer_name: str = DEFAULT_TIMER, realtime: bool = False, record_path: str | None = None) -> int:
+    try:
+        config = compile_settings(load_profile(profile_path))
+    except ValueError as e:
+        print(f"Geçersiz Girdi: {e}", file=sys.stderr)
+        return 2
+
+    engine = ClickEngine(backend_name=backend_name, timer_name=timer_name, realtime=realtime, record_path=record_path)
+    engine.prepare()
+    observer = ConsoleObserver()
+    engine.add_observer(observer)
+    for button_config in config.buttons:
+        engine.set_mode(button_config.button, button_config.mode_name)
+    _start_cursor_listener(engine)
+    signal.signal(signal.SIGTERM, lambda signum, frame: engine.stop())
+
+    if not engine.start(config):
+        return 1
+    if duration:
+        timer = threading.Timer(duration, engine.stop)
+        timer.daemon = True
+        timer.start()
+    try:
+        while not observer.finished.wait(STATUS_INTERVAL_S):
+            snapshot = engine.telemetry.snapshot
+            print(f"Toplam Tıklama: {snapshot.click_count} | Anlık CPS: {snapshot.achieved_cps:.1f}")
+    except KeyboardInterrupt:
+        engine.stop()
+        observer.finished.wait()
+    print(f"Toplam Tıklama: {engine.click_count}")
+    return 1 if observer.failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gelişmiş Otomatik Tıklayıcı")
+    parser.add_argument('--headless', action='store_true', help="Arayüz olmadan bir profili çalıştır")
+    parser.add_argument('--profile', help="Profil dosyası (JSON); --headless ile gerekli")
+    parser.add_argument('--duration', type=float, help="Saniye cinsinden çalışma süresi (varsayılan: durdurulana kadar)")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=["auto", *BACKENDS],
+                        help="Tıklama arka ucu (varsayılan: en hızlı kullanılabilir olan)")
+    add_timer_arguments(parser)
+    add_record_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        import autoclicker_app
+        autoclicker_app.main(['--backend', args.backend, '--timer', args.timer] + (['--realtime'] if args.realtime else [])
+                             + (['--record', args.record] if args.record else []))
+        return 0
+    if not args.profile:
+        parser.error("--headless için --profile gerekli")
+    return run_headless(args.profile, args.duration, args.backend, args.timer, args.realtime, args.record)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,69 @@
 # This file is now the main entry point for the application.
-# It imports the AppCore and runs it.
+# It parses startup options, imports the AppCore and runs it.
+# Heavy dependencies (injection backend, NumPy, Perlin noise) are loaded on first use.
 
-from core import AppCore
+import time
+_LAUNCHED_AT = time.perf_counter() # Taken before any other import for the startup report
 
-if __name__ == "__main__":
-    app = AppCore()
+import argparse
+import threading
+
+from backends import BACKENDS, DEFAULT_BACKEND
+from telemetry import DEFAULT_UI_REFRESH_HZ
+from timing import WAITERS, DEFAULT_TIMER
+
+GUI_MODULES = ("core",) # Imported by main(); profiled by --startup-report
+
+
+def add_timer_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--timer', default=DEFAULT_TIMER, choices=list(WAITERS),
+                        help="Tıklama zamanlayıcısı; hrtimer: Linux'ta clock_nanosleep ve en düşük timer slack")
+    parser.add_argument('--realtime', action='store_true',
+                        help="hrtimer ile tıklama iş parçacığına izin verildiği kadar yüksek öncelik (SCHED_FIFO/nice) ver")
+
+
+def add_record_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--record', metavar='DOSYA',
+                        help="Her oturumun tıklamalarını bu ikili kayıt dosyasına yaz (python -m recorder DOSYA ile özetlenir)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gelişmiş Otomatik Tıklayıcı")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=["auto", *BACKENDS],
+                        help="Tıklama arka ucu (varsayılan: en hızlı kullanılabilir olan)")
+    add_timer_arguments(parser)
+    add_record_arguments(parser)
+    parser.add_argument('--ui-refresh-hz', type=float, default=DEFAULT_UI_REFRESH_HZ,
+                        help="Arayüz sayaçlarının yenilenme hızı (Hz)")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="Başlangıç süresini ve en yavaş importları yazdır")
+    return parser.parse_args(argv)
+
+
+def _print_startup_report(timer):
+    from startup import format_report
+    print(format_report(timer, GUI_MODULES))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    timer = None
+    if args.startup_report:
+        from startup import StartupTimer
+        timer = StartupTimer(_LAUNCHED_AT)
+    from core import AppCore
+    if timer: timer.mark("importlar")
+    app = AppCore(ui_refresh_hz=args.ui_refresh_hz, backend_name=args.backend,
+                  timer_name=args.timer, realtime=args.realtime, record_path=args.record)
+    if timer:
+        timer.mark("arayüz")
+        def on_idle():
+            timer.mark("ilk boşta")
+            # The import profile runs a child interpreter; keep the window responsive meanwhile
+            threading.Thread(target=_print_startup_report, args=(timer,), daemon=True).start()
+        app.ui.after_idle(on_idle)
     app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import os
+import sys
+import time
+from collections import deque
+
+DEFAULT_BACKEND = "auto"
+# Order in which "auto" tries backends: lowest per-click overhead first
+AUTO_ORDER = ("xtest", "pynput", "pyautogui")
+# How long after its injection the mouse listener may still report an event back. Kept below
+# the click interval: an announcement the listener missed must expire before the next
+# injection, or it would shift every later match onto the user's own clicks.
+SELF_EVENT_WINDOW_S = 0.02
+
+
+class ClickBackend:
+    """Base class for input-injection backends used by the click loop."""
+    name = "base"
+
+    def position(self) -> tuple[int, int]:
+        """Returns the current cursor position."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def click(self, x: int, y: int, button: str):
+        """Moves the cursor to (x, y) and clicks `button` ('left' or 'right')."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def click_here(self, button: str):
+        """Clicks `button` wherever the cursor is. Backends override this to skip the position query."""
+        x, y = self.position()
+        self.click(x, y, button)
+
+    def press(self, button: str):
+        """Presses `button` down where the cursor is, for clicks that hold the button."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def release(self, button: str):
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def close(self):
+        """Releases any native resources."""
+        pass
+
+
+class PyAutoGUIBackend(ClickBackend):
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        pyautogui.PAUSE = 0
+        pyautogui.FAILSAFE = False
+        self._pyautogui = pyautogui
+
+    def position(self) -> tuple[int, int]:
+        pos = self._pyautogui.position()
+        return pos.x, pos.y
+
+    def click(self, x: int, y: int, button: str):
+        self._pyautogui.click(x=x, y=y, button=button)
+
+    # click_here keeps the base implementation: pyautogui resolves the cursor position on
+    # every click internally anyway.
+
+    def press(self, button: str):
+        self._pyautogui.mouseDown(button=button)
+
+    def release(self, button: str):
+        self._pyautogui.mouseUp(button=button)
+
+
+class PynputBackend(ClickBackend):
+    """Drives a pynput `mouse.Controller` directly, skipping pyautogui's per-call bookkeeping."""
+    name = "pynput"
+
+    def __init__(self):
+        from pynput import mouse
+        self._controller = mouse.Controller()
+        self._buttons = {'left': mouse.Button.left, 'right': mouse.Button.right}
+
+    def position(self) -> tuple[int, int]:
+        x, y = self._controller.position
+        return int(x), int(y)
+
+    def click(self, x: int, y: int, button: str):
+        controller = self._controller
+        controller.position = (x, y)
+        controller.click(self._buttons[button], 1)
+
+    def click_here(self, button: str):
+        self._controller.click(self._buttons[button], 1)
+
+    def press(self, button: str):
+        self._controller.press(self._buttons[button])
+
+    def release(self, button: str):
+        self._controller.release(self._buttons[button])
+
+
+class XTestBackend(ClickBackend):
+    """Injects through the X11 XTest extension via ctypes (Linux/X11 only)."""
+    name = "xtest"
+    _BUTTONS = {'left': 1, 'right': 3}
+
+    def __init__(self):
+        if not sys.platform.startswith('linux') or not os.environ.get('DISPLAY'):
+            raise RuntimeError("XTest için bir X11 oturumu (DISPLAY) gerekli.")
+        import ctypes # Imported here so startup doesn't pay for it unless XTest is used
+        import ctypes.util
+        xlib_path = ctypes.util.find_library('X11')
+        xtst_path = ctypes.util.find_library('Xtst')
+        if not xlib_path or not xtst_path:
+            raise RuntimeError("libX11/libXtst bulunamadı.")
+        self._xlib = ctypes.CDLL(xlib_path)
+        self._xtst = ctypes.CDLL(xtst_path)
+
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xlib.XQueryPointer.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong,
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint)]
+        self._xlib.XFlush.argtypes = [ctypes.c_void_p]
+        self._xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        self._xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise RuntimeError("X11 ekranı açılamadı.")
+        self._root = self._xlib.XDefaultRootWindow(self._display)
+        # Reused out-parameters so position() allocates nothing per call
+        self._root_x, self._root_y = ctypes.c_int(), ctypes.c_int()
+        out_params = (ctypes.c_ulong(), ctypes.c_ulong(), self._root_x, self._root_y,
+                      ctypes.c_int(), ctypes.c_int(), ctypes.c_uint())
+        self._query_args = (self._display, self._root, *(ctypes.byref(param) for param in out_params))
+        self._out_params = out_params # Keeps the byref targets alive
+
+    def position(self) -> tuple[int, int]:
+        self._xlib.XQueryPointer(*self._query_args)
+        return self._root_x.value, self._root_y.value
+
+    def click(self, x: int, y: int, button: str):
+        display = self._display
+        xtst = self._xtst
+        xtst.XTestFakeMotionEvent(display, -1, x, y, 0)
+        xtst.XTestFakeButtonEvent(display, self._BUTTONS[button], True, 0)
+        xtst.XTestFakeButtonEvent(display, self._BUTTONS[button], False, 0)
+        self._xlib.XFlush(display)
+
+    def click_here(self, button: str):
+        display = self._display
+        self._xtst.XTestFakeButtonEvent(display, self._BUTTONS[button], True, 0)
+        self._xtst.XTestFakeButtonEvent(display, self._BUTTONS[button], False, 0)
+        self._xlib.XFlush(display)
+
+    def press(self, button: str):
+        self._xtst.XTestFakeButtonEvent(self._display, self._BUTTONS[button], True, 0)
+        self._xlib.XFlush(self._display)
+
+    def release(self, button: str):
+        self._xtst.XTestFakeButtonEvent(self._display, self._BUTTONS[button], False, 0)
+        self._xlib.XFlush(self._display)
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class NullBackend(ClickBackend):
+    """Injects nothing; optionally records clicks. Used by tests and benchmarks."""
+    name = "null"
+
+    def __init__(self, record: bool = False, cursor: tuple[int, int] = (0, 0)):
+        self.record = record
+        self.cursor = cursor
+        self.click_count = 0
+        self.clicks = [] # (x, y, button) when recording
+        self.pressed = set() # Buttons currently held down
+
+    def position(self) -> tuple[int, int]:
+        return self.cursor
+
+    def click(self, x: int, y: int, button: str):
+        self.click_count += 1
+        if self.record:
+            self.clicks.append((x, y, button))
+
+    def click_here(self, button: str):
+        self.click_count += 1
+        if self.record:
+            self.clicks.append((self.cursor[0], self.cursor[1], button))
+
+    def press(self, button: str):
+        self.pressed.add(button)
+
+    def release(self, button: str):
+        # A press/release pair counts as one click
+        self.pressed.discard(button)
+        self.click_here(button)
+
+
+class CursorTracker:
+    """
+    Latest cursor position pushed by the mouse listener's move events.
+
+    Lets the click thread read the cursor without a position query (an X server round-trip
+    on X11) before every jittered click. `position` is None until the first event arrives.
+    """
+    def __init__(self):
+        self.position = None
+
+    def on_move(self, x, y):
+        self.position = (int(x), int(y)) # A single reference swap; safe to read from other threads
+
+
+class InjectedClickFilter:
+    """
+    Recognises the engine's own clicks when the global mouse listener reports them back.
+
+    The click thread announces every injection with `expect` just before making it; the
+    listener thread calls `is_own` for each button event, which consumes the oldest announced
+    press or release of that button. Announcements expire against their own time, so one
+    event the listener never reports can't make later real clicks look injected. Each button
+    has a deque appended by the click thread and popped by the listener thread (both atomic),
+    so neither side needs a lock and `is_own` is amortized O(1).
+    """
+    def __init__(self, window_s: float = SELF_EVENT_WINDOW_S):
+        self.window_s = window_s
+        self._announced = {} # button -> deque of perf_counter() per announced press/release
+        self.suppressed = 0 # Listener events recognised as our own (listener thread)
+        self.expired = 0 # Announced events the listener never reported in time (listener thread)
+
+    def expect(self, button: str, events: int = 2):
+        """Announces an injection of `events` button events (a click is a press and a release)."""
+        announced = self._announced.get(button)
+        if announced is None:
+            announced = self._announced[button] = deque()
+        now = time.perf_counter()
+        for _ in range(events):
+            announced.append(now)
+
+    def is_own(self, button: str) -> bool:
+        """Listener side: True if this press/release of `button` (e.g. 'left') was injected by us."""
+        announced = self._announced.get(button)
+        if not announced:
+            return False
+        stale_before = time.perf_counter() - self.window_s
+        while announced and announced[0] < stale_before:
+            # The listener missed it (or isn't seeing injected events): forget it
+            announced.popleft()
+            self.expired += 1
+        if not announced:
+            return False
+        announced.popleft()
+        self.suppressed += 1
+        return True
+
+    def format_summary(self) -> str:
+        return f"dinleyicide elenen {self.suppressed}, eşleşmeyen {self.expired}"
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "pynput": PynputBackend,
+    "xtest": XTestBackend,
+    "null": NullBackend,
+}
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> ClickBackend:
+    """
+    Creates an injection backend by name; "auto" picks the fastest one that works here.
+
+    Raises:
+        ValueError: If the name is unknown.
+        RuntimeError: If the requested backend can't be used on this system.
+    """
+    if name == "auto":
+        errors = []
+        for candidate in AUTO_ORDER:
+            try:
+                return BACKENDS[candidate]()
+            except (ImportError, OSError, RuntimeError) as e:
+                errors.append(f"{candidate}: {e}")
+        raise RuntimeError("Kullanılabilir tıklama arka ucu yok (" + "; ".join(errors) + ")")
+
+    backend_class = BACKENDS.get(name)
+    if not backend_class:
+        raise ValueError(f"Unknown click backend: {name}")
+    try:
+        return backend_class()
+    except (ImportError, OSError) as e:
+        raise RuntimeError(f"{name} arka ucu kullanılamıyor: {e}") from e
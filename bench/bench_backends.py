@@ -0,0 +1,81 @@
+"""
+Per-backend injection latency: time spent in position() and click() per call.
+
+Run from the project root:
+    python -m bench.bench_backends [--clicks N] [--live] [--json]
+
+Only the null backend is measured by default. --live also measures the real backends,
+which WILL click wherever the cursor is, so point it somewhere harmless first.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backends import BACKENDS, get_backend
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(name: str, clicks: int) -> dict:
+    try:
+        backend = get_backend(name)
+    except (ValueError, RuntimeError) as e:
+        return {'backend': name, 'available': False, 'error': str(e)}
+    perf_counter = time.perf_counter
+    position_us, click_us = [], []
+    try:
+        for _ in range(clicks):
+            started = perf_counter()
+            x, y = backend.position()
+            positioned = perf_counter()
+            backend.click(x, y, 'left')
+            clicked = perf_counter()
+            position_us.append((positioned - started) * 1e6)
+            click_us.append((clicked - positioned) * 1e6)
+    finally:
+        backend.close()
+    position_us.sort()
+    click_us.sort()
+    return {
+        'backend': name,
+        'available': True,
+        'clicks': clicks,
+        'position_p50_us': _percentile(position_us, 0.5),
+        'position_p99_us': _percentile(position_us, 0.99),
+        'click_p50_us': _percentile(click_us, 0.5),
+        'click_p99_us': _percentile(click_us, 0.99),
+        'click_mean_us': statistics.fmean(click_us),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clicks', type=int, default=2000)
+    parser.add_argument('--live', action='store_true', help="Also measure real backends (performs real clicks)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    names = list(BACKENDS) if args.live else ["null"]
+    results = [measure(name, args.clicks) for name in names]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        if not result['available']:
+            print(f"{result['backend']:>10}: kullanılamıyor ({result['error']})")
+            continue
+        print(f"{result['backend']:>10}: position p50 {result['position_p50_us']:.1f} µs / p99 {result['position_p99_us']:.1f} µs, "
+              f"click p50 {result['click_p50_us']:.1f} µs / p99 {result['click_p99_us']:.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Headless benchmark of the click loop: every click mode driven by ClickScheduler into the null backend.
+
+Run from the project root:
+    python -m bench.bench_modes [--duration S] [--cps N [N ...]] [--modes NAME ...] [--timer NAME] [--json]
+
+Per mode and CPS target it reports the achieved rate, p50/p99 interval error (actual minus
+scheduled time between consecutive clicks), p50/p99 lateness against the absolute deadline,
+the wakeup latency of the timed sleeps (p50/p99 histogram bucket), the per-click Python
+overhead (loop time not spent waiting) and the process CPU usage. --timer selects the waiter.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backends import NullBackend
+from click_modes import get_click_mode, enable_numpy, REPLAY_SEQUENTIAL
+from recorder import SessionRecorder, open_trace
+from scheduler import ClickScheduler, ClickTrack
+from timing import DeadlineWaiter, WAITERS, DEFAULT_TIMER, get_waiter_class
+
+MODES = ("Sabit", "Dalgalı (Sinüs)", "Patlama", "Gerçekçi (Perlin)", "Rastgele Aralık", "Pattern (Desen)",
+         "Kayıt Tekrarı")
+TRACE_CLICKS = 256 # Clicks of the synthetic trace replayed by Kayıt Tekrarı (it loops)
+_trace_directory = None # Temporary directory of the synthetic traces, removed at exit
+
+
+class _TimedWaiter:
+    """Wraps the waiter under test and accumulates the time spent waiting (sleeping and spinning)."""
+    def __init__(self, waiter):
+        self.waiter = waiter
+        self.wakeups = waiter.wakeups
+        self.waited = 0.0
+
+    def wait_until(self, deadline: float) -> bool:
+        started = time.perf_counter()
+        try:
+            return self.waiter.wait_until(deadline)
+        finally:
+            self.waited += time.perf_counter() - started
+
+
+class _HeadlessHost:
+    """Stands in for ClickEngine: the modes only call back to stop the session or report errors."""
+    def __init__(self, stop_event: threading.Event):
+        self._stop_event = stop_event
+        self.stop_after_cycle = False
+
+    def stop_clicking(self):
+        self._stop_event.set()
+
+    def stop_clicking_after_current_cycle(self):
+        self.stop_after_cycle = True
+
+    def report_error(self, title: str, message: str):
+        print(f"{title}: {message}", file=sys.stderr)
+
+
+def _synthetic_trace(cps: float) -> str:
+    """Writes a trace averaging `cps`, with intervals alternating ±20% like uneven human clicks."""
+    global _trace_directory
+    if _trace_directory is None:
+        _trace_directory = tempfile.TemporaryDirectory(prefix="bench-trace-")
+    path = os.path.join(_trace_directory.name, f"trace-{cps:g}.clk")
+    times_ns, now_ns = [], 0
+    for index in range(TRACE_CLICKS):
+        times_ns.append(now_ns)
+        now_ns += int(1e9 / cps * (1.2 if index % 2 else 0.8))
+    # Synthetic timestamps instead of the real clock
+    recorder = SessionRecorder(path, capacity=TRACE_CLICKS, backups=0, clock=iter(times_ns).__next__)
+    recorder.open()
+    for _ in times_ns:
+        recorder.record('left', 0, 0, 0.0)
+    recorder.close()
+    return path
+
+
+def _params(mode_name: str, cps: float, duration: float) -> dict:
+    params = {'peak_cps': cps, 'timing_rand_ms': 0, 'jitter_px': 0, 'mode': mode_name}
+    if mode_name == "Patlama":
+        params['burst_duration'] = duration
+    elif mode_name == "Rastgele Aralık":
+        params['min_cps_random'] = cps * 0.5
+        params['max_cps_random'] = cps
+    elif mode_name == "Pattern (Desen)":
+        params['click_pattern'] = "-".join(str(round(1000.0 / cps * f)) for f in (1.0, 0.5, 1.5))
+    elif mode_name == "Kayıt Tekrarı":
+        params['trace_path'] = _synthetic_trace(cps)
+        params['trace'] = open_trace(params['trace_path']) # As config validation does
+        params['replay_speed'] = 1.0
+        params['replay_order'] = REPLAY_SEQUENTIAL
+    return params
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_mode(mode_name: str, cps: float, duration: float, waiter_class=DeadlineWaiter) -> dict:
+    stop_event = threading.Event()
+    host = _HeadlessHost(stop_event)
+    backend = NullBackend()
+    track = ClickTrack('left', _params(mode_name, cps, duration), get_click_mode(mode_name, host))
+    scheduler = ClickScheduler([track], lambda stop_event: _TimedWaiter(waiter_class(stop_event)))
+
+    deadlines, fired = [], []
+    def on_click(track, current_cps):
+        # The producer has already moved next_deadline on; the stats hold this click's deadline
+        deadlines.append(track.stats.last_deadline)
+        fired.append(track.stats.last_fired)
+
+    def inject(button, jitter_x, jitter_y):
+        if jitter_x or jitter_y:
+            x, y = backend.position()
+            backend.click(x + jitter_x, y + jitter_y, button)
+        else:
+            backend.click_here(button)
+
+    timer = threading.Timer(duration, stop_event.set)
+    timer.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    reason = scheduler.run(stop_event, inject, on_click, lambda: host.stop_after_cycle)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    timer.cancel()
+
+    interval_errors = sorted(abs((f1 - f0) - (d1 - d0)) * 1000.0
+                             for d0, d1, f0, f1 in zip(deadlines, deadlines[1:], fired, fired[1:]))
+    lateness = sorted((f - d) * 1000.0 for d, f in zip(deadlines, fired))
+    summary = track.stats.summary()
+    clicks = summary['clicks']
+    waited = scheduler.waiter.waited if scheduler.waiter else 0.0
+    return {
+        'mode': mode_name,
+        'target_cps': cps,
+        'duration_s': wall,
+        'end': reason,
+        'clicks': clicks,
+        'scheduled_cps': summary['scheduled_cps'],
+        'achieved_cps': summary['achieved_cps'],
+        'interval_error_p50_ms': _percentile(interval_errors, 0.5),
+        'interval_error_p99_ms': _percentile(interval_errors, 0.99),
+        'lateness_p50_ms': _percentile(lateness, 0.5),
+        'lateness_p99_ms': _percentile(lateness, 0.99),
+        'resyncs': summary['resyncs'],
+        'late_commands': scheduler.queue.late,
+        'dropped_commands': scheduler.queue.dropped,
+        'wakeup_p50_us': scheduler.waiter.wakeups.percentile_us(0.5) if scheduler.waiter else 0.0,
+        'wakeup_p99_us': scheduler.waiter.wakeups.percentile_us(0.99) if scheduler.waiter else 0.0,
+        'overhead_per_click_us': (wall - waited) / clicks * 1e6 if clicks else 0.0,
+        'cpu_percent': cpu / wall * 100.0 if wall > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=2.0, help="Seconds per mode and CPS target")
+    parser.add_argument('--cps', type=float, nargs='+', default=[20.0, 100.0])
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES, metavar='MODE')
+    parser.add_argument('--timer', default=DEFAULT_TIMER, choices=list(WAITERS), help="Click-thread timer under test")
+    parser.add_argument('--realtime', action='store_true', help="Raise the click thread's priority (hrtimer only)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    enable_numpy() # Same as the app after its first start
+    waiter_class = get_waiter_class(args.timer, args.realtime)
+    results = [run_mode(mode_name, cps, args.duration, waiter_class) for cps in args.cps for mode_name in args.modes]
+    if args.json:
+        print(json.dumps({'python': sys.version.split()[0], 'timer': args.timer, 'realtime': args.realtime,
+                          'results': results}, indent=2))
+        return
+    for r in results:
+        print(f"{r['mode']:>18} @ {r['target_cps']:>6.1f}: {r['clicks']:>5} tıklama, {r['achieved_cps']:7.2f} CPS "
+              f"(plan {r['scheduled_cps']:.2f}), aralık hatası p50 {r['interval_error_p50_ms']:.3f} / "
+              f"p99 {r['interval_error_p99_ms']:.3f} ms, uyanma p50 ≤{r['wakeup_p50_us']:.0f} / "
+              f"p99 ≤{r['wakeup_p99_us']:.0f} µs, ek yük {r['overhead_per_click_us']:.1f} µs, "
+              f"CPU %{r['cpu_percent']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,75 @@
-import time
 import random
-import math
-from perlin_noise import PerlinNoise
+from array import array
+from collections import deque
+from typing import NamedTuple, Sequence
+from patterns import PatternProgram, compile_pattern
+from recorder import ClickTrace, open_trace
+from rates import RateCurve, SineRate, PiecewiseLinearRate
+
+# Both are imported on first use so application startup doesn't pay for them:
+PerlinNoise = None # gradient_noise.PerlinNoise, when the Perlin mode is first created
+np = None # NumPy, once enable_numpy() has been called; schedules fall back to pure Python arrays without it
+_rng = None
+
+MIN_CPS = 0.1 # Lower clamp for a requested rate
+MIN_DELAY_S = 0.001 # Lower bound of a single inter-click interval
+
+# Step orders of the Kayıt Tekrarı mode
+REPLAY_SEQUENTIAL = "Sıralı" # The captured steps in order, looping at the end
+REPLAY_RESAMPLE = "Yeniden Örnekle" # Steps drawn at random from the whole trace
+REPLAY_ORDERS = (REPLAY_SEQUENTIAL, REPLAY_RESAMPLE)
+
+
+def enable_numpy() -> bool:
+    """Imports NumPy for vectorized schedules. Returns False if it isn't installed."""
+    global np, _rng
+    if np is None:
+        try:
+            import numpy
+        except ImportError: # NumPy is optional
+            return False
+        np, _rng = numpy, numpy.random.default_rng()
+    return True
+
+def _new_noise(octaves: int):
+    global PerlinNoise
+    if PerlinNoise is None:
+        # Built-in backend; its gradients are hashed from the seed, so a reset allocates no tables
+        from gradient_noise import PerlinNoise
+    return PerlinNoise(octaves=octaves, seed=random.randint(1, 1000))
+
+
+class ClickSchedule(NamedTuple):
+    """A precomputed chunk of clicks. Sequences are NumPy arrays when available, `array.array` otherwise."""
+    cps: Sequence[float] # Requested CPS of each click (for display)
+    intervals: Sequence[float] # Seconds from each click to the next, timing randomness included
+    jitter_x: Sequence[int]
+    jitter_y: Sequence[int]
+    finished: bool # True if the mode ends the session after these clicks
+    buttons: Sequence[int] | None = None # Per-click patterns.STEP_* button codes; None: the track's button
+    holds: Sequence[float] | None = None # Per-click seconds to hold the button down; None: plain clicks
+
+
+def _uniform_values(low: float, high: float, n: int):
+    if np is not None:
+        return _rng.uniform(low, high, n)
+    return array('d', [random.uniform(low, high) for _ in range(n)])
+
+def _randint_values(low: int, high: int, n: int):
+    """n random integers in [low, high], inclusive like random.randint."""
+    if np is not None:
+        return _rng.integers(low, high, n, endpoint=True)
+    return array('l', [random.randint(low, high) for _ in range(n)])
+
+def _intervals_from_cps(cps_values, offsets):
+    if np is not None:
+        return np.maximum(MIN_DELAY_S, 1.0 / cps_values + offsets)
+    return array('d', [max(MIN_DELAY_S, 1.0 / cps + offset) for cps, offset in zip(cps_values, offsets)])
+
+def _timing_offsets(params: dict, n: int):
+    rand_s = params['timing_rand_ms'] / 1000.0
+    return _uniform_values(-rand_s, rand_s, n)
+
 
 class ClickMode:
     """Base class for all click modes."""
@@ -27,17 +95,87 @@ class ClickMode:
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        """
+        Precomputes up to `n` clicks in bulk so the click loop only consumes ready values.
+
+        The default implementation walks `get_next_action`; modes override it with
+        vectorized versions where they can.
+
+        Args:
+            params (dict): Dictionary of parameters for the click mode.
+            n (int): Number of clicks to generate.
+            start_time (float): Scheduled elapsed time of the first click in the chunk.
+
+        Returns:
+            ClickSchedule: May hold fewer than `n` clicks if the mode finished.
+        """
+        rand_s = params['timing_rand_ms'] / 1000.0
+        cps_values, intervals = array('d'), array('d')
+        jitter_x, jitter_y = array('l'), array('l')
+        elapsed = start_time
+        finished = False
+        for _ in range(n):
+            current_cps, jx, jy, _ = self.get_next_action(params, elapsed)
+            if current_cps <= 0:
+                finished = True
+                break
+            current_cps = max(MIN_CPS, current_cps)
+            interval = max(MIN_DELAY_S, 1.0 / current_cps + random.uniform(-rand_s, rand_s))
+            cps_values.append(current_cps)
+            intervals.append(interval)
+            jitter_x.append(int(jx))
+            jitter_y.append(int(jy))
+            elapsed += interval
+            self.time_counter += interval * 0.5
+        return ClickSchedule(cps_values, intervals, jitter_x, jitter_y, finished)
+
+    def rewind(self, intervals):
+        """
+        Takes back the state advanced for generated clicks that were never fired (their
+        `intervals`), so a session that switches params mid-chunk continues seamlessly.
+        """
+        # generate_schedule advances time_counter by half of every interval it generates
+        self.time_counter -= sum(intervals) * 0.5
+
+    def _schedule_from_rate(self, params: dict, n: int, start_time: float, curve: RateCurve) -> ClickSchedule:
+        """
+        Builds a schedule following a rate curve: each click comes when ∫λ has grown by one
+        since the previous one (see rates.py). The mode ends with the curve.
+        """
+        offsets = _timing_offsets(params, n).tolist()
+        cps_values, intervals = array('d'), array('d')
+        elapsed = start_time
+        end = curve.end
+        finished = False
+        for offset in offsets:
+            if elapsed >= end:
+                finished = True
+                break
+            # The last click before the end waits out the rest of the curve
+            next_click = min(curve.next_click(elapsed), end)
+            interval = max(MIN_DELAY_S, next_click - elapsed + offset)
+            cps_values.append(max(MIN_CPS, curve.rate(elapsed)))
+            intervals.append(interval)
+            elapsed += interval
+        count = len(cps_values)
+        jitter_intensity = params['jitter_px']
+        return ClickSchedule(cps_values, intervals,
+                             _randint_values(-jitter_intensity, jitter_intensity, count),
+                             _randint_values(-jitter_intensity, jitter_intensity, count),
+                             finished)
+
     def reset(self):
         """Resets any internal state of the click mode."""
         self.time_counter = 0.0
         # Re-seed noises for variety if desired, or keep them for consistency
         # Only initialize if they were used
         if self.noise_x:
-            self.noise_x = PerlinNoise(octaves=4, seed=random.randint(1, 1000))
+            self.noise_x = _new_noise(4)
         if self.noise_y:
-            self.noise_y = PerlinNoise(octaves=4, seed=random.randint(1, 1000))
+            self.noise_y = _new_noise(4)
         if self.noise_cps:
-            self.noise_cps = PerlinNoise(octaves=2, seed=random.randint(1, 1000))
+            self.noise_cps = _new_noise(2)
 
 
 class SabitMode(ClickMode):
@@ -49,20 +187,44 @@ class SabitMode(ClickMode):
         jitter_y = random.randint(-jitter_intensity, jitter_intensity)
         return current_cps, jitter_x, jitter_y, 1.0
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        current_cps = max(MIN_CPS, params['peak_cps'])
+        jitter_intensity = params['jitter_px']
+        if np is not None:
+            cps_values = np.full(n, current_cps)
+        else:
+            cps_values = array('d', [current_cps]) * n
+        return ClickSchedule(cps_values, _intervals_from_cps(cps_values, _timing_offsets(params, n)),
+                             _randint_values(-jitter_intensity, jitter_intensity, n),
+                             _randint_values(-jitter_intensity, jitter_intensity, n),
+                             False)
+
 class DalgalıSinüsMode(ClickMode):
-    def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
+    @staticmethod
+    def _wave_curve(params: dict) -> SineRate:
         peak_cps = params['peak_cps']
+        return SineRate(peak_cps, peak_cps * 0.25, 1.5)
+
+    @classmethod
+    def _wave_rate(cls, params: dict, elapsed_time: float) -> float:
+        return cls._wave_curve(params).rate(elapsed_time)
+
+    def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
         jitter_intensity = params['jitter_px']
-        fluctuation = math.sin(elapsed_time * 1.5) * (peak_cps * 0.25)
-        current_cps = peak_cps + fluctuation
+        current_cps = self._wave_rate(params, elapsed_time)
         jitter_x = random.randint(-jitter_intensity, jitter_intensity)
         jitter_y = random.randint(-jitter_intensity, jitter_intensity)
         return current_cps, jitter_x, jitter_y, 1.0
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        # The rate depends on the running elapsed time, so only the random parts are vectorized
+        return self._schedule_from_rate(params, n, start_time, self._wave_curve(params))
+
 class PatlamaMode(ClickMode):
-    def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
+    @staticmethod
+    def _burst_curve(params: dict) -> PiecewiseLinearRate:
+        """The ramp-up / peak / ramp-down burst, ending with the burst."""
         peak_cps = params['peak_cps']
-        jitter_intensity = params['jitter_px']
         duration = params.get('burst_duration', 5.0) # Default to 5s if not provided
 
         # Ensure ramp_time is not zero to avoid division by zero
@@ -76,15 +238,19 @@ class PatlamaMode(ClickMode):
             peak_time = 0
             ramp_time = duration / 2
 
+        return PiecewiseLinearRate([(0.0, 0.0), (ramp_time, peak_cps), (ramp_time + peak_time, peak_cps),
+                                    (ramp_time * 2 + peak_time, 0.0)])
 
-        current_cps = 0
-        if elapsed_time < ramp_time:
-            current_cps = (elapsed_time / ramp_time) * peak_cps
-        elif elapsed_time < ramp_time + peak_time:
-            current_cps = peak_cps
-        elif elapsed_time < duration:
-            current_cps = (1 - (elapsed_time - ramp_time - peak_time) / ramp_time) * peak_cps
-        else:
+    @classmethod
+    def _burst_rate(cls, params: dict, elapsed_time: float) -> float | None:
+        """Rate of the burst, or None once the burst is over."""
+        curve = cls._burst_curve(params)
+        return curve.rate(elapsed_time) if elapsed_time < curve.end else None
+
+    def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
+        jitter_intensity = params['jitter_px']
+        current_cps = self._burst_rate(params, elapsed_time)
+        if current_cps is None:
             # Signal to stop clicking after burst is complete
             # This can be done by returning a CPS of 0 or a special flag
             # For now, let's have the core app handle stopping via this signal
@@ -95,13 +261,18 @@ class PatlamaMode(ClickMode):
         jitter_y = random.randint(-jitter_intensity, jitter_intensity)
         return current_cps, jitter_x, jitter_y, 1.0
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        # The end of the burst is reported through ClickSchedule.finished rather than by
+        # requesting a stop from app_core, which would cut off clicks still queued ahead.
+        return self._schedule_from_rate(params, n, start_time, self._burst_curve(params))
+
 class GerçekçiPerlinMode(ClickMode):
     def __init__(self, app_core):
         super().__init__(app_core)
         # Initialize Perlin noise generators for this mode
-        self.noise_x = PerlinNoise(octaves=4, seed=random.randint(1, 1000))
-        self.noise_y = PerlinNoise(octaves=4, seed=random.randint(1, 1000))
-        self.noise_cps = PerlinNoise(octaves=2, seed=random.randint(1, 1000))
+        self.noise_x = _new_noise(4)
+        self.noise_y = _new_noise(4)
+        self.noise_cps = _new_noise(2)
 
     def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
         peak_cps = params['peak_cps']
@@ -119,6 +290,36 @@ class GerçekçiPerlinMode(ClickMode):
         # The core loop will update self.time_counter using the actual_delay
         return current_cps, jitter_x, jitter_y, 1.0
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        peak_cps = params['peak_cps']
+        jitter_intensity = params['jitter_px']
+        offsets = _timing_offsets(params, n).tolist()
+
+        # The CPS noise feeds back into the time axis, so it is walked step by step...
+        noise_cps = self.noise_cps
+        times = array('d')
+        cps_values, intervals = array('d'), array('d')
+        time_counter = self.time_counter
+        for offset in offsets:
+            current_cps = max(MIN_CPS, peak_cps + noise_cps(time_counter) * (peak_cps * 0.4))
+            interval = max(MIN_DELAY_S, 1.0 / current_cps + offset)
+            times.append(time_counter)
+            cps_values.append(current_cps)
+            intervals.append(interval)
+            time_counter += interval * 0.5
+        self.time_counter = time_counter
+
+        # ...while both jitter axes are sampled in one vectorized pass over the same time points
+        jitter_x = self.noise_x.sample_many(times)
+        jitter_y = self.noise_y.sample_many(times)
+        if np is not None:
+            jitter_x = (np.asarray(jitter_x) * jitter_intensity).astype(np.int64)
+            jitter_y = (np.asarray(jitter_y) * jitter_intensity).astype(np.int64)
+        else:
+            jitter_x = array('l', [int(v * jitter_intensity) for v in jitter_x])
+            jitter_y = array('l', [int(v * jitter_intensity) for v in jitter_y])
+        return ClickSchedule(cps_values, intervals, jitter_x, jitter_y, False)
+
 class RandomIntervalClickMode(ClickMode):
     def __init__(self, app_core):
         super().__init__(app_core)
@@ -141,76 +342,198 @@ class RandomIntervalClickMode(ClickMode):
 
         return current_cps, jitter_x, jitter_y, 1.0
 
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        min_cps = params.get('min_cps_random', 5.0)
+        max_cps = params.get('max_cps_random', params['peak_cps'])
+        jitter_intensity = params['jitter_px']
+        if min_cps <= 0 or max_cps <= 0 or min_cps > max_cps:
+            min_cps = max_cps = params['peak_cps']
+        cps_values = _uniform_values(max(MIN_CPS, min_cps), max(MIN_CPS, max_cps), n)
+        return ClickSchedule(cps_values, _intervals_from_cps(cps_values, _timing_offsets(params, n)),
+                             _randint_values(-jitter_intensity, jitter_intensity, n),
+                             _randint_values(-jitter_intensity, jitter_intensity, n),
+                             False)
+
 class PatternClickMode(ClickMode):
+    """Follows a compiled click pattern (see patterns.py), cycling through its steps."""
     def __init__(self, app_core):
         super().__init__(app_core)
-        self.pattern_delays = []
         self.current_pattern_index = 0
 
-    def _parse_pattern(self, pattern_str: str):
+    def _program(self, params: dict) -> PatternProgram | None:
+        """The compiled pattern: precompiled by settings validation, else compiled (and cached) here."""
+        program = params.get('pattern_program')
+        if program is not None:
+            return program
         try:
-            parsed_delays = [float(delay) / 1000.0 for delay in pattern_str.split('-') if delay.strip()]
-            if not parsed_delays:
-                # This case handles patterns like " - " or "" or "abc" if float conversion fails early for all parts
-                self.app_core.ui.show_error("Pattern Hatası", "Pattern boş veya geçersiz karakterler içeriyor.\nÖrnek: 100-50-200")
-                self.pattern_delays = [] # Ensure it's empty
-                self.app_core.stop_clicking() # Signal core to stop
-                return False # Indicate parsing failed
-            self.pattern_delays = parsed_delays
-            return True # Indicate parsing succeeded
-        except ValueError: # Catches float conversion errors for parts like "abc" in "100-abc-50"
-            self.app_core.ui.show_error("Pattern Hatası", "Pattern sayısal olmayan değerler içeriyor veya format hatalı.\nÖrnek: 100-50-200")
-            self.pattern_delays = [] # Ensure it's empty
+            return compile_pattern(params.get('click_pattern', "100"))
+        except ValueError as e:
+            self.app_core.report_error("Pattern Hatası", f"Pattern geçersiz: {e}\nÖrnek: 100-50-200, 100x5-(80~120)x2")
             self.app_core.stop_clicking() # Signal core to stop
-            return False # Indicate parsing failed
-
+            return None
 
     def reset(self):
         super().reset()
         self.current_pattern_index = 0
-        self.pattern_delays = [] # Clear parsed pattern on reset
+
+    def rewind(self, intervals):
+        self.current_pattern_index -= len(intervals) # Wrapped by the next generate_schedule
 
     def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
-        if not self.pattern_delays:
-            pattern_string = params.get('click_pattern', "100")
-            if not self._parse_pattern(pattern_string) or not self.pattern_delays:
-                 # Parsing failed and set pattern_delays to [], or it was already empty.
-                 # stop_clicking was already called by _parse_pattern if it failed there.
-                 return 0,0,0,1.0 # Signal stop to click loop immediately
+        program = self._program(params)
+        if program is None:
+            return 0,0,0,1.0 # Signal stop to click loop immediately
+
+        index = self.current_pattern_index % len(program)
+        delay_for_this_step = program.delay_min[index] + program.delay_span[index] * random.random()
+        # This mode directly controls delay, so CPS is derived.
+        current_cps = 1.0 / max(MIN_DELAY_S, delay_for_this_step)
+
+        jitter_intensity = params['jitter_px']
+        jitter_x = random.randint(-jitter_intensity, jitter_intensity)
+        jitter_y = random.randint(-jitter_intensity, jitter_intensity)
 
-        # If self.pattern_delays is still empty here, it means parsing failed or yielded no valid delays.
-        if not self.pattern_delays:
-            return 0,0,0,1.0 # Should have been caught above, but as a safeguard.
+        self.current_pattern_index = (index + 1) % len(program)
+        return current_cps, jitter_x, jitter_y, 1.0
 
-        delay_for_this_step = self.pattern_delays[self.current_pattern_index]
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        program = self._program(params)
+        if program is None:
+            return ClickSchedule(array('d'), array('d'), array('l'), array('l'), True)
 
-        if delay_for_this_step <= 0: # Avoid division by zero if pattern has invalid delay
-            current_cps = 1000 # Effectively, a very short delay
+        length = len(program)
+        first = self.current_pattern_index % length
+        self.current_pattern_index = (first + n) % length
+        offsets = _timing_offsets(params, n)
+        jitter_intensity = params['jitter_px']
+        jitter_x = _randint_values(-jitter_intensity, jitter_intensity, n)
+        jitter_y = _randint_values(-jitter_intensity, jitter_intensity, n)
+
+        if np is not None:
+            steps = (first + np.arange(n)) % length
+            delays = np.take(program.delay_min, steps)
+            if program.has_ranges:
+                delays = delays + np.take(program.delay_span, steps) * _rng.random(n)
+            delays = np.maximum(MIN_DELAY_S, delays)
+            intervals = np.maximum(MIN_DELAY_S, delays + offsets)
+            buttons = np.take(program.buttons, steps) if program.has_buttons else None
+            holds = np.take(program.holds, steps) if program.has_holds else None
+            return ClickSchedule(1.0 / delays, intervals, jitter_x, jitter_y, False, buttons, holds)
+
+        steps = [(first + i) % length for i in range(n)]
+        delay_min, delay_span = program.delay_min, program.delay_span
+        if program.has_ranges:
+            delays = [max(MIN_DELAY_S, delay_min[step] + delay_span[step] * random.random()) for step in steps]
         else:
-            current_cps = 1.0 / delay_for_this_step
+            delays = [max(MIN_DELAY_S, delay_min[step]) for step in steps]
+        return ClickSchedule(array('d', [1.0 / delay for delay in delays]),
+                             array('d', [max(MIN_DELAY_S, delay + offset) for delay, offset in zip(delays, offsets)]),
+                             jitter_x, jitter_y, False,
+                             array('b', [program.buttons[step] for step in steps]) if program.has_buttons else None,
+                             array('d', [program.holds[step] for step in steps]) if program.has_holds else None)
+
+
+class TraceReplayMode(ClickMode):
+    """
+    Replays the intervals and cursor movements of a captured human click trace (see
+    recorder.ClickCapture), in order or resampled, sped up or slowed down by 'replay_speed'.
+    The captured cursor travel is limited to 'jitter_px', so with jitter 0 (the default) only
+    the intervals are replayed and the cursor stays put.
+    """
+    RESAMPLE_ATTEMPTS = 32 # Random draws before falling back to the next replayable step
+    HISTORY = 256 # Trace steps of the latest generated clicks, enough to rewind a chunk plus the queue
+
+    def __init__(self, app_core):
+        super().__init__(app_core)
+        self.trace_index = 0
+        self._recent_steps = deque(maxlen=self.HISTORY)
+
+    def _trace(self, params: dict) -> ClickTrace | None:
+        """The trace opened by settings validation, else opened (and cached) here."""
+        trace = params.get('trace')
+        if trace is not None:
+            return trace
+        try:
+            return open_trace(params.get('trace_path', ""))
+        except ValueError as e:
+            self.app_core.report_error("Kayıt Tekrarı Hatası", str(e))
+            self.app_core.stop_clicking()
+            return None
+
+    def reset(self):
+        super().reset()
+        self.trace_index = 0
+        self._recent_steps.clear()
+
+    def rewind(self, intervals):
+        for _ in range(min(len(intervals), len(self._recent_steps))):
+            self.trace_index = self._recent_steps.pop()
+
+    def _next_step(self, trace: ClickTrace, resample: bool) -> tuple[float, int, int]:
+        length = len(trace)
+        start = self.trace_index
+        if resample:
+            for _ in range(self.RESAMPLE_ATTEMPTS):
+                start = random.randrange(length)
+                step = trace.step(start)
+                if step is not None:
+                    self._recent_steps.append(start)
+                    return step
+        # Validated traces have at least one replayable step, so this finds one
+        for offset in range(length):
+            index = (start + offset) % length
+            step = trace.step(index)
+            if step is not None:
+                self._recent_steps.append(index)
+                if not resample:
+                    self.trace_index = index + 1
+                return step
+        raise ValueError(f"Kayıtta tekrarlanabilir tıklama aralığı yok: {trace.path}")
 
+    def get_next_action(self, params: dict, elapsed_time: float) -> tuple[float, int, int, float]:
+        trace = self._trace(params)
+        if trace is None:
+            return 0,0,0,1.0 # Signal stop to click loop immediately
+        interval, dx, dy = self._next_step(trace, params.get('replay_order') == REPLAY_RESAMPLE)
         jitter_intensity = params['jitter_px']
-        jitter_x = random.randint(-jitter_intensity, jitter_intensity)
-        jitter_y = random.randint(-jitter_intensity, jitter_intensity)
+        return (params.get('replay_speed', 1.0) / interval,
+                max(-jitter_intensity, min(jitter_intensity, dx)),
+                max(-jitter_intensity, min(jitter_intensity, dy)), 1.0)
 
-        self.current_pattern_index = (self.current_pattern_index + 1) % len(self.pattern_delays)
+    def generate_schedule(self, params: dict, n: int, start_time: float = 0.0) -> ClickSchedule:
+        trace = self._trace(params)
+        if trace is None:
+            return ClickSchedule(array('d'), array('d'), array('l'), array('l'), True)
 
-        # This mode directly controls delay, so CPS is derived.
-        # The core loop's delay calculation will use this CPS.
-        return current_cps, jitter_x, jitter_y, 1.0
+        speed = params.get('replay_speed', 1.0)
+        resample = params.get('replay_order') == REPLAY_RESAMPLE
+        jitter_intensity = params['jitter_px']
+        cps_values, intervals = array('d'), array('d')
+        jitter_x, jitter_y = array('l'), array('l')
+        for offset in _timing_offsets(params, n).tolist():
+            interval, dx, dy = self._next_step(trace, resample)
+            interval /= speed
+            cps_values.append(1.0 / interval)
+            intervals.append(max(MIN_DELAY_S, interval + offset))
+            # The captured cursor travel, limited to the jitter intensity
+            jitter_x.append(max(-jitter_intensity, min(jitter_intensity, dx)))
+            jitter_y.append(max(-jitter_intensity, min(jitter_intensity, dy)))
+        return ClickSchedule(cps_values, intervals, jitter_x, jitter_y, False)
 
 
 # Factory to get click mode instances
+CLICK_MODES = {
+    "Sabit": SabitMode,
+    "Dalgalı (Sinüs)": DalgalıSinüsMode,
+    "Patlama": PatlamaMode,
+    "Gerçekçi (Perlin)": GerçekçiPerlinMode,
+    "Rastgele Aralık": RandomIntervalClickMode,
+    "Pattern (Desen)": PatternClickMode,
+    "Kayıt Tekrarı": TraceReplayMode,
+}
+
 def get_click_mode(mode_name: str, app_core) -> ClickMode:
-    modes = {
-        "Sabit": SabitMode,
-        "Dalgalı (Sinüs)": DalgalıSinüsMode,
-        "Patlama": PatlamaMode,
-        "Gerçekçi (Perlin)": GerçekçiPerlinMode,
-        "Rastgele Aralık": RandomIntervalClickMode,
-        "Pattern (Desen)": PatternClickMode,
-    }
-    mode_class = modes.get(mode_name)
+    mode_class = CLICK_MODES.get(mode_name)
     if not mode_class:
         raise ValueError(f"Unknown click mode: {mode_name}")
     return mode_class(app_core)
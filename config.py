@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
+
+from click_modes import CLICK_MODES, REPLAY_ORDERS, REPLAY_SEQUENTIAL
+from patterns import compile_pattern
+from recorder import open_trace
+
+CLICK_TYPE_LABELS = {'left': "Sol Tık", 'right': "Sağ Tık"}
+
+
+class ClickButton(str, Enum):
+    """Mouse button of a click track. Compares and hashes like its plain string value."""
+    LEFT = 'left'
+    RIGHT = 'right'
+
+
+# Buttons clicked by each "active_config" choice of the UI
+ACTIVE_CONFIG_BUTTONS = {
+    "Use Left Click Settings": (ClickButton.LEFT,),
+    "Use Right Click Settings": (ClickButton.RIGHT,),
+    "Use Both Settings": (ClickButton.LEFT, ClickButton.RIGHT),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ButtonConfig:
+    """Validated settings of one button, compiled once per start."""
+    button: ClickButton
+    mode_name: str
+    params: Mapping # Read-only view of the converted parameters the click modes consume
+
+
+@dataclass(frozen=True, slots=True)
+class ClickConfig:
+    """Immutable, validated snapshot of everything a session needs."""
+    active_config: str
+    buttons: tuple[ButtonConfig, ...] # Active buttons only, left first
+
+
+def validate_click_params(settings: dict, click_type_for_error: str) -> dict:
+    """
+    Validates and converts a single set of raw settings (left or right).
+
+    Args:
+        settings (dict): Raw values as read from the UI or a profile file (strings or numbers).
+        click_type_for_error (str): Label used in error messages, e.g. "Sol Tık".
+
+    Returns:
+        dict: Converted parameters for the click modes.
+
+    Raises:
+        ValueError: If a value is missing, malformed or out of range.
+    """
+    try:
+        params = {
+            'peak_cps': float(settings['peak_cps']),
+            'timing_rand_ms': int(settings['timing_rand_ms']),
+            'jitter_px': int(settings['jitter_px']),
+            'mode': settings['mode']
+        }
+        if params['peak_cps'] <=0: raise ValueError(f"{click_type_for_error} CPS pozitif olmalı.")
+        if params['timing_rand_ms'] < 0: raise ValueError(f"{click_type_for_error} Zamanlama rastgeleliği negatif olamaz.")
+        if params['jitter_px'] < 0: raise ValueError(f"{click_type_for_error} Jitter yoğunluğu negatif olamaz.")
+
+        if params['mode'] == 'Patlama':
+            params['burst_duration'] = float(settings['burst_duration'])
+            if params['burst_duration'] <= 0: raise ValueError(f"{click_type_for_error} Patlama süresi pozitif olmalı.")
+        elif params['mode'] == 'Rastgele Aralık':
+            params['min_cps_random'] = float(settings['min_cps_random'])
+            params['max_cps_random'] = float(settings['max_cps_random'])
+            if params['min_cps_random'] <= 0 or params['max_cps_random'] <= 0:
+                raise ValueError(f"{click_type_for_error} Rastgele Aralık CPS değerleri pozitif olmalı.")
+            if params['min_cps_random'] > params['max_cps_random']:
+                raise ValueError(f"{click_type_for_error} Min CPS, Max CPS'den büyük olamaz.")
+        elif params['mode'] == 'Pattern (Desen)':
+            params['click_pattern'] = settings['click_pattern']
+            if not params['click_pattern'].strip():
+                raise ValueError(f"{click_type_for_error} Pattern boş olamaz.")
+            try:
+                params['pattern_program'] = compile_pattern(params['click_pattern'])
+            except ValueError as e:
+                raise ValueError(f"{click_type_for_error} Pattern geçersiz: {e}") from e
+        elif params['mode'] == 'Kayıt Tekrarı':
+            params['trace_path'] = settings['trace_path']
+            params['replay_speed'] = float(settings['replay_speed'])
+            params['replay_order'] = settings.get('replay_order', REPLAY_SEQUENTIAL)
+            if params['replay_speed'] <= 0: raise ValueError(f"{click_type_for_error} Tekrar hızı pozitif olmalı.")
+            if params['replay_order'] not in REPLAY_ORDERS:
+                raise ValueError(f"{click_type_for_error} bilinmeyen tekrar sırası: {params['replay_order']}")
+            try:
+                params['trace'] = open_trace(params['trace_path'])
+            except ValueError as e:
+                raise ValueError(f"{click_type_for_error} {e}") from e
+        return params
+    except KeyError as e:
+        raise ValueError(f"{click_type_for_error} ayarı eksik: {e}") from e
+    except TypeError as e:
+        raise ValueError(f"{click_type_for_error} ayarı geçersiz: {e}") from e
+
+
+def compile_settings(all_settings: dict) -> ClickConfig:
+    """
+    Validates the settings of the active configuration and compiles them into a ClickConfig.
+
+    Args:
+        all_settings (dict): {'active_config': ..., 'left': {...}, 'right': {...}}, the shape
+            returned by `AutoClickerUI.get_current_settings`.
+
+    Raises:
+        ValueError: If the active configuration or any of its settings is invalid.
+    """
+    active_config = all_settings.get('active_config')
+    if active_config not in ACTIVE_CONFIG_BUTTONS:
+        raise ValueError(f"Geçersiz aktif yapılandırma: {active_config}")
+    buttons = []
+    for button in ACTIVE_CONFIG_BUTTONS[active_config]:
+        label = CLICK_TYPE_LABELS[button.value]
+        params = validate_click_params(all_settings.get(button.value) or {}, label)
+        if params['mode'] not in CLICK_MODES:
+            raise ValueError(f"{label} bilinmeyen mod: {params['mode']}")
+        buttons.append(ButtonConfig(button, params['mode'], MappingProxyType(params)))
+    return ClickConfig(active_config, tuple(buttons))
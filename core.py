@@ -1,140 +1,107 @@
-import pyautogui
-pyautogui.PAUSE = 0
-pyautogui.FAILSAFE = False
-
-import threading
-import time
-import random
 import sys
+import time
+import tkinter as tk
 from pynput import keyboard, mouse # Added mouse
 
 from ui import (AutoClickerUI, STATUS_RUNNING, STATUS_IDLE, STATUS_STOPPED,
                 STATUS_ERROR, ASSIGN_KEY_PROMPT, KEY_NOT_ASSIGNED,
+                ACTIVATION_TOGGLE, ACTIVATION_HOLD, ACTIVATION_MODES,
                 COLOR_GREEN, COLOR_RED, COLOR_BLUE, COLOR_BLACK)
-from click_modes import get_click_mode
-
-class AppCore:
-    def __init__(self):
+from config import compile_settings, ACTIVE_CONFIG_BUTTONS
+from engine import ClickEngine, EngineObserver
+from telemetry import DEFAULT_UI_REFRESH_HZ
+from backends import DEFAULT_BACKEND
+from timing import DEFAULT_TIMER
+from profiles import ProfileStore, DEFAULT_PROFILE_PATH
+from recorder import ClickCapture
+from hotkeys import (compile_hotkeys, resolve, modifier_bits, DEFAULT_HOTKEYS, MODIFIER_KEYS, REPEATING_ACTIONS, CPS_NUDGE_STEP,
+                     ACTION_TOGGLE, ACTION_HOLD, ACTION_PROFILE, ACTION_CPS_UP, ACTION_CPS_DOWN,
+                     ACTION_STOP_AFTER_CYCLE, ACTION_EMERGENCY)
+
+class AppCore(EngineObserver):
+    """
+    Tkinter front end of the ClickEngine: global trigger/emergency listeners, settings
+    validation and status display. Engine events arrive on the click thread and are
+    handed over to the Tk main loop with `after`.
+    """
+    def __init__(self, ui_refresh_hz: float = DEFAULT_UI_REFRESH_HZ, backend_name: str = DEFAULT_BACKEND,
+                 profile_path: str = DEFAULT_PROFILE_PATH, timer_name: str = DEFAULT_TIMER, realtime: bool = False,
+                 record_path: str | None = None):
+        self.engine = ClickEngine(backend_name=backend_name, telemetry_hz=ui_refresh_hz,
+                                  timer_name=timer_name, realtime=realtime, record_path=record_path)
+        self.engine.add_observer(self)
+        self.engine.prepare() # Parks the click worker and loads the backend in the background
         self.ui = AutoClickerUI(self)
-        self.is_running = False
-        self.click_thread = None
         self.trigger_input = None # Can be keyboard.Key, keyboard.KeyCode, or mouse.Button
         self.is_assigning_key = False
-        self.click_count = 0
-        self._stop_requested_after_cycle = False
+        self.activation = ACTIVATION_TOGGLE
+        # Hotkeys as the listener threads see them: the compiled table (replaced, never
+        # mutated), the held modifier keys and their bits, and the bound inputs currently held down
+        self._hotkeys = {}
+        self._held_modifiers = set() # Input ids: left and right Ctrl share a bit, so keys are tracked
+        self._modifiers = 0
+        self._held = {} # Input id -> Hotkey resolved when it was pressed
+        self._hold_session = None # Input id of the held hotkey that started the current session
+
+        # Click counters are published by the click thread and polled by one Tk timer
+        self._ui_refresh_ms = max(1, int(1000 / ui_refresh_hz))
+        self._telemetry_job = None
+        self._last_telemetry_sequence = -1
+        self._compiled_settings = None # (raw UI settings, ClickConfig) of the last start
+        self._settings_job = None # Coalesces bursts of setting edits (e.g. dragging the CPS scale)
+        # The current settings compiled ahead of time (None while invalid), so the trigger can
+        # start the engine straight from the listener thread without reading Tk variables
+        self._armed_config = None
+        self._capture = None # ClickCapture fed by the mouse listener while real clicks are being recorded
+
+        self.profiles = ProfileStore(profile_path)
+        self._load_profiles()
+        self._refresh_armed_config()
+        self._rebuild_hotkeys()
+        self._start_listeners() # Starts both keyboard and mouse listeners
+        # Click modes are initialized by UI callbacks: the UI's __init__ calls
+        # on_mode_changed for both tabs via its own _on_mode_change.
 
-        # Click modes and params for left and right
-        self.left_click_mode = None
-        self.right_click_mode = None
-        self.active_click_params = {} # Will hold validated params for active configuration
+    @property
+    def is_running(self) -> bool:
+        return self.engine.is_running
 
-        self._start_listeners() # Starts both keyboard and mouse listeners
+    # --- EngineObserver (called on the engine's threads) ---
+    def on_state_changed(self, running: bool):
+        self.ui.after(0, self._handle_state_change, running)
 
-        # Initialize click modes for both left and right tabs
-        # The UI calls on_mode_changed during its __init__ for both tabs
-        # So, we can expect left_click_mode and right_click_mode to be set up.
-        # The UI's __init__ will call self.on_mode_changed for 'left' and 'right'
-        # via its own _on_mode_change, so direct calls here are not needed and
-        # could be premature if UI elements aren't fully ready.
-        pass # Click modes are initialized by UI callbacks.
+    def on_session_finished(self, session_stats: dict):
+        self.ui.after(0, self._handle_thread_completion)
 
+    def on_error(self, title: str, message: str):
+        self.ui.after(0, self.ui.show_error, title, message)
 
     def on_mode_changed(self, mode_name: str, click_type: str):
         """Handles changes in click mode for 'left' or 'right' click types."""
-        new_mode_instance = None
         ui_widgets = self.ui.left_click_widgets if click_type == 'left' else self.ui.right_click_widgets
         try:
-            new_mode_instance = get_click_mode(mode_name, self) # Pass self (AppCore)
+            self.engine.set_mode(click_type, mode_name)
         except ValueError as e:
             self.ui.show_error(f"{click_type.capitalize()} Mod Hatası", str(e))
             if ui_widgets.get('mode_combo'):
                  ui_widgets['mode_combo'].set("Sabit") # Fallback
                  try:
-                     new_mode_instance = get_click_mode("Sabit", self)
+                     self.engine.set_mode(click_type, "Sabit")
                  except ValueError:
                      print(f"APPCORE_CRITICAL: Fallback mode 'Sabit' for {click_type} also failed.")
+                     print(f"APPCORE_WARNING: No click mode set for {click_type} with mode_name '{mode_name}'.")
 
-        if click_type == 'left':
-            self.left_click_mode = new_mode_instance
-            if self.left_click_mode: self.left_click_mode.reset()
-        elif click_type == 'right':
-            self.right_click_mode = new_mode_instance
-            if self.right_click_mode: self.right_click_mode.reset()
-
-        if not new_mode_instance:
-            print(f"APPCORE_WARNING: No click mode set for {click_type} with mode_name '{mode_name}'.")
-
-
-    def _validate_specific_params(self, settings: dict, click_type_for_error: str) -> dict | None:
-        """Validates a single set of parameters (left or right)."""
-        try:
-            params = {
-                'peak_cps': float(settings['peak_cps']),
-                'timing_rand_ms': int(settings['timing_rand_ms']),
-                'jitter_px': int(settings['jitter_px']),
-                'mode': settings['mode']
-                # 'mouse_button_pref' is now 'active_config' at the global level
-            }
-            if params['peak_cps'] <=0: raise ValueError(f"{click_type_for_error} CPS pozitif olmalı.")
-            if params['timing_rand_ms'] < 0: raise ValueError(f"{click_type_for_error} Zamanlama rastgeleliği negatif olamaz.")
-            if params['jitter_px'] < 0: raise ValueError(f"{click_type_for_error} Jitter yoğunluğu negatif olamaz.")
-
-            if params['mode'] == 'Patlama':
-                params['burst_duration'] = float(settings['burst_duration'])
-                if params['burst_duration'] <= 0: raise ValueError(f"{click_type_for_error} Patlama süresi pozitif olmalı.")
-            elif params['mode'] == 'Rastgele Aralık':
-                params['min_cps_random'] = float(settings['min_cps_random'])
-                params['max_cps_random'] = float(settings['max_cps_random'])
-                if params['min_cps_random'] <= 0 or params['max_cps_random'] <= 0:
-                    raise ValueError(f"{click_type_for_error} Rastgele Aralık CPS değerleri pozitif olmalı.")
-                if params['min_cps_random'] > params['max_cps_random']:
-                    raise ValueError(f"{click_type_for_error} Min CPS, Max CPS'den büyük olamaz.")
-            elif params['mode'] == 'Pattern (Desen)':
-                params['click_pattern'] = settings['click_pattern']
-                if not params['click_pattern'].strip():
-                    raise ValueError(f"{click_type_for_error} Pattern boş olamaz.")
-            return params
-        except (ValueError, TypeError) as e:
-            self.ui.update_status_display(STATUS_ERROR, COLOR_RED, self.is_running)
-            self.ui.show_error(f"{click_type_for_error} Geçersiz Girdi", f"Lütfen ayarları kontrol edin.\nHata: {e}")
-            return None
-
-    def _get_validated_params(self) -> dict | None:
-        """Validates UI settings based on the active_config and returns them or None."""
-        all_settings = self.ui.get_current_settings()
-        active_config = all_settings['active_config']
-        validated_params = {'active_config': active_config, 'left': None, 'right': None}
-
-        if active_config == "Use Left Click Settings" or active_config == "Use Both Settings":
-            left_params = self._validate_specific_params(all_settings['left'], "Sol Tık")
-            if not left_params: return None
-            validated_params['left'] = left_params
-
-        if active_config == "Use Right Click Settings" or active_config == "Use Both Settings":
-            right_params = self._validate_specific_params(all_settings['right'], "Sağ Tık")
-            if not right_params: return None
-            validated_params['right'] = right_params
-
-        if active_config == "Use Both Settings" and (not validated_params['left'] or not validated_params['right']):
-            # This case should ideally be caught by individual validations, but as a safeguard:
-            self.ui.show_error("Hata", "Her iki tıklama ayarı da 'Use Both Settings' için geçerli olmalıdır.")
-            return None
-        if active_config == "Use Left Click Settings" and not validated_params['left']:
-             return None # Error already shown by _validate_specific_params
-        if active_config == "Use Right Click Settings" and not validated_params['right']:
-             return None # Error already shown
-
-        return validated_params
-
-
-    def _set_program_state(self, running: bool):
-        self.is_running = running
-        status_text = ""
-        color = COLOR_BLACK
+    def _handle_state_change(self, running: bool):
+        if running: # Started from the UI or straight from the trigger listener
+            self.ui.update_click_count(0)
+            self._schedule_telemetry_refresh()
+        self._show_program_state()
 
+    def _show_program_state(self):
+        running = self.engine.is_running
         if running:
             color = COLOR_GREEN
-            active_config = self.active_click_params.get('active_config', "")
+            active_config = self.engine.config.active_config if self.engine.config else ""
             if active_config == "Use Left Click Settings":
                 status_text = "Durum: SOL TIK ÇALIŞIYOR"
             elif active_config == "Use Right Click Settings":
@@ -144,204 +111,263 @@ class AppCore:
             else: # Fallback, though should ideally not be reached if params are validated
                 status_text = STATUS_RUNNING
         else:
-            status_text = STATUS_STOPPED if self.click_thread and self.click_thread.is_alive() else STATUS_IDLE
-            # Check if click_thread is None or not alive for STATUS_IDLE vs STATUS_STOPPED
-            # self.click_thread is set to None when it finishes or is never started.
-            # If stop_clicking is called, thread might still be alive for a moment.
-            # A more robust way might be to check if it was ever started and now is_running is false.
-            # For simplicity, this check is okay.
-            if not self.click_thread or not self.click_thread.is_alive():
-                 # If thread is None or not alive, and we are setting state to not running,
-                 # it means it was either never started (IDLE) or has finished (so effectively IDLE for next start).
-                 # However, if stop_clicking() was just called, self.is_running is False, but thread might be finishing.
-                 # The current logic: if thread exists, it's STOPPED, else IDLE.
-                 status_text = STATUS_IDLE # Let's refine: if not running, and thread is None or done, it's IDLE.
-                 if self.click_thread and self.click_thread.is_alive(): # This state is transient
-                     status_text = STATUS_STOPPED
-                 elif self.click_thread is not None and not self.click_thread.is_alive(): # Thread has finished
-                      status_text = STATUS_STOPPED # After running, it's stopped
-                      # self.click_thread = None # Clean up thread object once it's done
-                 # This part becomes tricky. Let's simplify:
-                 # If running is false:
-                 # If a click_thread object exists (even if finishing): Durduruldu
-                 # If no click_thread object (never run or finished and cleaned): Beklemede
-            if self.click_thread is None: # Never started or fully stopped and cleaned
-                 status_text = STATUS_IDLE
-            else: # Has run or is running and told to stop
-                 status_text = STATUS_STOPPED
-
-
-        self.ui.update_status_display(status_text, color, self.is_running)
+            color = COLOR_BLACK
+            # Never started or fully finished: idle; told to stop but still winding down: stopped
+            status_text = STATUS_IDLE if self.engine.click_thread is None else STATUS_STOPPED
+        self.ui.update_status_display(status_text, color, running)
 
     def start_clicking(self):
-        if self.is_running: return
+        if self.engine.is_running: return
+        if self._capture is not None:
+            self.ui.show_warning("Kayıt", "Tıklamayı başlatmadan önce insan tıklaması kaydını bitirin.")
+            return
         if not self.trigger_input: # Changed from trigger_key
             self.ui.show_warning("Hata", "Lütfen önce bir tetikleyici atayın (tuş veya fare)!")
             return
 
-        self.active_click_params = self._get_validated_params()
-        if not self.active_click_params: return
+        try:
+            config = self._compile_settings()
+        except ValueError as e:
+            self.ui.update_status_display(STATUS_ERROR, COLOR_RED, self.engine.is_running)
+            self.ui.show_error("Geçersiz Girdi", f"Lütfen ayarları kontrol edin.\nHata: {e}")
+            return
 
-        # Reset relevant click modes
-        if self.active_click_params.get('left') and self.left_click_mode:
-            self.left_click_mode.reset()
-        if self.active_click_params.get('right') and self.right_click_mode:
-            self.right_click_mode.reset()
+        self.engine.start(config) # The UI follows through on_state_changed
 
-        if (self.active_click_params['active_config'] == "Use Left Click Settings" and not self.left_click_mode) or \
-           (self.active_click_params['active_config'] == "Use Right Click Settings" and not self.right_click_mode) or \
-           (self.active_click_params['active_config'] == "Use Both Settings" and (not self.left_click_mode or not self.right_click_mode)):
-            self.ui.show_error("Hata", "Aktif tıklama için mod(lar) seçilemedi/yüklenemedi.")
-            return
+    def on_setting_changed(self):
+        """Called by the UI whenever a setting is edited."""
+        if self._settings_job is None:
+            self._settings_job = self.ui.after_idle(self._apply_changed_settings)
 
-        self.click_count = 0
-        self.ui.update_click_count(self.click_count)
-        self._set_program_state(True)
-        self._stop_requested_after_cycle = False
+    def _apply_changed_settings(self):
+        self._settings_job = None
+        config = self._refresh_armed_config()
+        # Only CPS, timing randomness and jitter stay editable while running
+        if config is not None and self.engine.is_running and config is not self.engine.config:
+            self.engine.apply_config(config)
 
-        self.click_thread = threading.Thread(target=self._click_loop, daemon=True)
-        self.click_thread.start()
+    def _refresh_armed_config(self):
+        try:
+            self._armed_config = self._compile_settings()
+        except ValueError:
+            self._armed_config = None # Probably still being typed; a running session keeps its settings
+        return self._armed_config
+
+    def _compile_settings(self):
+        # Recompiled only when the UI settings differ from the last start
+        settings = self.ui.get_current_settings()
+        if self._compiled_settings is None or self._compiled_settings[0] != settings:
+            self._compiled_settings = (settings, compile_settings(settings))
+        return self._compiled_settings[1]
+
+    # --- Profiles ---
+    def _load_profiles(self):
+        try:
+            self.profiles.load()
+        except ValueError as e:
+            print(f"APPCORE_WARNING: {e}")
+            self.ui.show_warning("Profil", f"{e}\nDosya korunuyor; bu oturumda profiller kaydedilmeyecek.")
+        self.ui.update_profile_list(self.profiles.names(), self.profiles.last_used)
+        if self.profiles.last_used:
+            self._apply_profile(self.profiles.get(self.profiles.last_used))
 
-    def _click_loop(self):
-        start_time = time.time()
-        # For "Use Both Settings", keep track of which click is next
-        next_click_is_left = True
-        # Timers for independent CPS when 'Both' is active. Not perfectly independent yet with single loop.
-        # This is a simplified approach. True independent timing would need separate threads or more complex async logic.
-        last_left_click_time = start_time
-        last_right_click_time = start_time
+    def _save_profiles(self) -> bool:
+        try:
+            self.profiles.save()
+            return True
+        except (OSError, ValueError) as e: # ValueError: the existing file couldn't be loaded
+            self.ui.show_error("Profil Hatası", f"Profiller kaydedilemedi.\nHata: {e}")
+            return False
+
+    def save_profile(self, name: str):
+        profile = self.ui.get_current_settings()
+        if self.trigger_input:
+            profile['trigger'] = self._input_id(self.trigger_input)
+        profile['activation'] = self.activation
+        try:
+            self.profiles.put(name, profile)
+        except ValueError as e:
+            self.ui.show_warning("Profil", str(e))
+            return
+        self._save_profiles()
+        self.ui.update_profile_list(self.profiles.names(), self.profiles.last_used)
 
-        while self.is_running:
-            if self._stop_requested_after_cycle:
-                self.ui.after(0, self.stop_clicking)
-                break
+    def delete_profile(self, name: str):
+        if name not in self.profiles.profiles: return
+        self.profiles.delete(name)
+        self._save_profiles()
+        self.ui.update_profile_list(self.profiles.names(), self.profiles.last_used)
 
-            try:
-                current_time = time.time()
-                elapsed_total_time = current_time - start_time
-
-                active_config = self.active_click_params['active_config']
-
-                params_to_use = None
-                click_mode_to_use = None
-                button_to_press = None
-                time_since_last_of_type = 0
-
-                if active_config == "Use Left Click Settings":
-                    params_to_use = self.active_click_params['left']
-                    click_mode_to_use = self.left_click_mode
-                    button_to_press = 'left'
-                    time_since_last_of_type = elapsed_total_time # Simplified for single click type
-                elif active_config == "Use Right Click Settings":
-                    params_to_use = self.active_click_params['right']
-                    click_mode_to_use = self.right_click_mode
-                    button_to_press = 'right'
-                    time_since_last_of_type = elapsed_total_time # Simplified
-                elif active_config == "Use Both Settings":
-                    if next_click_is_left:
-                        params_to_use = self.active_click_params['left']
-                        click_mode_to_use = self.left_click_mode
-                        button_to_press = 'left'
-                        time_since_last_of_type = current_time - last_left_click_time
-                    else:
-                        params_to_use = self.active_click_params['right']
-                        click_mode_to_use = self.right_click_mode
-                        button_to_press = 'right'
-                        time_since_last_of_type = current_time - last_right_click_time
-                else: # Should not happen
-                    self.ui.after(0, self.stop_clicking)
-                    break
-
-                if not params_to_use or not click_mode_to_use:
-                    print("Error: Params or click mode not available in loop.")
-                    self.ui.after(0, self.stop_clicking)
-                    break
-
-                current_cps, jitter_x, jitter_y, _ = click_mode_to_use.get_next_action(params_to_use, time_since_last_of_type)
-
-                if current_cps <= 0:
-                    if self.is_running: self.ui.after(0, self.stop_clicking)
-                    break
-
-                current_cps = max(0.1, current_cps)
-
-                # Determine click_type_str for UI update
-                click_type_str = ""
-                if active_config == "Use Left Click Settings":
-                    click_type_str = "Sol"
-                elif active_config == "Use Right Click Settings":
-                    click_type_str = "Sağ"
-                elif active_config == "Use Both Settings":
-                    click_type_str = "Sol" if button_to_press == 'left' else "Sağ"
-
-                self.ui.after(0, self.ui.update_realtime_cps, current_cps, click_type_str)
-
-
-                pos = pyautogui.position()
-                pyautogui.click(x=pos.x + int(jitter_x), y=pos.y + int(jitter_y), button=button_to_press)
-
-                self.click_count += 1
-                self.ui.after(0, self.ui.update_click_count, self.click_count)
-
-                # Update last click time for the type just performed
-                if active_config == "Use Both Settings":
-                    if button_to_press == 'left':
-                        last_left_click_time = current_time
-                    else:
-                        last_right_click_time = current_time
-                    next_click_is_left = not next_click_is_left # Alternate for next iteration
-
-                base_delay = 1.0 / current_cps
-                rand_delay_ms = params_to_use['timing_rand_ms']
-                rand_delay_s = random.uniform(-rand_delay_ms / 1000.0, rand_delay_ms / 1000.0)
-                actual_delay = max(0.001, base_delay + rand_delay_s)
-
-                # If "Both" are active, the delay should ideally be managed to respect both CPS.
-                # This simplified alternating approach uses the delay of the *current* click performed.
-                # A more advanced system might calculate delays to interleave based on individual target CPS.
-
-                target_time = time.perf_counter() + actual_delay
-                while time.perf_counter() < target_time:
-                    if not self.is_running: break
-
-                if hasattr(click_mode_to_use, 'time_counter') and isinstance(click_mode_to_use.time_counter, float):
-                    if current_cps > 0: click_mode_to_use.time_counter += actual_delay * 0.5
-
-            except Exception as e:
-                print(f"Click Loop Hatası: {e}")
-                self.ui.after(0, self.stop_clicking) # Ensure UI updates on main thread
-                break
-        # Ensure state is updated if loop exits unexpectedly
-        if self.is_running: # Check if still running before attempting to update UI
-            self.ui.after(0, self._set_program_state, False)
-        self.ui.after(0, self._handle_thread_completion) # Ensure cleanup
+    def load_profile(self, name: str):
+        """Applies a saved profile; a running session switches to it without stopping."""
+        try:
+            profile = self.profiles.get(name)
+        except KeyError:
+            return
+        self.profiles.last_used = name
+        self.ui.update_profile_list(self.profiles.names(), name)
+        self._apply_profile(profile)
+        if self.profiles.load_error is None: # Otherwise every switch would report the refused save
+            self._save_profiles()
+
+    def load_profile_at(self, index: int):
+        names = self.profiles.names()
+        if index < len(names):
+            self.load_profile(names[index])
+
+    def _apply_profile(self, profile: dict):
+        self.ui.apply_settings(profile) # Also selects the profile's modes through on_mode_changed
+        trigger = self._input_from_id(profile.get('trigger'))
+        if trigger is not None:
+            self.trigger_input = trigger
+            self.ui.update_trigger_key_display(self._format_input_name(trigger), True)
+        if profile.get('activation') in ACTIVATION_MODES:
+            self.set_activation(profile['activation'])
+        self._rebuild_hotkeys()
+        if not self.engine.is_running: return
+        try:
+            config = self._compile_settings()
+        except ValueError as e:
+            self.ui.show_error("Geçersiz Girdi", f"Profil uygulanamadı, önceki ayarlarla devam ediliyor.\nHata: {e}")
+            return
+        if self.engine.apply_config(config):
+            self._show_program_state()
+
+    # --- Capturing real clicks for the Kayıt Tekrarı mode ---
+    def toggle_capture(self, path: str):
+        if self._capture is not None:
+            self.stop_capture()
+        elif not self.engine.is_running: # The engine's own clicks must not end up in the trace
+            self.start_capture(path)
+
+    def start_capture(self, path: str):
+        capture = ClickCapture(path)
+        try:
+            capture.open()
+        except OSError as e:
+            self.ui.show_error("Kayıt Hatası", f"Kayıt dosyası açılamadı.\nHata: {e}")
+            return
+        self._capture = capture
+        self.ui.update_capture_state(True)
 
+    def stop_capture(self):
+        capture, self._capture = self._capture, None
+        if capture is None: return
+        try:
+            capture.close()
+        except OSError as e:
+            print(f"APPCORE_WARNING: Capture could not be closed cleanly: {e}")
+        self.ui.update_capture_state(False)
+        print(f"Kayıt: {capture.count} tıklama -> {capture.recorder.path}")
+        # Opening the capture unmapped the cached traces: compile them again, with the new recording
+        self._compiled_settings = None
+        self._refresh_armed_config()
+
+    def _schedule_telemetry_refresh(self):
+        if self._telemetry_job is not None:
+            self.ui.after_cancel(self._telemetry_job)
+        self._telemetry_job = self.ui.after(self._ui_refresh_ms, self._refresh_telemetry)
+
+    def _refresh_telemetry(self):
+        """Copies the latest click-thread snapshot to the UI; reschedules itself while running."""
+        self._telemetry_job = None
+        snapshot = self.engine.telemetry.snapshot
+        if snapshot.sequence != self._last_telemetry_sequence:
+            self._last_telemetry_sequence = snapshot.sequence
+            self.ui.update_realtime_cps(snapshot.achieved_cps, snapshot.label, snapshot.target_cps)
+            self.ui.update_rate_stats(snapshot.rates)
+            self.ui.update_click_count(snapshot.click_count)
+        if self.engine.is_running:
+            self._telemetry_job = self.ui.after(self._ui_refresh_ms, self._refresh_telemetry)
 
     def _handle_thread_completion(self):
-        """Called when the click_thread finishes."""
-        # Check if the thread object exists and is the one that just finished
-        if self.click_thread is not None and not self.click_thread.is_alive():
-            self.click_thread = None
-        # Re-evaluate program state, which might transition to IDLE if not already
-        if not self.is_running: # Ensure is_running is indeed false
-            self._set_program_state(False)
-
+        """Runs on the Tk thread once the click thread has finished."""
+        if not self.engine.is_running:
+            self._refresh_telemetry() # Flush the final counters of the finished session
+        self._show_program_state()
 
     def stop_clicking(self):
-        if not self.is_running: return
-        self._set_program_state(False) # This sets self.is_running to False
-        # The click_thread will see self.is_running is False and exit.
-        # _handle_thread_completion will then be called.
+        self.engine.stop()
 
     def stop_clicking_after_current_cycle(self):
-        self._stop_requested_after_cycle = True
+        self.engine.stop_clicking_after_current_cycle()
 
     def toggle_clicking(self):
-        if self.is_running:
+        if self.engine.is_running:
             self.stop_clicking()
         else:
             self.start_clicking()
 
+    def nudge_cps(self, step: float):
+        """cps+ / cps- hotkeys: moves the CPS of the active tab(s); a running session follows live."""
+        active_config = self.ui.get_current_settings()['active_config']
+        for button in ACTIVE_CONFIG_BUTTONS.get(active_config, ()):
+            self.ui.nudge_cps(button.value, step)
+
+    def set_activation(self, activation: str):
+        if activation not in ACTIVATION_MODES: return
+        self.activation = activation
+        self.ui.update_activation_display(activation)
+        self._rebuild_hotkeys()
+
+    def _rebuild_hotkeys(self):
+        """Recompiles the listeners' hotkey table after the bindings, trigger or activation changed."""
+        trigger_action = ACTION_HOLD if self.activation == ACTIVATION_HOLD else ACTION_TOGGLE
+        trigger_id = self._input_id(self.trigger_input)
+        bindings = self.profiles.hotkeys if self.profiles.hotkeys is not None else DEFAULT_HOTKEYS
+        try:
+            self._hotkeys = compile_hotkeys(bindings, trigger_id, trigger_action)
+        except ValueError as e:
+            print(f"APPCORE_WARNING: {e} Varsayılan kısayollar kullanılıyor.")
+            self._hotkeys = compile_hotkeys(DEFAULT_HOTKEYS, trigger_id, trigger_action)
+
+    def _toggle_from_listener(self, triggered_at: float):
+        """
+        Trigger pressed, on the listener thread: starts or stops the engine directly instead
+        of waiting for the Tk event loop. Anything that needs a dialog goes through Tk.
+        """
+        self._hold_session = None # A toggled session is not ended by releasing a hold hotkey
+        if self.engine.is_running:
+            self.engine.stop()
+        else:
+            self._start_from_listener(triggered_at)
+
+    def _start_from_listener(self, triggered_at: float):
+        config = self._armed_config
+        if config is None or self._capture is not None:
+            self.ui.after(0, self.start_clicking) # Reports what's wrong
+            return
+        self.engine.start(config, triggered_at)
+
+    def _on_hotkey_press(self, input_id: str, hotkey, pressed_at: float):
+        """A bound input pressed, on a listener thread. Clicking is started/stopped right here."""
+        if input_id in self._held and hotkey.action not in REPEATING_ACTIONS:
+            return # Key auto-repeat
+        self._held[input_id] = hotkey
+        action = hotkey.action
+        if action == ACTION_TOGGLE:
+            self._toggle_from_listener(pressed_at)
+        elif action == ACTION_HOLD:
+            if not self.engine.is_running: # Else the session isn't this press's to end on release
+                self._hold_session = input_id
+                self._start_from_listener(pressed_at)
+        elif action == ACTION_STOP_AFTER_CYCLE:
+            self.engine.stop_clicking_after_current_cycle()
+        # The rest changes settings or the UI, so it goes through Tk
+        elif action == ACTION_PROFILE:
+            self.ui.after(0, self.load_profile_at, hotkey.profile_index)
+        elif action == ACTION_CPS_UP:
+            self.ui.after(0, self.nudge_cps, CPS_NUDGE_STEP)
+        elif action == ACTION_CPS_DOWN:
+            self.ui.after(0, self.nudge_cps, -CPS_NUDGE_STEP)
+        elif action == ACTION_EMERGENCY:
+            self.ui.after(0, self.emergency_shutdown)
+
+    def _on_input_release(self, input_id: str):
+        if self._held.pop(input_id, None) is not None and self._hold_session == input_id:
+            self._hold_session = None
+            self.engine.stop() # The click worker wakes immediately, mid-wait
+
     def set_assign_mode(self):
         self.is_assigning_key = True
         self.ui.update_trigger_key_display(ASSIGN_KEY_PROMPT, False)
@@ -357,6 +383,31 @@ class AppCore:
             return f"MOUSE_{input_obj.name.upper()}"
         return "ATANMADI" # Fallback
 
+    def _input_id(self, input_obj) -> str | None:
+        """Stable text id of a trigger, as stored in profiles."""
+        if isinstance(input_obj, keyboard.Key):
+            return f"key:{input_obj.name}"
+        elif isinstance(input_obj, keyboard.KeyCode):
+            return f"char:{input_obj.char}" if input_obj.char else f"vk:{input_obj.vk}"
+        elif isinstance(input_obj, mouse.Button):
+            return f"mouse:{input_obj.name}"
+        return None
+
+    def _input_from_id(self, input_id: str | None):
+        kind, _, name = (input_id or "").partition(":")
+        try:
+            if kind == "key":
+                return keyboard.Key[name]
+            elif kind == "char" and name:
+                return keyboard.KeyCode.from_char(name)
+            elif kind == "vk":
+                return keyboard.KeyCode.from_vk(int(name))
+            elif kind == "mouse":
+                return mouse.Button[name]
+        except (KeyError, ValueError):
+            print(f"APPCORE_WARNING: Unknown trigger in profile: {input_id}")
+        return None
+
     def _assign_input(self, input_obj):
         if not self.is_assigning_key: return
 
@@ -372,50 +423,67 @@ class AppCore:
         self.trigger_input = input_obj
         self.is_assigning_key = False # Assignment done
         self.ui.update_trigger_key_display(self._format_input_name(self.trigger_input), True)
+        self._rebuild_hotkeys()
 
 
     def _start_listeners(self):
         # Keyboard listener
-        key_listener = keyboard.Listener(on_press=self._on_key_press_event)
+        key_listener = keyboard.Listener(on_press=self._on_key_press_event, on_release=self._on_key_release_event)
         key_listener.daemon = True
         key_listener.start()
-        # Mouse listener (for trigger assignment and potentially other functions later)
-        # We only care about clicks for assignment/trigger, not move or scroll for now.
-        mouse_listener = mouse.Listener(on_click=self._on_mouse_click_event)
+        # Mouse listener: clicks for trigger assignment/toggling, moves keep the cursor tracker current
+        mouse_listener = mouse.Listener(on_click=self._on_mouse_click_event, on_move=self.engine.cursor.on_move)
         mouse_listener.daemon = True
         mouse_listener.start()
 
     def _on_key_press_event(self, key):
+        pressed_at = time.perf_counter()
+        input_id = self._input_id(key)
+        if input_id in MODIFIER_KEYS: # Modifiers can still be bound (or assigned) themselves
+            self._held_modifiers.add(input_id)
+            self._modifiers = modifier_bits(self._held_modifiers)
+        hotkey = resolve(self._hotkeys, input_id, self._modifiers)
         # Using self.ui.after to ensure Tkinter calls are made from the main thread
-        if key == keyboard.Key.f12:
-            self.ui.after(0, self.emergency_shutdown)
-            return
-
-        if self.is_assigning_key:
+        if self.is_assigning_key and (hotkey is None or hotkey.action != ACTION_EMERGENCY):
             self.ui.after(0, self._assign_input, key)
-        elif self.trigger_input and self.trigger_input == key:
-            self.ui.after(0, self.toggle_clicking)
+        elif hotkey is not None: # Unbound keys end here, without touching Tk
+            self._on_hotkey_press(input_id, hotkey, pressed_at)
+
+    def _on_key_release_event(self, key):
+        input_id = self._input_id(key)
+        if input_id in MODIFIER_KEYS:
+            self._held_modifiers.discard(input_id)
+            self._modifiers = modifier_bits(self._held_modifiers) # The other Ctrl may still be down
+        self._on_input_release(input_id)
 
     def _on_mouse_click_event(self, x, y, button, pressed):
-        # We only care about button presses for assignment or trigger
-        if not pressed:
+        pressed_at = time.perf_counter()
+        if self.engine.injected.is_own(button.name):
+            return # The engine's own click coming back: never a trigger, never captured
+        capture = self._capture
+        if capture is not None: # Recorded right here on the listener thread, no Tk round trip
+            capture.on_click(x, y, button, pressed)
+
+        input_id = self._input_id(button)
+        if not pressed: # Releases only matter to held hotkeys
+            self._on_input_release(input_id)
             return
 
         # Using self.ui.after for Tkinter thread safety
         if self.is_assigning_key:
             self.ui.after(0, self._assign_input, button)
-        elif self.trigger_input and self.trigger_input == button:
-            self.ui.after(0, self.toggle_clicking)
+            return
+        hotkey = resolve(self._hotkeys, input_id, self._modifiers)
+        if hotkey is not None:
+            self._on_hotkey_press(input_id, hotkey, pressed_at)
 
     # Note: _process_key_event is effectively merged into _on_key_press_event and _on_mouse_click_event
 
     def emergency_shutdown(self):
         print("Acil Durum Kapatma... Program sonlandırılıyor...")
-        self.is_running = False
-        if self.click_thread and self.click_thread.is_alive():
-            # Attempt to signal thread to stop; it should check self.is_running
-            # Forcibly stopping threads is generally unsafe, rely on the loop condition
-            pass
+        self.engine.remove_observer(self) # The UI is going away; don't marshal events to it
+        self.engine.stop() # Wakes the click thread; it is a daemon, so exiting doesn't wait for it
+        self.stop_capture()
         if self.ui:
             # Safely destroy UI from main thread if possible, or just exit
             try:
@@ -0,0 +1,324 @@
+import threading
+import time
+from functools import partial
+
+from click_modes import get_click_mode, enable_numpy
+from scheduler import ClickScheduler, ClickTrack, ParkedThread, RUN_STOPPED
+from telemetry import ClickTelemetry, DEFAULT_UI_REFRESH_HZ
+from backends import get_backend, CursorTracker, InjectedClickFilter, DEFAULT_BACKEND
+from timing import get_waiter_class, DEFAULT_TIMER
+from config import ClickButton, ClickConfig
+from recorder import SessionRecorder
+
+
+class EngineObserver:
+    """
+    Receives ClickEngine events. All methods are optional no-ops.
+
+    Events are delivered on the thread that caused them (often the click thread), so GUI
+    observers must hand them over to their own event loop.
+    """
+    def on_state_changed(self, running: bool):
+        pass
+
+    def on_session_finished(self, session_stats: dict):
+        """Called from the click thread once it has fully stopped."""
+        pass
+
+    def on_error(self, title: str, message: str):
+        pass
+
+
+class ClickEngine:
+    """
+    The clicking engine without any user interface.
+
+    Owns the click modes, the injection backend and the click thread; reports to its
+    observers and publishes live counters through `telemetry` for polling.
+    """
+    def __init__(self, backend_name: str = DEFAULT_BACKEND, telemetry_hz: float = DEFAULT_UI_REFRESH_HZ,
+                 timer_name: str = DEFAULT_TIMER, realtime: bool = False, record_path: str | None = None):
+        self.backend_name = backend_name
+        self.is_running = False
+        self.click_thread = None # The click worker while it runs a session, None once that has fully stopped
+        self._stop_event = threading.Event() # Per-session stop signal, replaced on every start
+        self.click_count = 0
+        self._stop_requested_after_cycle = False
+        self._observers = []
+
+        self.click_modes = {} # ClickButton -> ClickMode selected for it
+        self.config = None # ClickConfig of the current/last session
+        self.last_session_stats = None # Per-button timeline lateness/drift summary of the last finished session
+        self.last_wakeup_stats = None # Wakeup-latency histogram of the last finished session
+        self.last_queue_stats = None # Command-queue backpressure/late/dropped counters of the last finished session
+        self.last_start_latency_s = None # Trigger (or start call) to first injected click, of the last session
+        self.last_stop_latency_s = None # stop() call to the click worker leaving the session
+
+        # The click worker and the producer are spawned once and parked between sessions, so
+        # starting a session only hands it over instead of creating threads on the trigger path.
+        self._lock = threading.RLock()
+        self._worker = None # ParkedThread running _click_loop
+        self._producer = None # ParkedThread running the scheduler's producer
+        self._triggered_at = 0.0
+        self._stop_requested_at = None
+
+        # Click counters are published by the click thread for observers to poll
+        self.telemetry = ClickTelemetry()
+        self._telemetry_interval = 1.0 / telemetry_hz
+        self._scheduler = None
+        self._next_rate_publish = 0.0
+
+        # Input-injection backend (pyautogui, pynput, xtest, ...), loaded on the first start
+        self.backend = None
+        self.backend_error = None
+        # Click-thread timer ("standard" or "hrtimer", see timing.WAITERS), resolved on the first start
+        self.timer_name = timer_name
+        self.realtime = realtime
+        self._waiter_class = None
+        # Binary log of every injected click (see recorder.py); each session rotates the previous one away
+        self.record_path = record_path
+        self.cursor = CursorTracker() # Fed by a mouse listener if one is running, read by the click thread
+        self.injected = InjectedClickFilter() # Lets mouse listeners drop the engine's own clicks
+
+    def add_observer(self, observer: EngineObserver):
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: EngineObserver):
+        self._observers.remove(observer)
+
+    def _emit(self, event: str, *args):
+        for observer in list(self._observers):
+            getattr(observer, event)(*args)
+
+    def report_error(self, title: str, message: str):
+        self._emit('on_error', title, message)
+
+    def set_mode(self, click_type: str, mode_name: str):
+        """
+        Selects the click mode of 'left' or 'right'.
+
+        Raises:
+            ValueError: If the mode name is unknown.
+        """
+        mode = get_click_mode(mode_name, self)
+        mode.reset()
+        self.click_modes[ClickButton(click_type)] = mode
+        return mode
+
+    def prepare(self):
+        """
+        Spawns the parked click threads, which also load the backend in the background, so the
+        first start pays for neither. Called by front ends right after construction.
+        """
+        with self._lock:
+            if self._worker is None:
+                self._worker = ParkedThread("click-worker")
+                self._producer = ParkedThread("click-producer")
+                self._worker.submit(self._warm_up)
+
+    def _warm_up(self):
+        with self._lock:
+            self._load_backend() # A failure is reported by start
+
+    def start(self, config: ClickConfig, triggered_at: float | None = None) -> bool:
+        """
+        Starts a session with a compiled config (see `config.compile_settings`). Safe to call
+        from any thread, e.g. straight from an input listener.
+
+        Args:
+            triggered_at (float, optional): time.perf_counter() of the trigger press, for
+                `last_start_latency_s`; defaults to now.
+
+        Returns:
+            bool: True if the session was handed to the click worker; otherwise an error was reported.
+        """
+        if triggered_at is None:
+            triggered_at = time.perf_counter()
+        with self._lock:
+            if self.is_running: return False
+            if not self._load_backend():
+                self.report_error("Hata", f"Tıklama arka ucu yüklenemedi.\n{self.backend_error}")
+                return False
+            if self._waiter_class is None:
+                try:
+                    self._waiter_class = get_waiter_class(self.timer_name, self.realtime)
+                except (ValueError, RuntimeError, OSError) as e:
+                    self.report_error("Hata", f"Zamanlayıcı kullanılamıyor ({self.timer_name}).\n{e}")
+                    return False
+
+            modes = self._modes_for(config)
+            if modes is None:
+                return False
+
+            recorder = None
+            if self.record_path:
+                recorder = SessionRecorder(self.record_path)
+                try:
+                    recorder.open()
+                except OSError as e:
+                    self.report_error("Hata", f"Oturum kaydı açılamadı ({self.record_path}).\n{e}")
+                    return False
+
+            self.config = config
+            for mode in modes: # Reset relevant click modes
+                mode.reset()
+
+            self.click_count = 0
+            self.telemetry.reset()
+            self._stop_requested_after_cycle = False
+            self._triggered_at = triggered_at
+            self._stop_requested_at = None
+            self.last_start_latency_s = self.last_stop_latency_s = None
+            # A fresh event per session so a worker still winding down from a previous session
+            # can never be revived by clearing a shared flag.
+            self._stop_event = threading.Event()
+            self._scheduler = ClickScheduler(self._build_click_tracks(), self._waiter_class)
+            self.prepare()
+            self.click_thread = self._worker.thread
+            self._set_running(True)
+            # Runs at once, unless a stopped session is still winding down on the worker
+            self._worker.submit(self._click_loop, self._scheduler, self._stop_event, recorder)
+            return True
+
+    def apply_config(self, config: ClickConfig) -> bool:
+        """
+        Switches to another compiled config. A running session takes it over at the next click
+        boundary without restarting the click thread; otherwise it is used by the next start.
+
+        Returns:
+            bool: False if a mode of the config isn't selected (an error was reported).
+        """
+        with self._lock:
+            if self._modes_for(config) is None:
+                return False
+            self.config = config
+            if self.is_running:
+                self._scheduler.replace_tracks(self._build_click_tracks())
+            return True
+
+    def _modes_for(self, config: ClickConfig) -> list | None:
+        modes = [self.click_modes.get(button_config.button) for button_config in config.buttons]
+        if not modes or None in modes:
+            self.report_error("Hata", "Aktif tıklama için mod(lar) seçilemedi/yüklenemedi.")
+            return None
+        return modes
+
+    def _load_backend(self) -> bool:
+        # Deferred to the first start, together with NumPy, to keep application startup fast
+        if self.backend is None:
+            try:
+                self.backend = get_backend(self.backend_name)
+            except (ValueError, RuntimeError) as e:
+                self.backend_error = str(e)
+                return False
+            enable_numpy()
+        return True
+
+    def stop(self):
+        """Stops the session; safe to call from any thread, the worker wakes immediately."""
+        if not self.is_running: return
+        self._stop_requested_at = time.perf_counter()
+        self._set_running(False)
+
+    # Called by click modes that end the session themselves
+    def stop_clicking(self):
+        self.stop()
+
+    def stop_clicking_after_current_cycle(self):
+        self._stop_requested_after_cycle = True
+
+    def _set_running(self, running: bool):
+        self.is_running = running
+        if not running:
+            self._stop_event.set() # Wakes the click thread immediately if it is waiting
+        self._emit('on_state_changed', running)
+
+    def _build_click_tracks(self) -> list[ClickTrack]:
+        """Creates one independent timeline per button of the active configuration."""
+        return [ClickTrack(button_config.button, button_config.params, self.click_modes[button_config.button])
+                for button_config in self.config.buttons]
+
+    def _inject_click(self, stop_event: threading.Event, button: str, jitter_x: int, jitter_y: int, hold_s: float = 0.0):
+        if hold_s:
+            # Held pattern steps press in place; the wait ends early if this session is stopped.
+            # Press and release are announced separately, each expiring from its own time.
+            self.injected.expect(button, 1)
+            self.backend.press(button)
+            stop_event.wait(hold_s)
+            self.injected.expect(button, 1)
+            self.backend.release(button)
+            return
+        self.injected.expect(button)
+        if not jitter_x and not jitter_y:
+            self.backend.click_here(button) # No jitter: no need to know where the cursor is
+            return
+        cursor = self.cursor.position
+        tracked = cursor is not None
+        if not tracked: # No mouse listener is feeding the tracker (yet)
+            cursor = self.backend.position()
+        x, y = cursor[0] + jitter_x, cursor[1] + jitter_y
+        self.backend.click(x, y, button)
+        if tracked:
+            self.cursor.position = (x, y) # The cursor is now here, same as a fresh query would say
+
+    def _on_click_injected(self, track: ClickTrack, current_cps: float):
+        # Runs on the click thread: only publish, observers poll the telemetry on their own schedule
+        self.click_count += 1
+        fired_at = track.stats.last_fired
+        if self.click_count == 1:
+            self.last_start_latency_s = fired_at - self._triggered_at
+        if fired_at < self._next_rate_publish:
+            self.telemetry.publish_count(self.click_count)
+            return
+        # Rates are only summarized as often as they can be shown
+        self._next_rate_publish = fired_at + self._telemetry_interval
+        scheduler = self._scheduler
+        rates = scheduler.rate_stats()
+        self.telemetry.publish(self.click_count, scheduler.rate.stats().cps_1s,
+                               sum(rate.target_cps for rate in rates),
+                               "+".join(rate.label for rate in rates), rates)
+
+    def _click_loop(self, scheduler: ClickScheduler, stop_event: threading.Event, recorder: SessionRecorder | None = None):
+        # Each active button gets its own absolute timeline; a single heap interleaves them
+        # on this thread so clicks never overlap and each button keeps its own CPS.
+        self._next_rate_publish = 0.0
+        reason = None
+        try:
+            # The session's own stop event: self._stop_event is replaced when the next session starts
+            reason = scheduler.run(stop_event, partial(self._inject_click, stop_event), self._on_click_injected,
+                                   lambda: self._stop_requested_after_cycle, recorder, self._producer)
+        except Exception as e:
+            print(f"Click Loop Hatası: {e}")
+        finally:
+            if recorder is not None:
+                try:
+                    recorder.close()
+                except OSError as e:
+                    print(f"Oturum Kaydı Hatası: {e}")
+
+        current = self._stop_event is stop_event # No newer session has been started meanwhile
+        if reason == RUN_STOPPED and current and self._stop_requested_at is not None:
+            self.last_stop_latency_s = time.perf_counter() - self._stop_requested_at
+        # The mode finished the session (or the loop failed): stop, unless a newer session already started
+        if self.is_running and current:
+            self.stop()
+        self.last_session_stats = scheduler.summary()
+        waiter = scheduler.waiter
+        self.last_wakeup_stats = waiter.wakeups.summary() if waiter else None
+        self.last_queue_stats = scheduler.queue.stats()
+        if current:
+            self.click_thread = None # Fully stopped; a newer session keeps the worker busy
+        for track in scheduler.tracks:
+            if track.stats.count:
+                print(f"Oturum Zamanlaması ({track.label}): {track.stats.format_summary()}")
+        if waiter and waiter.wakeups.count:
+            print(f"Uyanma Gecikmesi ({waiter.describe()}): {waiter.wakeups.format_summary()}")
+        print(f"Komut Kuyruğu: {scheduler.queue.format_summary()}")
+        if current and self.last_start_latency_s is not None:
+            stop_text = f", durdurma {self.last_stop_latency_s * 1000:.3f} ms" if self.last_stop_latency_s is not None else ""
+            print(f"Başlatma Gecikmesi: tetik → ilk tıklama {self.last_start_latency_s * 1000:.3f} ms{stop_text}")
+        if self.injected.suppressed or self.injected.expired:
+            print(f"Kendi Tıklamaları: {self.injected.format_summary()}")
+        if recorder is not None:
+            print(f"Oturum Kaydı: {recorder.total} tıklama -> {recorder.path}")
+        self._emit('on_session_finished', self.last_session_stats)
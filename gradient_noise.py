@@ -0,0 +1,92 @@
+import math
+import random
+from array import array
+
+# NumPy, imported by the first sample_many call so importing this module stays cheap (the app
+# loads NumPy only on its first start). Optional: sample_many falls back to a Python loop.
+np = None
+_numpy_tried = False
+
+_MASK32 = 0xFFFFFFFF
+_CELL_MULTIPLIER = 0x9E3779B1 # Odd constants spreading lattice index and seed over 32 bits
+_SEED_MULTIPLIER = 0x85EBCA77
+_TO_GRADIENT = 2.0 / 2**32
+
+
+def _gradient(cell: int, seed_mix: int) -> float:
+    """Gradient in [-1, 1) of a lattice cell: a 32-bit hash of (cell, seed), so it never repeats."""
+    h = (cell * _CELL_MULTIPLIER + seed_mix) & _MASK32
+    h ^= h >> 16
+    h = (h * 0x7FEB352D) & _MASK32
+    h ^= h >> 15
+    h = (h * 0x846CA68B) & _MASK32
+    h ^= h >> 16
+    return h * _TO_GRADIENT - 1.0
+
+
+def _load_numpy():
+    global np, _numpy_tried
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def _gradients_np(cells, seed_mix: int):
+    """`_gradient` of a NumPy int64 array of cells, with the same results."""
+    h = (cells.astype(np.uint64) * np.uint64(_CELL_MULTIPLIER) + np.uint64(seed_mix)) & np.uint64(_MASK32)
+    h ^= h >> np.uint64(16)
+    h = (h * np.uint64(0x7FEB352D)) & np.uint64(_MASK32)
+    h ^= h >> np.uint64(15)
+    h = (h * np.uint64(0x846CA68B)) & np.uint64(_MASK32)
+    h ^= h >> np.uint64(16)
+    return h * _TO_GRADIENT - 1.0
+
+
+class PerlinNoise:
+    """
+    Fast 1-D gradient (Perlin) noise, a drop-in replacement for `perlin_noise.PerlinNoise`
+    on scalar coordinates.
+
+    It has the same statistical character as that package: `octaves` scales the input
+    frequency, lattice gradients are uniform in [-1, 1] and are blended with the quintic
+    fade curve. Values lie roughly in [-0.5, 0.5]. Gradients are hashed from the lattice
+    index and the seed instead of being sampled and stored per lattice point, so a new
+    seed costs nothing, and `sample_many` evaluates many coordinates at once.
+    """
+    def __init__(self, octaves: float = 1, seed: int | None = None):
+        if octaves <= 0:
+            raise ValueError("octaves expected to be positive number")
+        self.octaves = octaves
+        self.seed = seed if seed else random.randint(1, 10**5)
+        self._seed_mix = (self.seed * _SEED_MULTIPLIER) & _MASK32
+
+    def __call__(self, x: float) -> float:
+        x *= self.octaves
+        cell = math.floor(x)
+        t = x - cell
+        g0 = _gradient(cell, self._seed_mix)
+        g1 = _gradient(cell + 1, self._seed_mix)
+        u = 1.0 - t
+        fade_u = u * u * u * (u * (u * 6.0 - 15.0) + 10.0)
+        fade_t = t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+        return fade_u * g0 * t + fade_t * g1 * (t - 1.0)
+
+    def sample_many(self, xs):
+        """Evaluates the noise at every coordinate in `xs`; returns a NumPy array or `array('d')`."""
+        if _load_numpy() is None:
+            return array('d', [self(x) for x in xs])
+        x = np.asarray(xs, dtype=np.float64) * self.octaves
+        cell = np.floor(x)
+        t = x - cell
+        cell = cell.astype(np.int64)
+        g0 = _gradients_np(cell, self._seed_mix)
+        g1 = _gradients_np(cell + 1, self._seed_mix)
+        u = 1.0 - t
+        fade_u = u * u * u * (u * (u * 6.0 - 15.0) + 10.0)
+        fade_t = t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+        return fade_u * g0 * t + fade_t * g1 * (t - 1.0)
@@ -0,0 +1,126 @@
+"""
+Global hotkeys: keys, mouse buttons and modifier chords bound to actions.
+
+A binding is an input id, optionally preceded by modifiers joined with '+': "key:f6",
+"mouse:x1", "ctrl+alt+key:up". Input ids are the ones profiles store for the trigger
+("key:<pynput Key name>", "char:<c>", "vk:<code>", "mouse:<button name>"). Actions:
+
+    toggle, hold, profile:N, cps+, cps-, stop_after_cycle, emergency
+
+The bindings are compiled into one dict keyed by (input id, modifier bits), so the input
+listeners resolve an event with a dict lookup and drop unbound inputs right there.
+"""
+from typing import NamedTuple
+
+MOD_CTRL = 1
+MOD_SHIFT = 2
+MOD_ALT = 4
+MOD_CMD = 8
+MODIFIERS = {'ctrl': MOD_CTRL, 'shift': MOD_SHIFT, 'alt': MOD_ALT, 'cmd': MOD_CMD} # Names in bindings
+# Input ids of the modifier keys themselves; the keyboard listener keeps their bits up to date
+MODIFIER_KEYS = {
+    f"key:{name}{side}": bit
+    for name, bit in (('ctrl', MOD_CTRL), ('shift', MOD_SHIFT), ('alt', MOD_ALT), ('cmd', MOD_CMD))
+    for side in ("", "_l", "_r")
+}
+MODIFIER_KEYS["key:alt_gr"] = MOD_ALT
+
+ACTION_TOGGLE = "toggle"
+ACTION_HOLD = "hold"
+ACTION_PROFILE = "profile"
+ACTION_CPS_UP = "cps+"
+ACTION_CPS_DOWN = "cps-"
+ACTION_STOP_AFTER_CYCLE = "stop_after_cycle"
+ACTION_EMERGENCY = "emergency"
+ACTIONS = (ACTION_TOGGLE, ACTION_HOLD, ACTION_PROFILE, ACTION_CPS_UP, ACTION_CPS_DOWN,
+           ACTION_STOP_AFTER_CYCLE, ACTION_EMERGENCY)
+REPEATING_ACTIONS = frozenset({ACTION_CPS_UP, ACTION_CPS_DOWN}) # Key auto-repeat fires these again
+CPS_NUDGE_STEP = 1.0 # CPS added or removed by cps+ / cps-
+
+EMERGENCY_BINDING = "key:f12" # Always bound, no binding can take it over
+DEFAULT_HOTKEYS = {
+    # Ctrl+Alt+F1-F9: first nine profiles. Chords, since the listeners are global and bare
+    # function keys (F2 rename, F5 refresh, ...) are everyday keys in other applications.
+    **{f"ctrl+alt+key:f{number}": f"{ACTION_PROFILE}:{number}" for number in range(1, 10)},
+    "ctrl+alt+key:up": ACTION_CPS_UP,
+    "ctrl+alt+key:down": ACTION_CPS_DOWN,
+    "ctrl+alt+key:end": ACTION_STOP_AFTER_CYCLE,
+}
+
+
+class Hotkey(NamedTuple):
+    action: str
+    profile_index: int = 0 # ACTION_PROFILE: 0-based position in the profile list
+
+
+def parse_binding(text: str) -> tuple[str, int]:
+    """
+    Splits "ctrl+alt+key:up" into ("key:up", MOD_CTRL | MOD_ALT).
+
+    Raises:
+        ValueError: If a modifier is unknown or the input id is missing.
+    """
+    *modifier_names, input_id = text.strip().split("+")
+    modifiers = 0
+    for name in modifier_names:
+        if name.strip().lower() not in MODIFIERS:
+            raise ValueError(f"Bilinmeyen kısayol değiştiricisi: '{name}' ({text})")
+        modifiers |= MODIFIERS[name.strip().lower()]
+    kind, _, name = input_id.strip().partition(":")
+    if kind not in ("key", "char", "vk", "mouse") or not name:
+        raise ValueError(f"Geçersiz kısayol: '{text}'")
+    return f"{kind}:{name}", modifiers
+
+
+def parse_action(text: str) -> Hotkey:
+    """
+    Raises:
+        ValueError: If the action is unknown or a profile number isn't a positive integer.
+    """
+    action, _, argument = text.strip().partition(":")
+    if action == ACTION_PROFILE:
+        try:
+            number = int(argument)
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise ValueError(f"Profil kısayolu bir profil numarası içermeli (örn. profile:1): '{text}'")
+        return Hotkey(action, number - 1)
+    if action not in ACTIONS or argument:
+        raise ValueError(f"Bilinmeyen kısayol eylemi: '{text}'")
+    return Hotkey(action)
+
+
+def compile_hotkeys(bindings: dict[str, str], trigger_id: str | None = None,
+                    trigger_action: str = ACTION_TOGGLE) -> dict[tuple[str, int], Hotkey]:
+    """
+    Builds the lookup table of the listeners. The assigned trigger (unmodified, with
+    `trigger_action`) takes precedence over the bindings, and F12 over both.
+
+    Raises:
+        ValueError: If a binding or action is invalid.
+    """
+    table = {parse_binding(binding): parse_action(action) for binding, action in bindings.items()}
+    if trigger_id:
+        table[(trigger_id, 0)] = Hotkey(trigger_action)
+    table[(EMERGENCY_BINDING, 0)] = Hotkey(ACTION_EMERGENCY)
+    return table
+
+
+def modifier_bits(held_keys) -> int:
+    """The modifier bits of the held modifier keys (input ids); left and right keys share a bit."""
+    bits = 0
+    for input_id in held_keys:
+        bits |= MODIFIER_KEYS[input_id]
+    return bits
+
+
+def resolve(table: dict[tuple[str, int], Hotkey], input_id: str, modifiers: int) -> Hotkey | None:
+    """
+    The hotkey of an input under the held modifiers. An input bound without modifiers also
+    fires while unbound modifiers are held, as a single-key trigger always did.
+    """
+    hotkey = table.get((input_id, modifiers))
+    if hotkey is None and modifiers:
+        hotkey = table.get((input_id, 0))
+    return hotkey
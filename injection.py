@@ -0,0 +1,123 @@
+"""
+Bounded command queue between the scheduling thread and the injection worker.
+
+The scheduling side (ClickScheduler's producer thread) evaluates the click modes and queues
+timestamped click commands ahead of time; the injection worker only waits for each deadline
+and fires. A full queue blocks the producer (backpressure), so it never runs further ahead
+than the queue's capacity.
+"""
+import threading
+
+QUEUE_CAPACITY = 8 # Commands the producer may prepare ahead of the worker
+LATE_COMMAND_S = 0.002 # A command fired later than this after its deadline counts as late
+
+# Results of CommandQueue.put
+PUT_QUEUED = 0
+PUT_CLOSED = 1      # The worker is gone: stop producing
+PUT_INTERRUPTED = 2 # A swap was requested: the command was not queued
+
+
+class CommandQueue:
+    """
+    Fixed-size FIFO ring of click commands shared by one producer and one worker thread.
+
+    Also carries track swaps (see `ClickScheduler.replace_tracks`): while one is pending the
+    worker takes no further commands, so the producer can pull back everything still queued
+    and regenerate it with the new settings.
+    """
+    def __init__(self, capacity: int = QUEUE_CAPACITY):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0 # Index of the oldest command
+        self._count = 0
+        self._cond = threading.Condition()
+        self._swap = None # Pending swap payload, set by any thread
+        self._swapping = False # The producer is applying a swap: the worker waits
+        self.closed = False
+        # Counters, read by anyone after (or during) the session
+        self.high_water = 0 # Most commands queued at once
+        self.full_waits = 0 # Times the producer had to wait for a free slot
+        self.late = 0 # Fired more than LATE_COMMAND_S after their deadline
+        self.dropped = 0 # Too stale to fire at all (the producer re-anchors its timeline)
+
+    def put(self, command) -> int:
+        """Queues a command, blocking while the queue is full. Returns a PUT_* result."""
+        with self._cond:
+            if self._count == self.capacity and self._swap is None and not self.closed:
+                self.full_waits += 1
+                while self._count == self.capacity and self._swap is None and not self.closed:
+                    self._cond.wait()
+            if self.closed:
+                return PUT_CLOSED
+            if self._swap is not None:
+                return PUT_INTERRUPTED
+            self._slots[(self._head + self._count) % self.capacity] = command
+            self._count += 1
+            if self._count > self.high_water:
+                self.high_water = self._count
+            self._cond.notify()
+            return PUT_QUEUED
+
+    def get(self):
+        """Takes the oldest command, blocking while there is none or a swap is under way; None once closed."""
+        with self._cond:
+            while (self._count == 0 or self._swap is not None or self._swapping) and not self.closed:
+                self._cond.wait()
+            if self._count == 0:
+                return None
+            head = self._head
+            command = self._slots[head]
+            self._slots[head] = None
+            self._head = (head + 1) % self.capacity
+            self._count -= 1
+            self._cond.notify()
+            return command
+
+    def request_swap(self, payload):
+        with self._cond:
+            self._swap = payload
+            self._cond.notify_all()
+
+    def take_swap(self) -> tuple:
+        """
+        Producer side: returns (payload, retracted commands in FIFO order), or (None, []) if no
+        swap is pending. The worker stays paused until `finish_swap`.
+        """
+        with self._cond:
+            payload, self._swap = self._swap, None
+            if payload is None:
+                return None, []
+            self._swapping = True
+            retracted = [self._slots[(self._head + i) % self.capacity] for i in range(self._count)]
+            self._slots = [None] * self.capacity
+            self._head = self._count = 0
+            return payload, retracted
+
+    def finish_swap(self):
+        with self._cond:
+            self._swapping = False
+            self._cond.notify_all()
+
+    @property
+    def swap_pending(self) -> bool:
+        return self._swap is not None
+
+    def close(self):
+        """Wakes both sides for good; queued commands can still be taken by the worker."""
+        with self._cond:
+            self.closed = True
+            self._swapping = False
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'high_water': self.high_water,
+            'full_waits': self.full_waits,
+            'late': self.late,
+            'dropped': self.dropped,
+        }
+
+    def format_summary(self) -> str:
+        return (f"kapasite {self.capacity}, en yüksek doluluk {self.high_water}, geri basınç {self.full_waits}, "
+                f"geç {self.late}, atlanan {self.dropped}")
@@ -0,0 +1,135 @@
+"""
+Compiler for click patterns (Pattern (Desen) mode).
+
+A pattern is a '-' separated list of steps; each step is the delay in ms until the next click:
+
+    100-50-200          plain delays
+    100x5               a step (or group) repeated 5 times
+    80~120              a delay drawn uniformly from the range for every click
+    (100-50)x3-200      nested groups
+    120R  90L           click the right/left button on this step instead of the tab's button
+    100@40              hold the button down for 40 ms on this step (shorter than its delay)
+
+Modifiers combine as DELAY[~MAX][L|R][@HOLD][xCOUNT]. Patterns are compiled once into flat
+arrays so the click mode only indexes them; compiled programs are cached by pattern string.
+"""
+from array import array
+from functools import lru_cache
+from typing import NamedTuple
+
+PATTERN_CACHE_SIZE = 128 # Compiled programs kept, keyed by pattern string
+MAX_PATTERN_STEPS = 100_000 # Limit of the expanded program, so e.g. "1x9999x9999" can't exhaust memory
+
+# Per-step button codes of PatternProgram.buttons
+STEP_TRACK_BUTTON = 0 # The button of the tab running the pattern
+STEP_LEFT = 1
+STEP_RIGHT = 2
+STEP_BUTTONS = {STEP_LEFT: 'left', STEP_RIGHT: 'right'}
+_BUTTON_SUFFIXES = {'l': STEP_LEFT, 'r': STEP_RIGHT}
+
+
+class PatternProgram(NamedTuple):
+    """A compiled, fully expanded pattern. The arrays are shared through the cache: read only."""
+    delay_min: array # Seconds
+    delay_span: array # Seconds added at most on top of delay_min (0 for fixed delays)
+    buttons: array # STEP_* codes
+    holds: array # Seconds the button is held down (0 for a plain click)
+    has_ranges: bool
+    has_buttons: bool
+    has_holds: bool
+
+    def __len__(self):
+        return len(self.delay_min)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text.replace(" ", "").lower()
+        self.pos = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} (konum {self.pos + 1})")
+
+    def peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def accept(self, char: str) -> bool:
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def number(self) -> float:
+        start = self.pos
+        while self.peek().isdigit() or self.peek() == ".":
+            self.pos += 1
+        try:
+            return float(self.text[start:self.pos])
+        except ValueError:
+            self.pos = start
+            raise self.error("Sayı bekleniyordu") from None
+
+    def count(self) -> int:
+        value = self.number()
+        if value != int(value) or value < 1:
+            raise self.error("Tekrar sayısı pozitif bir tam sayı olmalı")
+        return int(value)
+
+    def sequence(self) -> list:
+        steps = []
+        while True:
+            if self.peek() not in ("-", ")", ""): # Empty items ("100--50") are skipped
+                steps.extend(self.item())
+                if len(steps) > MAX_PATTERN_STEPS:
+                    raise self.error(f"Pattern en fazla {MAX_PATTERN_STEPS} adıma açılabilir")
+            if not self.accept("-"):
+                return steps
+
+    def item(self) -> list:
+        if self.accept("("):
+            steps = self.sequence()
+            if not self.accept(")"):
+                raise self.error("')' bekleniyordu")
+            if not steps:
+                raise self.error("Boş grup")
+        else:
+            steps = [self.step()]
+        if self.accept("x"):
+            repeats = self.count()
+            if len(steps) * repeats > MAX_PATTERN_STEPS:
+                raise self.error(f"Pattern en fazla {MAX_PATTERN_STEPS} adıma açılabilir")
+            steps = steps * repeats
+        return steps
+
+    def step(self) -> tuple[float, float, int, float]:
+        low = high = self.number()
+        if self.accept("~"):
+            high = self.number()
+            if high < low:
+                raise self.error("Aralığın üst sınırı alt sınırdan küçük olamaz")
+        button = _BUTTON_SUFFIXES.get(self.peek(), STEP_TRACK_BUTTON)
+        if button != STEP_TRACK_BUTTON:
+            self.pos += 1
+        hold = self.number() if self.accept("@") else 0.0
+        if hold and hold >= low: # The button would still be down when the next click is due
+            raise self.error("Basılı tutma süresi adımın gecikmesinden kısa olmalı")
+        return low / 1000.0, (high - low) / 1000.0, button, hold / 1000.0
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> PatternProgram:
+    """
+    Compiles a pattern string into a PatternProgram.
+
+    Raises:
+        ValueError: If the pattern is empty or malformed; the message says where.
+    """
+    parser = _Parser(pattern)
+    steps = parser.sequence()
+    if parser.pos != len(parser.text):
+        raise parser.error(f"Beklenmeyen karakter '{parser.peek()}'")
+    if not steps:
+        raise ValueError("Pattern boş")
+    delay_min, delay_span, buttons, holds = zip(*steps)
+    return PatternProgram(array('d', delay_min), array('d', delay_span), array('b', buttons), array('d', holds),
+                          any(delay_span), any(buttons), any(holds))
@@ -0,0 +1,109 @@
+"""
+Named settings profiles, kept together in one compact JSON file.
+
+A profile has the shape of `AutoClickerUI.get_current_settings` (the same as a headless
+`--profile` file) plus an optional 'trigger' id and 'activation' (Aç/Kapat or Basılı Tut), e.g.
+{"active_config": "Use Left Click Settings", "left": {...}, "right": {...}, "trigger": "key:f6", "activation": "Aç/Kapat"}.
+The file can also hold the global hotkey bindings (see hotkeys.py) under 'hotkeys'.
+"""
+import json
+import os
+import tempfile
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".autoclicker_profiles.json")
+PROFILE_FORMAT_VERSION = 1
+
+
+class ProfileStore:
+    """Profiles by name, in the order they were first saved (which is also their hotkey order)."""
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH):
+        self.path = path
+        self.profiles = {}
+        self.last_used = None # Name of the profile applied most recently
+        self.hotkeys = None # Hotkey bindings {"ctrl+alt+key:up": "cps+", ...}; None: the defaults
+        self.load_error = None # Why the existing file couldn't be loaded; `save` won't overwrite it then
+
+    def load(self):
+        """
+        Reads the profile file; a missing file is an empty store.
+
+        Raises:
+            ValueError: If the file exists but can't be read or isn't a profile file. The
+                store then refuses to save, so the user's file is never replaced.
+        """
+        try:
+            data = self._read()
+        except ValueError as e:
+            self.load_error = str(e)
+            raise
+        self.load_error = None
+        if data is None:
+            return
+        self.profiles = {name: profile for name, profile in data['profiles'].items() if isinstance(profile, dict)}
+        self.last_used = data.get('last_used') if data.get('last_used') in self.profiles else None
+        self.hotkeys = data['hotkeys'] if isinstance(data.get('hotkeys'), dict) else None
+
+    def _read(self) -> dict | None:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Profil dosyası okunamadı ({self.path}): {e}") from e
+        if not isinstance(data, dict) or not isinstance(data.get('profiles'), dict):
+            raise ValueError(f"Geçersiz profil dosyası: {self.path}")
+        version = data.get('version', PROFILE_FORMAT_VERSION)
+        if not isinstance(version, int) or isinstance(version, bool):
+            raise ValueError(f"Geçersiz profil dosyası sürümü ({version!r}): {self.path}")
+        if version > PROFILE_FORMAT_VERSION:
+            raise ValueError(f"Profil dosyası daha yeni bir sürümle kaydedilmiş: {self.path}")
+        return data
+
+    def save(self):
+        """
+        Writes the store atomically, so a crash mid-write never leaves a truncated file.
+
+        Raises:
+            OSError: If the file can't be written.
+            ValueError: If the existing file couldn't be loaded (see `load_error`).
+        """
+        if self.load_error is not None:
+            raise ValueError(f"{self.load_error}\nDosya korunuyor, üzerine yazılmadı.")
+        data = {'version': PROFILE_FORMAT_VERSION, 'last_used': self.last_used, 'profiles': self.profiles}
+        if self.hotkeys is not None:
+            data['hotkeys'] = self.hotkeys
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".profiles-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def names(self) -> list[str]:
+        return list(self.profiles)
+
+    def get(self, name: str) -> dict:
+        """Raises KeyError if there is no such profile."""
+        return self.profiles[name]
+
+    def put(self, name: str, profile: dict):
+        """
+        Adds or replaces a profile (a replaced profile keeps its hotkey position).
+
+        Raises:
+            ValueError: If the name is empty.
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Profil adı boş olamaz.")
+        self.profiles[name] = profile
+        self.last_used = name
+
+    def delete(self, name: str):
+        del self.profiles[name]
+        if self.last_used == name:
+            self.last_used = None
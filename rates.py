@@ -0,0 +1,130 @@
+"""
+Click times of time-varying rates.
+
+A rate curve λ(t) gives clicks per second at elapsed time t. The click after one at t
+falls where the cumulative intensity Λ(t) = ∫₀ᵗ λ(s) ds has grown by exactly one, so the
+clicks follow the curve itself instead of sampling λ once per click and waiting 1/λ (which
+lags every change of rate, and waits forever on a ramp that starts at 0 CPS).
+
+Λ has a closed form for the curves here; it is inverted exactly for piecewise linear
+curves and numerically (safeguarded Newton) otherwise.
+"""
+import math
+from bisect import bisect_right
+
+TOLERANCE = 1e-9 # Clicks; how exactly a numerically inverted Λ must hit its target
+MAX_ITERATIONS = 60
+
+
+class RateCurve:
+    """λ(t) ≥ 0 together with its cumulative intensity Λ(t)."""
+    end = math.inf # The curve ends here: no rate, and no clicks, from this time on
+
+    def rate(self, t: float) -> float:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def cumulative(self, t: float) -> float:
+        """Λ(t), the expected number of clicks in [0, t]."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def next_click(self, t: float) -> float:
+        """Time of the click following one at `t`; math.inf if the curve ends first."""
+        return self.time_at(self.cumulative(t) + 1.0, t)
+
+    def time_at(self, target: float, after: float = 0.0) -> float:
+        """Earliest time from `after` on where Λ reaches `target`; math.inf if it never does before `end`."""
+        low = after
+        missing = target - self.cumulative(low)
+        if missing <= 0:
+            return low
+        if self.end < math.inf and self.cumulative(self.end) < target:
+            return math.inf
+        # Bracket the root by doubling a first-order guess...
+        rate = self.rate(low)
+        step = missing / rate if rate > 0 else 1.0
+        high = min(low + step, self.end)
+        while self.cumulative(high) < target:
+            low, step = high, step * 2
+            high = min(low + step, self.end)
+        # ...then Newton steps, bisecting whenever one would leave the bracket
+        t = high
+        for _ in range(MAX_ITERATIONS):
+            error = self.cumulative(t) - target
+            if abs(error) < TOLERANCE:
+                break
+            if error > 0:
+                high = t
+            else:
+                low = t
+            rate = self.rate(t)
+            t = t - error / rate if rate > 0 else low
+            if not low < t < high:
+                t = (low + high) / 2
+        return t
+
+
+class SineRate(RateCurve):
+    """λ(t) = mean + amplitude·sin(ω·t), with amplitude ≤ mean."""
+    def __init__(self, mean: float, amplitude: float, angular_frequency: float):
+        self.mean = mean
+        self.amplitude = amplitude
+        self.angular_frequency = angular_frequency
+
+    def rate(self, t: float) -> float:
+        return self.mean + self.amplitude * math.sin(self.angular_frequency * t)
+
+    def cumulative(self, t: float) -> float:
+        omega = self.angular_frequency
+        return self.mean * t + self.amplitude / omega * (1.0 - math.cos(omega * t))
+
+
+class PiecewiseLinearRate(RateCurve):
+    """
+    λ interpolated linearly between (time, rate) knots from t = 0; the curve ends at the
+    last knot. Λ is quadratic on each segment, so it is inverted exactly.
+    """
+    def __init__(self, knots: list[tuple[float, float]]):
+        self.times = []
+        self.rates = []
+        for time, rate in knots:
+            if self.times and time <= self.times[-1]:
+                continue # Zero-length segment (e.g. a burst without a plateau)
+            self.times.append(time)
+            self.rates.append(rate)
+        self.end = self.times[-1]
+        self._areas = [0.0] # Λ at each knot
+        for i in range(1, len(self.times)):
+            self._areas.append(self._areas[-1] + (self.rates[i - 1] + self.rates[i]) / 2 * (self.times[i] - self.times[i - 1]))
+
+    def _segment(self, t: float) -> int:
+        return min(max(bisect_right(self.times, t) - 1, 0), len(self.times) - 2)
+
+    def rate(self, t: float) -> float:
+        if not 0 <= t < self.end:
+            return 0.0
+        i = self._segment(t)
+        slope = (self.rates[i + 1] - self.rates[i]) / (self.times[i + 1] - self.times[i])
+        return self.rates[i] + slope * (t - self.times[i])
+
+    def cumulative(self, t: float) -> float:
+        if t >= self.end:
+            return self._areas[-1]
+        if t <= 0:
+            return 0.0
+        i = self._segment(t)
+        u = t - self.times[i]
+        return self._areas[i] + (self.rates[i] + self.rate(t)) / 2 * u
+
+    def time_at(self, target: float, after: float = 0.0) -> float:
+        if target > self._areas[-1]:
+            return math.inf
+        i = min(max(bisect_right(self._areas, target) - 1, 0), len(self.times) - 2)
+        while i > 0 and self._areas[i] >= target: # Land on the segment where Λ crosses the target
+            i -= 1
+        remaining = target - self._areas[i]
+        rate = self.rates[i]
+        slope = (self.rates[i + 1] - rate) / (self.times[i + 1] - self.times[i])
+        # Solve rate·u + slope/2·u² = remaining, in the form that stays exact for any slope
+        root = math.sqrt(max(0.0, rate * rate + 2 * slope * remaining))
+        u = 2 * remaining / (rate + root) if remaining > 0 else 0.0
+        return max(after, self.times[i] + u)
@@ -0,0 +1,339 @@
+"""
+Session recording: every injected click appended to a compact binary log.
+
+A log file is a fixed header followed by fixed-size little-endian records
+(monotonic_ns, requested_cps, dx, dy, button). The file is preallocated for `capacity`
+records and written through a memory map, so recording a click is two `pack_into` calls
+and no file I/O. A full file is rotated like a log file (FILE -> FILE.1 -> FILE.2 ...)
+and recording continues in a fresh segment of the same session; every new session also
+rotates the previous one away.
+
+    python -m recorder session.clk    # summary of the recorded session
+
+The same format holds traces of real (human) clicks, written by ClickCapture from the mouse
+listener and replayed by the Kayıt Tekrarı mode through ClickTrace.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import NamedTuple
+
+from patterns import STEP_BUTTONS
+
+RECORD_MAGIC = b"ACLK"
+RECORD_FORMAT_VERSION = 1
+DEFAULT_RECORD_CAPACITY = 1 << 20 # Records per file (~25 MB); a full file is rotated
+DEFAULT_RECORD_BACKUPS = 4 # Rotated files kept next to the current one
+
+# magic, version, record size, session id, segment number, record count
+_HEADER = struct.Struct("<4sHHQII")
+HEADER_SIZE = 32 # _HEADER (24 bytes) padded with room to grow; records are packed, unaligned
+_RECORD = struct.Struct("<qfiiB") # monotonic_ns, requested_cps, dx, dy, button code
+_COUNT_OFFSET = _HEADER.size - 4
+
+DEFAULT_TRACE_PATH = os.path.join(os.path.expanduser("~"), ".autoclicker_trace.clk")
+MAX_TRACE_GAP_S = 1.0 # A longer pause between two captured clicks is not replayed as an interval
+TRACE_CACHE_SIZE = 8 # Mapped traces kept open, keyed by path and modification time
+
+BUTTON_CODES = {button: code for code, button in STEP_BUTTONS.items()} # 'left' -> 1, 'right' -> 2
+
+
+class SessionRecorder:
+    """
+    Appends the clicks of one session to a memory-mapped log. Only the injection worker
+    calls `record`; `close` must be called once the session has ended. `clock` returns the
+    nanosecond timestamp of each record (e.g. synthetic times for tests and benchmarks).
+    """
+    def __init__(self, path: str, capacity: int = DEFAULT_RECORD_CAPACITY, backups: int = DEFAULT_RECORD_BACKUPS,
+                 clock=time.monotonic_ns):
+        self.path = path
+        self.capacity = capacity
+        self.backups = backups
+        self.session_id = time.time_ns()
+        self.segment = 0
+        self.count = 0 # Records in the current segment
+        self.total = 0 # Records of the whole session
+        self._file = None
+        self._map = None
+        self._pack_record = _RECORD.pack_into
+        self._pack_count = struct.Struct("<I").pack_into
+        self._clock = clock
+
+    def open(self):
+        """
+        Rotates away an existing log and preallocates a fresh one.
+
+        Raises:
+            OSError: If the file can't be created or mapped.
+        """
+        self._rotate_files()
+        self._file = open(self.path, 'w+b')
+        try:
+            self._file.truncate(HEADER_SIZE + self.capacity * _RECORD.size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        except (OSError, ValueError):
+            self._file.close()
+            self._file = None
+            raise
+        _HEADER.pack_into(self._map, 0, RECORD_MAGIC, RECORD_FORMAT_VERSION, _RECORD.size,
+                          self.session_id, self.segment, 0)
+        self.count = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._map is not None
+
+    def record(self, button: str, dx: int, dy: int, requested_cps: float):
+        if self.count == self.capacity:
+            self._next_segment()
+        count = self.count
+        self._pack_record(self._map, HEADER_SIZE + count * _RECORD.size, self._clock(),
+                          requested_cps, dx, dy, BUTTON_CODES.get(button, 0))
+        self.count = count = count + 1
+        self._pack_count(self._map, _COUNT_OFFSET, count) # Readers (and crashes) see only whole records
+        self.total += 1
+
+    def _next_segment(self):
+        self._close_segment()
+        self.segment += 1
+        self.open()
+
+    def _close_segment(self):
+        if self._map is None: return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(HEADER_SIZE + self.count * _RECORD.size) # Give back the unused preallocation
+        self._file.close()
+        self._file = None
+
+    def _rotate_files(self):
+        if not os.path.exists(self.path): return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for number in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{number}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self):
+        self._close_segment()
+
+
+class SessionLog(NamedTuple):
+    """A recorded session, one array per record field."""
+    session_id: int
+    times_ns: array # time.monotonic_ns() right after each injection
+    buttons: array # BUTTON_CODES values
+    dx: array
+    dy: array
+    requested_cps: array
+
+    def __len__(self):
+        return len(self.times_ns)
+
+    def summary(self) -> dict:
+        count = len(self)
+        duration_s = (self.times_ns[-1] - self.times_ns[0]) / 1e9 if count > 1 else 0.0
+        return {
+            'clicks': count,
+            'duration_s': duration_s,
+            'achieved_cps': (count - 1) / duration_s if duration_s else 0.0,
+            'mean_requested_cps': sum(self.requested_cps) / count if count else 0.0,
+            'by_button': {STEP_BUTTONS.get(code, "?"): self.buttons.count(code) for code in sorted(set(self.buttons))},
+        }
+
+
+def _check_header(data, path: str) -> tuple[int, int, int]:
+    """Validates a mapped log file; returns (session id, segment number, whole records)."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"Kayıt dosyası eksik: {path}")
+    magic, version, record_size, session_id, segment, count = _HEADER.unpack_from(data, 0)
+    if magic != RECORD_MAGIC or record_size != _RECORD.size:
+        raise ValueError(f"Geçersiz kayıt dosyası: {path}")
+    if version > RECORD_FORMAT_VERSION:
+        raise ValueError(f"Kayıt dosyası daha yeni bir sürümle yazılmış: {path}")
+    return session_id, segment, min(count, (len(data) - HEADER_SIZE) // record_size)
+
+
+def _read_segment(path: str) -> tuple[int, int, bytes]:
+    """Returns (session id, segment number, record bytes) of one log file."""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            session_id, segment, count = _check_header(data, path)
+            return session_id, segment, data[HEADER_SIZE:HEADER_SIZE + count * _RECORD.size]
+
+
+def read_session(path: str) -> SessionLog:
+    """
+    Loads the session recorded in `path`, including its earlier segments if it was rotated
+    mid-session (FILE.1, FILE.2, ...).
+
+    Raises:
+        ValueError: If the file can't be read or isn't a session log.
+    """
+    try:
+        session_id, segment, records = _read_segment(path)
+        segments = [records]
+        number = 1
+        while segment > 0 and os.path.exists(f"{path}.{number}"):
+            older_id, segment, records = _read_segment(f"{path}.{number}")
+            if older_id != session_id:
+                break
+            segments.append(records)
+            number += 1
+    except OSError as e:
+        raise ValueError(f"Kayıt dosyası okunamadı ({path}): {e}") from e
+
+    log = SessionLog(session_id, array('q'), array('B'), array('l'), array('l'), array('f'))
+    for records in reversed(segments): # Oldest first
+        for time_ns, cps, dx, dy, button in _RECORD.iter_unpack(records):
+            log.times_ns.append(time_ns)
+            log.requested_cps.append(cps)
+            log.dx.append(dx)
+            log.dy.append(dy)
+            log.buttons.append(button)
+    return log
+
+
+class ClickCapture:
+    """
+    Records real mouse clicks as a trace: feed it the mouse listener's on_click events.
+    The movement fields hold the cursor travel since the previous captured click.
+    """
+    def __init__(self, path: str, capacity: int = DEFAULT_RECORD_CAPACITY):
+        self.recorder = SessionRecorder(path, capacity)
+        self._last_position = None
+        self._lock = threading.Lock() # The listener thread records, the UI thread closes
+
+    @property
+    def count(self) -> int:
+        return self.recorder.total
+
+    def open(self):
+        """Raises OSError if the trace file can't be created."""
+        close_traces() # A mapped file can't be replaced by the rotation on Windows
+        self.recorder.open()
+
+    def on_click(self, x: int, y: int, button, pressed: bool):
+        if not pressed: return
+        with self._lock:
+            if not self.recorder.is_open: return # Already closed
+            last = self._last_position
+            self._last_position = (x, y)
+            dx, dy = (x - last[0], y - last[1]) if last else (0, 0)
+            self.recorder.record(getattr(button, 'name', button), dx, dy, 0.0)
+
+    def close(self):
+        with self._lock:
+            self.recorder.close()
+
+
+class ClickTrace:
+    """
+    A captured trace, memory-mapped read only so even multi-hour traces aren't loaded into
+    Python objects. Step i is captured click i followed by the pause until click i + 1.
+    """
+    def __init__(self, path: str):
+        """
+        Raises:
+            ValueError: If the file can't be read, isn't a trace or has no replayable interval.
+        """
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e: # ValueError: empty file
+            raise ValueError(f"Kayıt dosyası okunamadı ({path}): {e}") from e
+        _, _, self.count = _check_header(self._map, path)
+        # One pass over the mapped records, keeping only totals
+        self.usable_steps = 0
+        total_s = 0.0
+        previous = None
+        max_gap_ns = MAX_TRACE_GAP_S * 1e9
+        for time_ns, *_ in _RECORD.iter_unpack(memoryview(self._map)[HEADER_SIZE:HEADER_SIZE + self.count * _RECORD.size]):
+            if previous is not None and 0 < time_ns - previous <= max_gap_ns:
+                self.usable_steps += 1
+                total_s += (time_ns - previous) / 1e9
+            previous = time_ns
+        if not self.usable_steps:
+            raise ValueError(f"Kayıtta tekrarlanabilir tıklama aralığı yok: {path}")
+        self.mean_cps = self.usable_steps / total_s
+
+    def __len__(self):
+        return max(0, self.count - 1) # Steps, including pauses that are skipped
+
+    def close(self):
+        self._map.close()
+
+    def step(self, index: int) -> tuple[float, int, int] | None:
+        """Returns (seconds to the next click, dx, dy) of step `index`, or None for a pause."""
+        offset = HEADER_SIZE + index * _RECORD.size
+        time_ns, _, dx, dy, _ = _RECORD.unpack_from(self._map, offset)
+        interval = (_RECORD.unpack_from(self._map, offset + _RECORD.size)[0] - time_ns) / 1e9
+        if not 0 < interval <= MAX_TRACE_GAP_S:
+            return None
+        return interval, dx, dy
+
+
+_traces = OrderedDict() # (path, mtime_ns, size) -> ClickTrace, least recently used first
+_traces_lock = threading.Lock() # Settings validation (UI thread) and click modes (click thread) open traces
+
+def open_trace(path: str) -> ClickTrace:
+    """
+    Maps a trace, reusing the mapping while the file is unchanged.
+
+    Raises:
+        ValueError: See ClickTrace.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise ValueError(f"Kayıt dosyası okunamadı ({path}): {e}") from e
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _traces_lock:
+        trace = _traces.get(key)
+        if trace is None:
+            trace = _traces[key] = ClickTrace(key[0])
+            if len(_traces) > TRACE_CACHE_SIZE:
+                _traces.popitem(last=False) # Unmapped once no compiled config refers to it
+        _traces.move_to_end(key)
+        return trace
+
+def close_traces():
+    """
+    Unmaps every cached trace, so the files can be replaced or rotated: Windows refuses to
+    replace a mapped file. Configs compiled from these traces must be compiled again.
+    """
+    with _traces_lock:
+        for trace in _traces.values():
+            trace.close()
+        _traces.clear()
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Kullanım: python -m recorder KAYIT_DOSYASI", file=sys.stderr)
+        return 2
+    try:
+        summary = read_session(argv[0]).summary()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Tıklama: {summary['clicks']} | Süre: {summary['duration_s']:.2f} sn | "
+          f"Elde edilen CPS: {summary['achieved_cps']:.2f} | İstenen CPS (ort.): {summary['mean_requested_cps']:.2f}")
+    for button, count in summary['by_button'].items():
+        print(f"  {button}: {count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
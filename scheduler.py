@@ -0,0 +1,338 @@
+import heapq
+import threading
+import time
+from collections import deque
+
+from timing import DeadlineWaiter, TimelineStats, MAX_CATCHUP_S
+from telemetry import RateEstimator, RateStats
+from patterns import STEP_BUTTONS
+from injection import CommandQueue, QUEUE_CAPACITY, LATE_COMMAND_S, PUT_INTERRUPTED, PUT_CLOSED
+
+BUTTON_LABELS = {'left': "Sol", 'right': "Sağ"}
+SCHEDULE_CHUNK = 64 # Clicks precomputed per ClickMode.generate_schedule call
+
+# Reasons returned by ClickScheduler.run
+RUN_STOPPED = "stopped"   # Stop event was set
+RUN_FINISHED = "finished" # A mode signalled the end of the session (or a stop after cycle was requested)
+
+
+class ClickTrack:
+    """Independent absolute-deadline timeline for a single mouse button."""
+    def __init__(self, button: str, params: dict, click_mode):
+        self.button = button
+        self.label = BUTTON_LABELS.get(button, "")
+        self.params = params
+        self.click_mode = click_mode
+        self._generate_schedule = click_mode.generate_schedule # Bound once, called per chunk
+        self.stats = TimelineStats()
+        self.rate = RateEstimator() # Achieved rate from real injection timestamps
+        self.current_cps = 0.0 # Requested CPS of the latest click
+        self.start_time = 0.0
+        self.next_deadline = 0.0
+        self.planned_time = 0.0 # Scheduled elapsed time at the end of the buffered chunk
+        self._cps = []
+        self._intervals = []
+        self._jitter_x = []
+        self._jitter_y = []
+        self._buttons = None # Per-click button when the schedule overrides it
+        self._holds = None # Per-click hold seconds when the schedule has any
+        self._index = 0
+        self._finished = False
+        self._taken_back = [] # Intervals of queued commands pulled back for a swap
+
+    def start(self, start_time: float):
+        self.start_time = start_time
+        self.next_deadline = start_time
+        self.planned_time = 0.0
+        self.rate.reset()
+        self._cps = []
+        self._index = 0
+        self._finished = False
+        self._taken_back = []
+
+    def take_back(self, commands: list):
+        """Returns this track's queued, never fired commands (oldest first) ahead of a swap."""
+        self.next_deadline = commands[0][0]
+        self._taken_back = [command[7] for command in commands]
+
+    def resume(self, previous: "ClickTrack"):
+        """
+        Continues the timeline of `previous` (same button) with this track's params and mode:
+        the deadline already scheduled is kept, statistics carry over and the mode sees the
+        elapsed time go on instead of restarting at 0. The new params apply from the next click.
+        """
+        self.start_time = previous.start_time
+        self.next_deadline = previous.next_deadline
+        # The clicks `previous` had queued or buffered but not fired are dropped and regenerated with the new params
+        unfired = previous._taken_back + previous._intervals[previous._index:len(previous._cps)]
+        self.planned_time = previous.planned_time - sum(unfired)
+        if self.click_mode is previous.click_mode:
+            self.click_mode.rewind(unfired)
+        self.stats = previous.stats
+        self.rate = previous.rate
+        self.current_cps = previous.current_cps
+        self._cps = []
+        self._index = 0
+        self._finished = False
+
+    def _refill(self) -> bool:
+        schedule = self._generate_schedule(self.params, SCHEDULE_CHUNK, self.planned_time)
+        # Plain lists index fastest on the hot path
+        self._cps = schedule.cps.tolist()
+        self._intervals = schedule.intervals.tolist()
+        self._jitter_x = schedule.jitter_x.tolist()
+        self._jitter_y = schedule.jitter_y.tolist()
+        button = self.button
+        self._buttons = None if schedule.buttons is None else [STEP_BUTTONS.get(code, button) for code in schedule.buttons.tolist()]
+        self._holds = None if schedule.holds is None else schedule.holds.tolist()
+        self._index = 0
+        self._finished = schedule.finished
+        self.planned_time += sum(self._intervals)
+        return bool(self._cps)
+
+    def next_click(self) -> tuple[float, float, int, int, str, float] | None:
+        """
+        Returns (current_cps, interval, jitter_x, jitter_y, button, hold_s) of the next click,
+        or None when the mode has finished.
+        """
+        index = self._index
+        if index >= len(self._cps):
+            if self._finished or not self._refill():
+                return None
+            index = 0
+        self._index = index + 1
+        return (self._cps[index], self._intervals[index], self._jitter_x[index], self._jitter_y[index],
+                self.button if self._buttons is None else self._buttons[index],
+                0.0 if self._holds is None else self._holds[index])
+
+    def advance(self, interval: float, fired_at: float):
+        """Moves the deadline forward by the precomputed interval of the click just fired."""
+        self.next_deadline += interval
+        if fired_at - self.next_deadline > MAX_CATCHUP_S:
+            # Fell hopelessly behind (stall/suspend): re-anchor instead of bursting to catch up
+            self.next_deadline = fired_at
+            self.stats.resyncs += 1
+
+
+class ParkedThread:
+    """
+    A daemon thread spawned once that runs submitted calls one after another and parks in
+    between, so handing it work costs a notify instead of a thread creation.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks = deque()
+        self._cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, target, *args) -> threading.Event:
+        """Queues target(*args) behind any running call; the returned event is set once it has returned."""
+        done = threading.Event()
+        with self._cond:
+            self._tasks.append((target, args, done))
+            self._cond.notify()
+        return done
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._tasks:
+                    self._cond.wait()
+                target, args, done = self._tasks.popleft()
+            try:
+                target(*args)
+            except Exception as e: # Keep the thread alive for the next call
+                print(f"{self.name} Hatası: {e}")
+            finally:
+                done.set()
+
+
+class ClickScheduler:
+    """
+    Runs one or more ClickTracks: a producer thread evaluates the modes and queues timestamped
+    click commands, the calling thread is the injection worker that fires them at their deadlines.
+
+    Tracks are kept in one heap ordered by their next deadline, so e.g. left at 12 CPS and
+    right at 7 CPS each follow their own timeline while clicks are still strictly sequential.
+    A slow backend call therefore never delays the computation of the following clicks.
+    """
+    waiter_class = DeadlineWaiter # Overridable, e.g. by benchmarks that time the waits
+
+    def __init__(self, tracks: list[ClickTrack], waiter_class=None, queue_capacity: int = QUEUE_CAPACITY):
+        self.tracks = list(tracks)
+        if waiter_class is not None:
+            self.waiter_class = waiter_class
+        self.waiter = None # Waiter of the current/last run, e.g. for its wakeup histogram
+        self.queue = CommandQueue(queue_capacity)
+        self.rate = RateEstimator() # All click types together
+        self._finish_reason = RUN_STOPPED # Why the producer stopped
+        self._producer_error = None
+
+    def replace_tracks(self, tracks: list[ClickTrack]):
+        """
+        Hands new tracks to a running scheduler without stopping it. A track whose button was
+        already running continues that timeline (see `ClickTrack.resume`); new buttons start now.
+        Safe to call from any thread. Commands still queued are regenerated, so the new tracks
+        take over right after the click the worker is waiting for.
+        """
+        self.queue.request_swap(list(tracks))
+
+    def _take_pending_tracks(self, unqueued=None) -> list:
+        tracks, retracted = self.queue.take_swap()
+        if unqueued is not None:
+            retracted.append(unqueued)
+        try:
+            taken_back = {}
+            for command in retracted:
+                taken_back.setdefault(command[1], []).append(command)
+            for track, commands in taken_back.items():
+                track.take_back(commands)
+            previous = {track.button: track for track in self.tracks}
+            now = time.perf_counter()
+            for track in tracks:
+                if track.button in previous:
+                    track.resume(previous[track.button])
+                else:
+                    track.start(now)
+            self.tracks = tracks
+        finally:
+            self.queue.finish_swap()
+        heap = [(track.next_deadline, seq, track) for seq, track in enumerate(tracks)]
+        heapq.heapify(heap)
+        return heap
+
+    def run(self, stop_event: threading.Event, inject, on_click=None, stop_requested=None, recorder=None,
+            producer_thread: ParkedThread | None = None) -> str:
+        """
+        Fires clicks until stopped.
+
+        Args:
+            stop_event (threading.Event): Set to stop the session; wakes a waiting scheduler immediately.
+            inject (callable): inject(button, jitter_x, jitter_y) performs the actual click; steps that
+                hold the button down call inject(button, jitter_x, jitter_y, hold_s).
+            on_click (callable, optional): on_click(track, current_cps) called after each click.
+            stop_requested (callable, optional): Returns True to finish after the current cycle.
+            recorder (recorder.SessionRecorder, optional): Logs every injected click.
+            producer_thread (ParkedThread, optional): Runs the producer instead of a new thread.
+
+        Returns:
+            str: RUN_STOPPED or RUN_FINISHED.
+        """
+        waiter = self.waiter = self.waiter_class(stop_event)
+        self.rate.reset()
+        queue = self.queue
+        if producer_thread is not None:
+            wait_for_producer = producer_thread.submit(self._produce, stop_event, stop_requested).wait
+        else:
+            producer = threading.Thread(target=self._produce, args=(stop_event, stop_requested),
+                                        name="click-producer", daemon=True)
+            producer.start()
+            wait_for_producer = producer.join
+        try:
+            reason = self._inject_commands(waiter, inject, on_click, stop_requested,
+                                           recorder.record if recorder is not None else None)
+        finally:
+            queue.close() # Releases a producer blocked on a full queue
+            wait_for_producer()
+        if self._producer_error is not None:
+            raise self._producer_error
+        if reason is None: # The producer ended the session and the queue has been drained
+            reason = RUN_STOPPED if stop_event.is_set() else self._finish_reason
+        return reason
+
+    def _produce(self, stop_event: threading.Event, stop_requested):
+        queue = self.queue
+        perf_counter = time.perf_counter
+        reason = RUN_STOPPED
+        try:
+            start_time = perf_counter()
+            heap = []
+            for seq, track in enumerate(self.tracks):
+                track.start(start_time)
+                heap.append((track.next_deadline, seq, track))
+            heapq.heapify(heap)
+            seq = len(heap) # Tie-breaker so equal deadlines keep FIFO order
+            unqueued = None # Command generated but not queued because a swap interrupted it
+
+            while not stop_event.is_set():
+                if stop_requested is not None and stop_requested():
+                    reason = RUN_FINISHED
+                    break
+                if queue.swap_pending:
+                    heap = self._take_pending_tracks(unqueued)
+                    unqueued = None
+                    seq = len(heap)
+                if not heap:
+                    reason = RUN_FINISHED
+                    break
+
+                deadline, _, track = heap[0]
+                # Values come from the precomputed chunk; refills happen while the worker sleeps
+                click = track.next_click()
+                if click is None:
+                    reason = RUN_FINISHED
+                    break
+                current_cps, interval, jitter_x, jitter_y, button, hold_s = click
+                command = (deadline, track, button, jitter_x, jitter_y, hold_s, current_cps, interval)
+                result = queue.put(command)
+                if result == PUT_INTERRUPTED:
+                    unqueued = command
+                    continue
+                if result == PUT_CLOSED:
+                    break
+
+                # The producer runs ahead of the clock; it only falls behind if the worker stalled
+                track.advance(interval, perf_counter())
+                heapq.heapreplace(heap, (track.next_deadline, seq, track))
+                seq += 1
+        except Exception as e:
+            self._producer_error = e
+        finally:
+            self._finish_reason = reason
+            queue.close()
+
+    def _inject_commands(self, waiter, inject, on_click, stop_requested, record) -> str | None:
+        """The injection worker: waits for each queued command's deadline and fires it."""
+        queue = self.queue
+        session_rate = self.rate
+        perf_counter = time.perf_counter
+        while True:
+            command = queue.get()
+            if command is None:
+                return None
+            if stop_requested is not None and stop_requested():
+                return RUN_FINISHED
+            deadline, track, button, jitter_x, jitter_y, hold_s, current_cps, _ = command
+
+            if not waiter.wait_until(deadline):
+                return RUN_STOPPED
+            fired_at = perf_counter()
+            lateness = fired_at - deadline
+            if lateness > MAX_CATCHUP_S:
+                queue.dropped += 1 # Stale after a stall: skipped, the producer re-anchors its timeline
+                continue
+            if lateness > LATE_COMMAND_S:
+                queue.late += 1
+            track.stats.record(deadline, fired_at)
+
+            if hold_s:
+                inject(button, jitter_x, jitter_y, hold_s)
+            else:
+                inject(button, jitter_x, jitter_y)
+            track.stats.record_injection(perf_counter() - fired_at)
+            if record is not None:
+                record(button, jitter_x, jitter_y, current_cps)
+            track.current_cps = current_cps
+            track.rate.record(fired_at)
+            session_rate.record(fired_at)
+            if on_click is not None:
+                on_click(track, current_cps)
+
+    def rate_stats(self) -> tuple[RateStats, ...]:
+        """Achieved vs. requested rate of every track."""
+        return tuple(track.rate.stats(track.label, track.current_cps) for track in self.tracks)
+
+    def summary(self) -> dict:
+        """Returns the timeline statistics of every track, keyed by button."""
+        return {track.button: track.stats.summary() for track in self.tracks}
@@ -0,0 +1,64 @@
+"""
+Startup-time report (`autoclicker_app.py --startup-report`).
+
+Phase timings are taken in-process; the per-module breakdown comes from a fresh
+interpreter run with `-X importtime`, so it reflects a cold import of the GUI modules.
+"""
+import subprocess
+import sys
+import time
+
+STARTUP_BUDGET_MS = 150.0 # Target from launch to an idle, usable window
+IMPORT_REPORT_TOP = 10 # Slowest modules listed in the report
+
+
+class StartupTimer:
+    """Records named phases relative to a start timestamp."""
+    def __init__(self, started_at: float | None = None):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases = [] # (name, perf_counter timestamp)
+
+    def mark(self, name: str):
+        self.phases.append((name, time.perf_counter()))
+
+    def total_ms(self) -> float:
+        return (self.phases[-1][1] - self.started_at) * 1000.0 if self.phases else 0.0
+
+    def format_phases(self) -> list[str]:
+        lines, previous = [], self.started_at
+        for name, timestamp in self.phases:
+            lines.append(f"{name:>16}: {(timestamp - previous) * 1000.0:7.1f} ms")
+            previous = timestamp
+        return lines
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parses `-X importtime` output into (module, self_us, cumulative_us) tuples."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # Header line
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def profile_imports(modules: tuple[str, ...], top: int = IMPORT_REPORT_TOP) -> list[tuple[str, int, int]]:
+    """Imports `modules` in a fresh interpreter and returns the `top` slowest by self time."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=False)
+    return sorted(parse_importtime(result.stderr), key=lambda entry: entry[1], reverse=True)[:top]
+
+
+def format_report(timer: StartupTimer, modules: tuple[str, ...]) -> str:
+    total = timer.total_ms()
+    lines = ["Başlangıç süresi:", *timer.format_phases(),
+             f"{'toplam':>16}: {total:7.1f} ms (hedef {STARTUP_BUDGET_MS:.0f} ms"
+             f"{', AŞILDI' if total > STARTUP_BUDGET_MS else ''})",
+             f"En yavaş importlar ({', '.join(modules)}, soğuk başlangıç):"]
+    for module, self_us, cumulative_us in profile_imports(modules):
+        lines.append(f"{module:>30}: {self_us / 1000.0:6.1f} ms (toplam {cumulative_us / 1000.0:6.1f} ms)")
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+import math
+from array import array
+from collections import deque
+from typing import NamedTuple
+
+DEFAULT_UI_REFRESH_HZ = 20 # How often the UI polls the click thread's counters
+RATE_WINDOWS_S = (1.0, 5.0) # Sliding windows of the achieved-rate estimator
+RATE_BUFFER_SIZE = 1024 # Timestamps kept; enough for 5 s at ~200 CPS
+
+
+class RateStats(NamedTuple):
+    """Achieved click rate of one click type, measured from real injection timestamps."""
+    label: str
+    target_cps: float # What the mode requested for the latest click
+    cps_1s: float
+    cps_5s: float
+    min_interval_ms: float # Over the 5 s window
+    max_interval_ms: float
+    jitter_ms: float # Standard deviation of the inter-click intervals
+
+
+class TelemetrySnapshot(NamedTuple):
+    sequence: int # Incremented on every publish; lets the reader skip unchanged snapshots
+    click_count: int
+    achieved_cps: float # Measured over the last second, all click types together
+    target_cps: float # Requested by the mode(s)
+    label: str
+    rates: tuple # RateStats per click type
+
+
+class _RateWindow:
+    """Running sums and monotonic min/max queues of the intervals inside one sliding window."""
+    def __init__(self, span_s: float):
+        self.span_s = span_s
+        self.tail = 0 # Sequence number of the oldest timestamp inside the window
+        self.count = 0 # Intervals inside the window
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min_queue = deque() # (sequence, interval), increasing intervals
+        self.max_queue = deque() # (sequence, interval), decreasing intervals
+
+    def add(self, sequence: int, interval: float):
+        self.count += 1
+        self.total += interval
+        self.total_sq += interval * interval
+        min_queue, max_queue = self.min_queue, self.max_queue
+        while min_queue and min_queue[-1][1] >= interval:
+            min_queue.pop()
+        min_queue.append((sequence, interval))
+        while max_queue and max_queue[-1][1] <= interval:
+            max_queue.pop()
+        max_queue.append((sequence, interval))
+
+    def remove(self, sequence: int, interval: float):
+        self.count -= 1
+        self.total -= interval
+        self.total_sq -= interval * interval
+        if self.min_queue and self.min_queue[0][0] <= sequence:
+            self.min_queue.popleft()
+        if self.max_queue and self.max_queue[0][0] <= sequence:
+            self.max_queue.popleft()
+
+    def rate(self) -> float:
+        return self.count / self.total if self.count and self.total > 0 else 0.0
+
+
+class RateEstimator:
+    """
+    Sliding-window estimator of the achieved click rate.
+
+    Click timestamps go into a fixed ring buffer. Each window keeps a tail pointer, running
+    sums of its intervals and monotonic queues for min/max, so `record` is amortized O(1)
+    regardless of CPS or window length.
+    """
+    def __init__(self, windows_s: tuple = RATE_WINDOWS_S, capacity: int = RATE_BUFFER_SIZE):
+        self._capacity = capacity
+        self._timestamps = array('d', [0.0]) * capacity
+        self._intervals = array('d', [0.0]) * capacity
+        self._count = 0
+        self.windows = tuple(_RateWindow(span_s) for span_s in windows_s)
+
+    def reset(self):
+        self._count = 0
+        self.windows = tuple(_RateWindow(window.span_s) for window in self.windows)
+
+    def record(self, timestamp: float):
+        capacity = self._capacity
+        timestamps, intervals = self._timestamps, self._intervals
+        head = self._count
+        self._count += 1
+        timestamps[head % capacity] = timestamp
+        if head > 0:
+            interval = timestamp - timestamps[(head - 1) % capacity]
+            intervals[head % capacity] = interval
+
+        oldest_kept = head - capacity + 1 # Older slots are about to be overwritten
+        for window in self.windows:
+            if head > 0:
+                window.add(head, interval)
+            limit = timestamp - window.span_s
+            tail = window.tail
+            # At least the latest interval is kept so rates below 1/span still read correctly
+            while tail < head - 1 and (timestamps[tail % capacity] < limit or tail < oldest_kept):
+                tail += 1
+                # The interval ending at the new tail no longer has both ends inside the window
+                window.remove(tail, intervals[tail % capacity])
+            window.tail = tail
+
+    def stats(self, label: str = "", target_cps: float = 0.0) -> RateStats:
+        short, long = self.windows[0], self.windows[-1]
+        min_ms = long.min_queue[0][1] * 1000.0 if long.min_queue else 0.0
+        max_ms = long.max_queue[0][1] * 1000.0 if long.max_queue else 0.0
+        jitter_ms = 0.0
+        if long.count:
+            mean = long.total / long.count
+            jitter_ms = math.sqrt(max(0.0, long.total_sq / long.count - mean * mean)) * 1000.0
+        return RateStats(label, target_cps, short.rate(), long.rate(), min_ms, max_ms, jitter_ms)
+
+
+class ClickTelemetry:
+    """
+    Single-writer snapshot channel from the click thread to the UI.
+
+    The click thread publishes by replacing one immutable snapshot reference, which is
+    atomic in CPython, so no lock is needed and nothing is queued on the Tk event loop per
+    click. The UI reads the latest snapshot from a single periodic `after` timer, keeping
+    its cost constant regardless of CPS.
+    """
+    def __init__(self):
+        self.snapshot = TelemetrySnapshot(0, 0, 0.0, 0.0, "", ())
+
+    def reset(self):
+        self.snapshot = TelemetrySnapshot(self.snapshot.sequence + 1, 0, 0.0, 0.0, "", ())
+
+    def publish_count(self, click_count: int):
+        """Cheap per-click update that keeps the last published rates."""
+        self.snapshot = self.snapshot._replace(sequence=self.snapshot.sequence + 1, click_count=click_count)
+
+    def publish(self, click_count: int, achieved_cps: float, target_cps: float, label: str, rates: tuple):
+        self.snapshot = TelemetrySnapshot(self.snapshot.sequence + 1, click_count, achieved_cps, target_cps, label, rates)
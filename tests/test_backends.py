@@ -0,0 +1,162 @@
+import unittest
+import time
+from unittest.mock import MagicMock, patch
+from collections import namedtuple
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import backends
+from backends import (get_backend, ClickBackend, CursorTracker, InjectedClickFilter, NullBackend, PyAutoGUIBackend,
+                      PynputBackend, XTestBackend)
+
+Point = namedtuple('Point', ['x', 'y'])
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_null_backend_records(self):
+        backend = NullBackend(record=True, cursor=(10, 20))
+        self.assertEqual(backend.position(), (10, 20))
+        backend.click(11, 19, 'left')
+        backend.click(10, 20, 'right')
+        self.assertEqual(backend.click_count, 2)
+        self.assertEqual(backend.clicks, [(11, 19, 'left'), (10, 20, 'right')])
+
+    def test_null_backend_counts_without_recording(self):
+        backend = NullBackend()
+        backend.click(0, 0, 'left')
+        self.assertEqual(backend.click_count, 1)
+        self.assertEqual(backend.clicks, [])
+
+    def test_null_backend_click_here(self):
+        backend = NullBackend(record=True, cursor=(3, 4))
+        backend.click_here('left')
+        self.assertEqual(backend.clicks, [(3, 4, 'left')])
+
+    def test_base_click_here_queries_position(self):
+        class Recording(ClickBackend):
+            def __init__(self):
+                self.calls = []
+            def position(self):
+                self.calls.append('position')
+                return (1, 2)
+            def click(self, x, y, button):
+                self.calls.append((x, y, button))
+        backend = Recording()
+        backend.click_here('right')
+        self.assertEqual(backend.calls, ['position', (1, 2, 'right')])
+
+    def test_cursor_tracker(self):
+        tracker = CursorTracker()
+        self.assertIsNone(tracker.position)
+        tracker.on_move(10.6, 20.2)
+        self.assertEqual(tracker.position, (10, 20))
+
+    def test_injected_click_filter(self):
+        injected = InjectedClickFilter(window_s=0.05)
+        self.assertFalse(injected.is_own('left')) # Nothing injected: a real click
+        injected.expect('left')
+        self.assertFalse(injected.is_own('right'))
+        self.assertTrue(injected.is_own('left')) # Press
+        self.assertTrue(injected.is_own('left')) # Release
+        self.assertFalse(injected.is_own('left')) # The user's own click right after
+        self.assertEqual(injected.suppressed, 2)
+
+        injected.expect('left')
+        time.sleep(0.08) # Never reported back in time: forgotten
+        self.assertFalse(injected.is_own('left'))
+        self.assertEqual(injected.expired, 2)
+        injected.expect('left')
+        self.assertTrue(injected.is_own('left'))
+
+    def test_injected_click_filter_expires_each_announcement(self):
+        # Injections never pause for a whole window while clicking; an event the listener
+        # misses must still expire instead of swallowing the user's clicks for the session
+        injected = InjectedClickFilter(window_s=0.01)
+        injected.expect('left', 1) # Never reported back
+        for _ in range(5):
+            time.sleep(0.015)
+            injected.expect('left')
+            self.assertTrue(injected.is_own('left')) # Press, reported right away
+            self.assertTrue(injected.is_own('left')) # Release
+            time.sleep(0.015)
+            self.assertFalse(injected.is_own('left')) # The user's click between two injections
+        self.assertEqual(injected.expired, 1)
+
+        # A listener that never sees injected events at all
+        injected = InjectedClickFilter(window_s=0.01)
+        for _ in range(5):
+            injected.expect('left')
+            time.sleep(0.015)
+            self.assertFalse(injected.is_own('left'))
+        self.assertEqual(injected.suppressed, 0)
+
+    def test_get_backend_by_name(self):
+        self.assertIsInstance(get_backend("null"), NullBackend)
+        with self.assertRaises(ValueError):
+            get_backend("olmayan")
+
+    def test_pyautogui_backend(self):
+        mock_pyautogui = MagicMock()
+        mock_pyautogui.position.return_value = Point(5, 6)
+        with patch.dict(sys.modules, {'pyautogui': mock_pyautogui}):
+            backend = PyAutoGUIBackend()
+        self.assertEqual(mock_pyautogui.PAUSE, 0)
+        self.assertEqual(backend.position(), (5, 6))
+        backend.click(7, 8, 'right')
+        mock_pyautogui.click.assert_called_once_with(x=7, y=8, button='right')
+
+    def test_pynput_backend(self):
+        mock_pynput = MagicMock()
+        controller = mock_pynput.mouse.Controller.return_value
+        controller.position = (3.0, 4.0)
+        with patch.dict(sys.modules, {'pynput': mock_pynput, 'pynput.mouse': mock_pynput.mouse}):
+            backend = PynputBackend()
+        self.assertEqual(backend.position(), (3, 4))
+        backend.click(9, 10, 'left')
+        self.assertEqual(controller.position, (9, 10))
+        controller.click.assert_called_once_with(mock_pynput.mouse.Button.left, 1)
+
+        controller.position = (1, 1)
+        backend.click_here('right')
+        self.assertEqual(controller.position, (1, 1)) # Clicked in place, cursor untouched
+        controller.click.assert_called_with(mock_pynput.mouse.Button.right, 1)
+
+    def test_xtest_requires_display(self):
+        with patch.dict(os.environ, {'DISPLAY': ''}):
+            with self.assertRaises(RuntimeError):
+                XTestBackend()
+
+    def test_auto_falls_back_in_order(self):
+        def unavailable():
+            raise RuntimeError("yok")
+        def missing():
+            raise ImportError("yok")
+        fake_backends = {'xtest': unavailable, 'pynput': missing, 'pyautogui': NullBackend, 'null': NullBackend}
+        with patch.dict(backends.BACKENDS, fake_backends):
+            self.assertIsInstance(get_backend("auto"), NullBackend)
+
+    def test_auto_reports_when_nothing_works(self):
+        def unavailable():
+            raise RuntimeError("yok")
+        with patch.dict(backends.BACKENDS, {'xtest': unavailable, 'pynput': unavailable, 'pyautogui': unavailable}):
+            with self.assertRaises(RuntimeError):
+                get_backend("auto")
+
+    def test_named_backend_import_error_becomes_runtime_error(self):
+        def missing():
+            raise ImportError("No module named 'pyautogui'")
+        with patch.dict(backends.BACKENDS, {'pyautogui': missing}):
+            with self.assertRaises(RuntimeError):
+                get_backend("pyautogui")
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(NotImplementedError):
+            ClickBackend().click(0, 0, 'left')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,16 +10,19 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from click_modes import (
     get_click_mode, SabitMode, DalgalıSinüsMode, PatlamaMode,
-    GerçekçiPerlinMode, RandomIntervalClickMode, PatternClickMode,
-    ClickMode # Base class for isinstance checks
+    GerçekçiPerlinMode, RandomIntervalClickMode, PatternClickMode, TraceReplayMode,
+    ClickMode, # Base class for isinstance checks
+    ClickSchedule, MIN_DELAY_S, enable_numpy, REPLAY_RESAMPLE
 )
+from recorder import SessionRecorder, open_trace
+import tempfile
 
 class TestClickModes(unittest.TestCase):
 
     def setUp(self):
         self.mock_app_core = MagicMock()
-        # Mock UI within app_core if modes interact with it directly (e.g. for errors)
-        self.mock_app_core.ui = MagicMock()
+        # Modes report errors (e.g. a bad pattern) through the engine
+        self.mock_app_core.report_error = MagicMock()
         # Some modes might call app_core.stop_clicking() or similar
         self.mock_app_core.stop_clicking = MagicMock()
         self.mock_app_core.stop_clicking_after_current_cycle = MagicMock()
@@ -41,6 +44,7 @@ class TestClickModes(unittest.TestCase):
             "Gerçekçi (Perlin)": GerçekçiPerlinMode,
             "Rastgele Aralık": RandomIntervalClickMode,
             "Pattern (Desen)": PatternClickMode,
+            "Kayıt Tekrarı": TraceReplayMode,
         }
         for name, expected_class in modes_to_test.items():
             mode_instance = get_click_mode(name, self.mock_app_core)
@@ -167,7 +171,7 @@ class TestClickModes(unittest.TestCase):
 
         # First call, parsing fails
         cps, _, _, _ = mode.get_next_action(params_invalid_pattern, elapsed_time=0.1)
-        self.mock_app_core.ui.show_error.assert_called_once()
+        self.mock_app_core.report_error.assert_called_once()
         # It should now return 0 CPS as parsing fails and signals stop
         self.assertAlmostEqual(cps, 0)
         # And core.stop_clicking should have been called by the mode's _parse_pattern
@@ -178,7 +182,7 @@ class TestClickModes(unittest.TestCase):
         params_empty_pattern = {**self.base_params, 'click_pattern': " - "} # only separators
 
         cps, _, _, _ = mode.get_next_action(params_empty_pattern, elapsed_time=0.1)
-        self.mock_app_core.ui.show_error.assert_called_once()
+        self.mock_app_core.report_error.assert_called_once()
         self.assertAlmostEqual(cps, 0) # Signals stop
         self.mock_app_core.stop_clicking.assert_called_once()
 
@@ -193,8 +197,8 @@ class TestClickModes(unittest.TestCase):
         self.assertEqual(pattern_mode.current_pattern_index, 1)
         pattern_mode.reset()
         self.assertEqual(pattern_mode.current_pattern_index, 0)
-        # Reset should also clear parsed pattern to be re-parsed on next get_next_action with potentially new params
-        self.assertEqual(pattern_mode.pattern_delays, [])
+        # Compiled programs live in the pattern cache, so reset only rewinds the index
+        self.assertAlmostEqual(pattern_mode.get_next_action(params_pattern, 0.2)[0], 10.0)
 
 
         # GerçekçiPerlinMode reset (check if noise objects are re-created/re-seeded)
@@ -228,6 +232,157 @@ class TestClickModes(unittest.TestCase):
             self.assertEqual(perlin_mode.noise_x._mock_name, "NoiseX_Reset")
 
 
+
+class TestGenerateSchedule(unittest.TestCase):
+
+    def setUp(self):
+        enable_numpy() # Vectorized path when NumPy is installed, like the app after its first start
+        self.mock_app_core = MagicMock()
+        self.base_params = {'peak_cps': 10.0, 'jitter_px': 3, 'timing_rand_ms': 10}
+        random.seed(42)
+
+    def _assert_valid(self, schedule, n, jitter_px):
+        self.assertIsInstance(schedule, ClickSchedule)
+        self.assertEqual(len(schedule.cps), n)
+        self.assertEqual(len(schedule.intervals), n)
+        self.assertEqual(len(schedule.jitter_x), n)
+        self.assertEqual(len(schedule.jitter_y), n)
+        for interval in schedule.intervals:
+            self.assertGreaterEqual(interval, MIN_DELAY_S)
+        for jitter in list(schedule.jitter_x) + list(schedule.jitter_y):
+            self.assertTrue(-jitter_px <= jitter <= jitter_px)
+
+    def test_every_mode_generates_schedule(self):
+        params = {**self.base_params, 'burst_duration': 100.0, 'min_cps_random': 5.0,
+                  'max_cps_random': 15.0, 'click_pattern': "100-80-120"}
+        for name in ["Sabit", "Dalgalı (Sinüs)", "Patlama", "Gerçekçi (Perlin)", "Rastgele Aralık", "Pattern (Desen)"]:
+            mode = get_click_mode(name, self.mock_app_core)
+            schedule = mode.generate_schedule(params, 32, start_time=1.0)
+            self._assert_valid(schedule, 32, params['jitter_px'])
+            self.assertFalse(schedule.finished, name)
+
+    def test_sabit_intervals(self):
+        schedule = SabitMode(self.mock_app_core).generate_schedule(self.base_params, 200)
+        for cps, interval in zip(schedule.cps, schedule.intervals):
+            self.assertEqual(cps, 10.0)
+            self.assertTrue(0.09 <= interval <= 0.11)
+
+    def test_random_interval_range(self):
+        params = {**self.base_params, 'timing_rand_ms': 0, 'min_cps_random': 4.0, 'max_cps_random': 8.0}
+        schedule = RandomIntervalClickMode(self.mock_app_core).generate_schedule(params, 200)
+        for cps, interval in zip(schedule.cps, schedule.intervals):
+            self.assertTrue(4.0 <= cps <= 8.0)
+            self.assertAlmostEqual(interval, 1.0 / cps)
+
+    def test_sinus_follows_scheduled_elapsed_time(self):
+        params = {**self.base_params, 'timing_rand_ms': 0}
+        schedule = DalgalıSinüsMode(self.mock_app_core).generate_schedule(params, 3, start_time=0.0)
+        self.assertAlmostEqual(schedule.cps[0], 10.0)
+        elapsed = schedule.intervals[0]
+        self.assertAlmostEqual(schedule.cps[1], 10.0 + math.sin(elapsed * 1.5) * 2.5)
+
+    def test_patlama_schedule_finishes_without_stop_request(self):
+        params = {**self.base_params, 'peak_cps': 20.0, 'burst_duration': 1.0, 'timing_rand_ms': 0}
+        mode = PatlamaMode(self.mock_app_core)
+        schedule = mode.generate_schedule(params, 1000, start_time=0.5)
+        self.assertTrue(schedule.finished)
+        self.assertLess(len(schedule.cps), 1000)
+        # Precomputing must not request a stop while generated clicks are still pending
+        self.mock_app_core.stop_clicking_after_current_cycle.assert_not_called()
+
+    def _click_times(self, mode, params, chunks, chunk_size=64):
+        """Elapsed times of the clicks of `chunks` consecutive chunks, as the scheduler requests them."""
+        times, elapsed = [], 0.0
+        for _ in range(chunks):
+            schedule = mode.generate_schedule(params, chunk_size, start_time=elapsed)
+            for interval in schedule.intervals:
+                times.append(elapsed)
+                elapsed += interval
+            if schedule.finished:
+                break
+        return times
+
+    def test_click_counts_follow_integrated_rate(self):
+        # With no timing randomness the clicks in [0, T] are the first click plus floor(∫λ dt)
+        params = {**self.base_params, 'timing_rand_ms': 0}
+        mode = DalgalıSinüsMode(self.mock_app_core)
+        times = self._click_times(mode, params, 4)
+        for window in (0.5, 1.0, 3.3, 10.0, 20.0):
+            with self.subTest(window=window):
+                expected = params['peak_cps'] * window + 2.5 / 1.5 * (1 - math.cos(1.5 * window))
+                self.assertLessEqual(abs(sum(t <= window for t in times) - 1 - expected), 1)
+
+        for duration, peak in ((1.0, 20.0), (5.0, 37.0), (0.4, 3.0)):
+            with self.subTest(duration=duration, peak=peak):
+                params = {**self.base_params, 'timing_rand_ms': 0, 'peak_cps': peak, 'burst_duration': duration}
+                times = self._click_times(PatlamaMode(self.mock_app_core), params, 100)
+                expected = peak * duration * 0.7 # ∫λ dt of the trapezoid: ramps of 0.3 * duration
+                self.assertLessEqual(abs(len(times) - 1 - expected), 1)
+                self.assertLess(times[-1], duration)
+
+    def test_patlama_ramp_starts_without_stall(self):
+        params = {**self.base_params, 'timing_rand_ms': 0, 'peak_cps': 20.0, 'burst_duration': 5.0}
+        schedule = PatlamaMode(self.mock_app_core).generate_schedule(params, 2)
+        # The first interval is where ∫λ reaches one click on the 0 -> 20 CPS ramp over 1.5 s
+        self.assertAlmostEqual(schedule.intervals[0], math.sqrt(2 * 1.5 / 20.0))
+
+    def test_perlin_schedule_advances_time_counter(self):
+        mode = GerçekçiPerlinMode(self.mock_app_core)
+        schedule = mode.generate_schedule(self.base_params, 16)
+        self.assertAlmostEqual(mode.time_counter, sum(schedule.intervals) * 0.5)
+
+    def test_pure_python_fallback(self):
+        with patch('click_modes.np', None):
+            schedule = SabitMode(self.mock_app_core).generate_schedule(self.base_params, 16)
+        self._assert_valid(schedule, 16, self.base_params['jitter_px'])
+        self.assertEqual(schedule.intervals.tolist(), list(schedule.intervals))
+
+
+    def _trace_params(self, times_ms, moves, **overrides):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "trace.clk")
+        recorder = SessionRecorder(path, capacity=len(times_ms), clock=iter([int(t * 1e6) for t in times_ms]).__next__)
+        recorder.open()
+        for dx, dy in moves:
+            recorder.record('left', dx, dy, 0.0)
+        recorder.close()
+        return {**self.base_params, 'timing_rand_ms': 0, 'trace': open_trace(path), 'replay_speed': 1.0, **overrides}
+
+    def test_trace_replay_in_order(self):
+        # 100 ms, 200 ms, then a pause that is skipped, then 50 ms
+        params = self._trace_params([0, 100, 300, 3000, 3050], [(0, 0), (9, -2), (1, 1), (0, 0), (0, 0)],
+                                    jitter_px=5)
+        mode = TraceReplayMode(self.mock_app_core)
+        schedule = mode.generate_schedule(params, 6)
+        self.assertEqual([round(i, 3) for i in schedule.intervals], [0.1, 0.2, 0.05, 0.1, 0.2, 0.05])
+        self.assertEqual(list(schedule.jitter_x)[:2], [0, 5]) # Captured travel, limited to jitter_px
+        self.assertEqual(list(schedule.jitter_y)[:2], [0, -2])
+
+        schedule = TraceReplayMode(self.mock_app_core).generate_schedule({**params, 'replay_speed': 2.0}, 3)
+        self.assertEqual([round(i, 3) for i in schedule.intervals], [0.05, 0.1, 0.025])
+        self.assertAlmostEqual(schedule.cps[0], 20.0)
+
+        schedule = TraceReplayMode(self.mock_app_core).generate_schedule({**params, 'jitter_px': 0}, 3)
+        self.assertEqual((list(schedule.jitter_x), list(schedule.jitter_y)), ([0] * 3, [0] * 3)) # Intervals only
+
+    def test_trace_replay_rewind_and_resample(self):
+        params = self._trace_params([0, 100, 300, 350], [(0, 0)] * 4)
+        mode = TraceReplayMode(self.mock_app_core)
+        first = mode.generate_schedule(params, 5)
+        mode.rewind(first.intervals[3:]) # The last two clicks were never fired
+        self.assertEqual(list(mode.generate_schedule(params, 2).intervals), list(first.intervals[3:]))
+
+        resampled = mode.generate_schedule({**params, 'replay_order': REPLAY_RESAMPLE}, 200)
+        self.assertEqual({round(i, 3) for i in resampled.intervals}, {0.1, 0.2, 0.05})
+
+    def test_trace_replay_missing_file(self):
+        mode = TraceReplayMode(self.mock_app_core)
+        schedule = mode.generate_schedule({**self.base_params, 'trace_path': "/olmayan/kayit.clk"}, 4)
+        self.assertTrue(schedule.finished)
+        self.mock_app_core.report_error.assert_called_once()
+
+
 if __name__ == '__main__':
     # Need to adjust path if running tests directly for imports to work
     # This is handled by sys.path.insert at the top for when tests are run via `python -m unittest discover`
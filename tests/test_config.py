@@ -0,0 +1,88 @@
+import unittest
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dataclasses
+
+from config import validate_click_params, compile_settings, ClickButton, ClickConfig
+
+
+class TestConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = {'mode': 'Sabit', 'peak_cps': '12.5', 'timing_rand_ms': '10', 'jitter_px': '3'}
+
+    def test_converts_raw_values(self):
+        params = validate_click_params(self.raw, "Sol Tık")
+        self.assertEqual(params, {'mode': 'Sabit', 'peak_cps': 12.5, 'timing_rand_ms': 10, 'jitter_px': 3})
+
+    def test_rejects_out_of_range_values(self):
+        for key, value in (('peak_cps', '0'), ('timing_rand_ms', '-1'), ('jitter_px', '-2'), ('peak_cps', 'abc')):
+            with self.subTest(key=key, value=value):
+                with self.assertRaises(ValueError):
+                    validate_click_params({**self.raw, key: value}, "Sol Tık")
+
+    def test_mode_specific_settings(self):
+        burst = validate_click_params({**self.raw, 'mode': 'Patlama', 'burst_duration': '2'}, "Sol Tık")
+        self.assertEqual(burst['burst_duration'], 2.0)
+        with self.assertRaises(ValueError):
+            validate_click_params({**self.raw, 'mode': 'Rastgele Aralık', 'min_cps_random': '9', 'max_cps_random': '5'}, "Sol Tık")
+        with self.assertRaises(ValueError):
+            validate_click_params({**self.raw, 'mode': 'Pattern (Desen)', 'click_pattern': '  '}, "Sol Tık")
+        with self.assertRaisesRegex(ValueError, "eksik"):
+            validate_click_params({**self.raw, 'mode': 'Patlama'}, "Sol Tık")
+
+    def test_compile_only_checks_active_tabs(self):
+        settings = {'active_config': "Use Left Click Settings", 'left': self.raw, 'right': {'peak_cps': 'bozuk'}}
+        config = compile_settings(settings)
+        self.assertIsInstance(config, ClickConfig)
+        self.assertEqual(len(config.buttons), 1)
+        self.assertIs(config.buttons[0].button, ClickButton.LEFT)
+        self.assertEqual(config.buttons[0].params['peak_cps'], 12.5)
+        with self.assertRaises(ValueError):
+            compile_settings({**settings, 'active_config': "Use Both Settings"})
+        with self.assertRaises(ValueError):
+            compile_settings({**settings, 'active_config': "Bilinmeyen"})
+
+    def test_compiled_config_is_immutable(self):
+        config = compile_settings({'active_config': "Use Both Settings", 'left': self.raw,
+                                   'right': {**self.raw, 'mode': 'Patlama', 'burst_duration': 3}})
+        self.assertEqual([b.button for b in config.buttons], [ClickButton.LEFT, ClickButton.RIGHT])
+        self.assertEqual(config.buttons[1].mode_name, 'Patlama')
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.active_config = "Use Left Click Settings"
+        with self.assertRaises(TypeError):
+            config.buttons[0].params['peak_cps'] = 1.0
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            compile_settings({'active_config': "Use Left Click Settings", 'left': {**self.raw, 'mode': 'Yok'}})
+
+    def test_button_enum_matches_plain_strings(self):
+        self.assertEqual(ClickButton.LEFT, 'left')
+        self.assertEqual({'left': 1}[ClickButton.LEFT], 1)
+
+    def test_pattern_is_compiled_at_validation(self):
+        params = validate_click_params({**self.raw, 'mode': 'Pattern (Desen)', 'click_pattern': "100x2-50R"}, "Sol Tık")
+        self.assertEqual(len(params['pattern_program']), 3)
+        with self.assertRaisesRegex(ValueError, "Sol Tık Pattern geçersiz"):
+            validate_click_params({**self.raw, 'mode': 'Pattern (Desen)', 'click_pattern': "100-abc"}, "Sol Tık")
+        with self.assertRaisesRegex(ValueError, "Basılı tutma süresi"):
+            validate_click_params({**self.raw, 'mode': 'Pattern (Desen)', 'click_pattern': "100@200"}, "Sol Tık")
+
+
+    def test_trace_is_opened_at_validation(self):
+        raw = {**self.raw, 'mode': 'Kayıt Tekrarı', 'trace_path': "/olmayan/kayit.clk", 'replay_speed': "1.5"}
+        with self.assertRaisesRegex(ValueError, "Sol Tık Kayıt dosyası okunamadı"):
+            validate_click_params(raw, "Sol Tık")
+        with self.assertRaisesRegex(ValueError, "Tekrar hızı"):
+            validate_click_params({**raw, 'replay_speed': "0"}, "Sol Tık")
+        with self.assertRaisesRegex(ValueError, "tekrar sırası"):
+            validate_click_params({**raw, 'replay_order': "Ters"}, "Sol Tık")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+import threading
+import time
+import tempfile
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import ClickEngine, EngineObserver
+from backends import NullBackend
+from config import compile_settings, ButtonConfig, ClickButton, ClickConfig
+from recorder import read_session
+
+
+class RecordingObserver(EngineObserver):
+    def __init__(self):
+        self.states = []
+        self.errors = []
+        self.finished = threading.Event()
+        self.session_stats = None
+
+    def on_state_changed(self, running):
+        self.states.append(running)
+
+    def on_error(self, title, message):
+        self.errors.append((title, message))
+
+    def on_session_finished(self, session_stats):
+        self.session_stats = session_stats
+        self.finished.set()
+
+
+def left_params(**overrides):
+    settings = {'mode': 'Sabit', 'peak_cps': 100.0, 'timing_rand_ms': 0, 'jitter_px': 0, **overrides}
+    return compile_settings({'active_config': "Use Left Click Settings", 'left': settings})
+
+
+class TestClickEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ClickEngine(backend_name="null")
+        self.observer = RecordingObserver()
+        self.engine.add_observer(self.observer)
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def test_runs_and_stops_without_ui(self):
+        self.engine.set_mode('left', 'Sabit')
+        self.assertTrue(self.engine.start(left_params()))
+        time.sleep(0.2)
+        self.engine.stop()
+        self.assertTrue(self.observer.finished.wait(2.0))
+
+        self.assertEqual(self.observer.states, [True, False])
+        self.assertAlmostEqual(self.engine.backend.click_count, 21, delta=3)
+        self.assertEqual(self.engine.click_count, self.engine.backend.click_count)
+        self.assertEqual(self.observer.session_stats['left']['clicks'], self.engine.click_count)
+        self.assertIsNone(self.engine.click_thread)
+        self.assertGreater(self.engine.last_wakeup_stats['wakeups'], 0)
+
+    def test_injections_are_announced_to_listener_filter(self):
+        self.engine.injected.window_s = 5.0 # Reported back after the session here, not within milliseconds
+        self.engine.set_mode('left', 'Sabit')
+        self.engine.start(left_params())
+        time.sleep(0.05)
+        self.engine.stop()
+        self.assertTrue(self.observer.finished.wait(2.0))
+        clicks = self.engine.backend.click_count
+        for _ in range(2 * clicks): # Every press and release the listener would report back
+            self.assertTrue(self.engine.injected.is_own('left'))
+        self.assertFalse(self.engine.injected.is_own('left'))
+
+    def test_mode_error_is_reported_and_ends_session(self):
+        # Settings validation rejects bad patterns, so hand the engine an unvalidated config
+        config = left_params()
+        params = {**config.buttons[0].params, 'mode': 'Pattern (Desen)', 'click_pattern': "abc"}
+        config = ClickConfig(config.active_config, (ButtonConfig(ClickButton.LEFT, 'Pattern (Desen)', params),))
+        self.engine.set_mode('left', 'Pattern (Desen)')
+        self.engine.start(config)
+        self.assertTrue(self.observer.finished.wait(2.0))
+        self.assertEqual(self.observer.errors[0][0], "Pattern Hatası")
+        self.assertFalse(self.engine.is_running)
+        self.assertEqual(self.engine.backend.click_count, 0)
+
+    def test_apply_config_switches_running_session(self):
+        self.engine.set_mode('left', 'Sabit')
+        self.engine.set_mode('right', 'Sabit')
+        self.engine.start(left_params())
+        click_thread = self.engine.click_thread
+        time.sleep(0.05)
+        both = compile_settings({'active_config': "Use Both Settings",
+                                 'left': {'mode': 'Sabit', 'peak_cps': 100.0, 'timing_rand_ms': 0, 'jitter_px': 0},
+                                 'right': {'mode': 'Sabit', 'peak_cps': 50.0, 'timing_rand_ms': 0, 'jitter_px': 0}})
+        self.assertTrue(self.engine.apply_config(both))
+        time.sleep(0.1)
+        self.engine.stop()
+        self.assertTrue(self.observer.finished.wait(2.0))
+
+        self.assertEqual(self.observer.states, [True, False]) # No restart
+        self.assertIs(self.engine.config, both)
+        self.assertIn('right', self.observer.session_stats)
+        self.assertGreater(self.observer.session_stats['right']['clicks'], 0)
+        self.assertAlmostEqual(self.observer.session_stats['left']['clicks'], 16, delta=3)
+        self.assertIsNot(click_thread, None)
+
+    def test_parked_worker_is_reused_and_latencies_measured(self):
+        self.engine.set_mode('left', 'Sabit')
+        self.engine.prepare()
+        workers = []
+        for _ in range(2):
+            self.observer.finished.clear()
+            self.assertTrue(self.engine.start(left_params(), time.perf_counter()))
+            workers.append(self.engine.click_thread)
+            time.sleep(0.05)
+            self.engine.stop()
+            self.assertTrue(self.observer.finished.wait(2.0))
+
+        self.assertIs(workers[0], workers[1]) # No thread is created per session
+        self.assertEqual(workers[0].name, "click-worker")
+        self.assertLess(self.engine.last_start_latency_s, 0.01)
+        self.assertLess(self.engine.last_stop_latency_s, 0.01)
+
+    def test_apply_config_requires_modes(self):
+        self.assertFalse(self.engine.apply_config(left_params()))
+        self.assertEqual(len(self.observer.errors), 1)
+
+    def test_start_requires_modes_and_backend(self):
+        self.assertFalse(self.engine.start(left_params()))
+        self.assertEqual(len(self.observer.errors), 1)
+
+        engine = ClickEngine(backend_name="olmayan")
+        engine.add_observer(self.observer)
+        engine.set_mode('left', 'Sabit')
+        self.assertFalse(engine.start(left_params()))
+        self.assertEqual(len(self.observer.errors), 2)
+        self.assertIn("olmayan", self.observer.errors[1][1])
+        self.assertEqual(self.observer.states, [])
+
+    def test_unknown_timer_is_reported(self):
+        engine = ClickEngine(backend_name="null", timer_name="olmayan")
+        engine.add_observer(self.observer)
+        engine.set_mode('left', 'Sabit')
+        self.assertFalse(engine.start(left_params()))
+        self.assertIn("olmayan", self.observer.errors[0][0] + self.observer.errors[0][1])
+
+    def test_session_is_recorded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.clk")
+            engine = ClickEngine(backend_name="null", record_path=path)
+            engine.add_observer(self.observer)
+            engine.set_mode('left', 'Sabit')
+            self.assertTrue(engine.start(left_params(jitter_px=3)))
+            time.sleep(0.1)
+            engine.stop()
+            self.assertTrue(self.observer.finished.wait(2.0))
+
+            log = read_session(path)
+            self.assertEqual(len(log), engine.click_count)
+            self.assertEqual(set(log.requested_cps), {100.0})
+            self.assertTrue(all(abs(dx) <= 3 for dx in log.dx))
+
+    def test_backend_is_loaded_on_first_start(self):
+        self.assertIsNone(self.engine.backend)
+        self.engine.set_mode('left', 'Sabit')
+        self.engine.start(left_params())
+        self.assertIsInstance(self.engine.backend, NullBackend)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.engine.set_mode('left', 'OlmayanMod')
+
+    def test_jitter_uses_tracked_cursor(self):
+        backend = NullBackend(record=True, cursor=(500, 500))
+        self.engine.backend = backend
+        stop = threading.Event()
+        self.engine._inject_click(stop, 'left', 0, 0)
+        self.engine._inject_click(stop, 'left', 2, -1) # No listener yet: queries the backend
+        self.engine.cursor.on_move(100, 200)
+        self.engine._inject_click(stop, 'right', 3, 4)
+        self.assertEqual(backend.clicks, [(500, 500, 'left'), (502, 499, 'left'), (103, 204, 'right')])
+        self.assertEqual(self.engine.cursor.position, (103, 204))
+
+    def test_pattern_steps_pick_button_and_hold(self):
+        backend = NullBackend(record=True, cursor=(10, 20))
+        self.engine.backend = backend
+        self.engine.set_mode('left', 'Pattern (Desen)')
+        self.engine.start(left_params(mode='Pattern (Desen)', click_pattern="20-40R@30"))
+        time.sleep(0.15)
+        self.engine.stop()
+        self.assertTrue(self.observer.finished.wait(2.0))
+
+        buttons = [button for _, _, button in backend.clicks]
+        self.assertGreaterEqual(len(buttons), 4)
+        self.assertEqual(buttons[:4], ['left', 'right', 'left', 'right'])
+        self.assertEqual(backend.pressed, set())
+
+    def test_hold_waits_on_its_own_session_stop_event(self):
+        backend = NullBackend(record=True)
+        self.engine.backend = backend
+        stop = threading.Event()
+        stop.set() # Its session was stopped; a newer session's event is still clear
+        started = time.perf_counter()
+        self.engine._inject_click(stop, 'left', 0, 0, 5.0)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(backend.pressed, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
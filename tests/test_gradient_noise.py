@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+import statistics
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gradient_noise import PerlinNoise
+
+try:
+    import perlin_noise
+except ImportError:
+    perlin_noise = None
+
+
+class TestGradientNoise(unittest.TestCase):
+
+    def test_zero_at_lattice_points(self):
+        noise = PerlinNoise(octaves=4, seed=7)
+        for i in range(10):
+            self.assertAlmostEqual(noise(i / 4), 0.0)
+
+    def test_deterministic_per_seed(self):
+        a, b, c = PerlinNoise(octaves=2, seed=11), PerlinNoise(octaves=2, seed=11), PerlinNoise(octaves=2, seed=12)
+        xs = [i * 0.037 for i in range(200)]
+        self.assertEqual([a(x) for x in xs], [b(x) for x in xs])
+        self.assertNotEqual([a(x) for x in xs], [c(x) for x in xs])
+
+    def test_range_and_smoothness(self):
+        noise = PerlinNoise(octaves=4, seed=3)
+        values = [noise(i * 0.001) for i in range(5000)]
+        self.assertTrue(all(-0.5 <= v <= 0.5 for v in values))
+        steps = [abs(b - a) for a, b in zip(values, values[1:])]
+        self.assertLess(max(steps), 0.01) # Continuous: tiny input steps give tiny output steps
+
+    def test_sample_many_matches_scalar(self):
+        noise = PerlinNoise(octaves=4, seed=5)
+        xs = [i * 0.113 - 3.0 for i in range(100)] # Includes negative coordinates
+        expected = [noise(x) for x in xs]
+        for actual, value in zip(noise.sample_many(xs), expected):
+            self.assertAlmostEqual(float(actual), value)
+        with patch('gradient_noise.np', None):
+            fallback = noise.sample_many(xs)
+        self.assertEqual(list(fallback), expected)
+
+    def test_does_not_repeat(self):
+        # A 256-entry lattice table repeated every 64 units at octaves=4; hashed gradients don't
+        for octaves in (2, 4):
+            noise = PerlinNoise(octaves=octaves, seed=17)
+            for x in (1.234, 7.9, 100.01):
+                with self.subTest(octaves=octaves, x=x):
+                    self.assertNotAlmostEqual(noise(x), noise(x + 256 / octaves))
+                    self.assertNotAlmostEqual(noise(x), noise(x + 1024 / octaves))
+
+    def test_invalid_octaves(self):
+        with self.assertRaises(ValueError):
+            PerlinNoise(octaves=0)
+
+    @unittest.skipIf(perlin_noise is None, "perlin_noise package not installed")
+    def test_same_statistical_character_as_perlin_noise(self):
+        xs = [i * 0.02 for i in range(1500)]
+        ours, theirs = [], []
+        for seed in range(1, 11):
+            ours.extend(PerlinNoise(octaves=4, seed=seed)(x) for x in xs)
+            theirs.extend(perlin_noise.PerlinNoise(octaves=4, seed=seed)(x) for x in xs)
+        self.assertAlmostEqual(statistics.fmean(ours), 0.0, delta=0.02)
+        self.assertAlmostEqual(statistics.pstdev(ours), statistics.pstdev(theirs), delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hotkeys import (compile_hotkeys, parse_action, parse_binding, resolve, modifier_bits, Hotkey, DEFAULT_HOTKEYS,
+                     MODIFIER_KEYS, MOD_CTRL, MOD_ALT, MOD_SHIFT, ACTION_TOGGLE, ACTION_HOLD, ACTION_PROFILE,
+                     ACTION_CPS_UP, ACTION_EMERGENCY)
+
+
+class TestHotkeys(unittest.TestCase):
+
+    def test_parse_binding(self):
+        self.assertEqual(parse_binding("key:f6"), ("key:f6", 0))
+        self.assertEqual(parse_binding("Ctrl+alt+key:up"), ("key:up", MOD_CTRL | MOD_ALT))
+        self.assertEqual(parse_binding("shift+mouse:x1"), ("mouse:x1", MOD_SHIFT))
+        for text in ("hyper+key:a", "f6", "key:", "ctrl+"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_binding(text)
+
+    def test_parse_action(self):
+        self.assertEqual(parse_action("toggle"), Hotkey(ACTION_TOGGLE))
+        self.assertEqual(parse_action("profile:3"), Hotkey(ACTION_PROFILE, 2))
+        for text in ("jump", "profile", "profile:0", "profile:x", "cps+:2"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_action(text)
+
+    def test_defaults_compile(self):
+        table = compile_hotkeys(DEFAULT_HOTKEYS)
+        self.assertEqual(resolve(table, "key:f1", MOD_CTRL | MOD_ALT), Hotkey(ACTION_PROFILE, 0))
+        self.assertIsNone(resolve(table, "key:f5", 0)) # A bare F key belongs to the focused application
+        self.assertEqual(resolve(table, "key:up", MOD_CTRL | MOD_ALT), Hotkey(ACTION_CPS_UP))
+        self.assertEqual(resolve(table, "key:f12", 0), Hotkey(ACTION_EMERGENCY))
+
+    def test_trigger_and_emergency_take_precedence(self):
+        table = compile_hotkeys({"key:f6": "cps+", "key:f12": "toggle"}, "key:f6", ACTION_HOLD)
+        self.assertEqual(resolve(table, "key:f6", 0), Hotkey(ACTION_HOLD))
+        self.assertEqual(resolve(table, "key:f12", 0), Hotkey(ACTION_EMERGENCY))
+
+    def test_resolve_chords(self):
+        table = compile_hotkeys({"ctrl+key:f6": "cps+"}, "key:f6")
+        self.assertEqual(resolve(table, "key:f6", MOD_CTRL), Hotkey(ACTION_CPS_UP))
+        # Other modifiers fall back to the unmodified binding, as a plain trigger always worked
+        self.assertEqual(resolve(table, "key:f6", MOD_SHIFT), Hotkey(ACTION_TOGGLE))
+        self.assertIsNone(resolve(table, "key:up", MOD_CTRL | MOD_ALT)) # Unbound
+        self.assertIsNone(resolve(table, None, 0)) # pynput reports some keys as None
+
+    def test_modifier_keys(self):
+        self.assertEqual(MODIFIER_KEYS["key:ctrl_l"], MOD_CTRL)
+        self.assertEqual(MODIFIER_KEYS["key:alt_gr"], MOD_ALT)
+        self.assertNotIn("key:f6", MODIFIER_KEYS)
+        self.assertEqual(modifier_bits({"key:ctrl_l", "key:ctrl_r", "key:alt_gr"}), MOD_CTRL | MOD_ALT)
+        self.assertEqual(modifier_bits(()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import threading
+import time
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from injection import CommandQueue, PUT_QUEUED, PUT_CLOSED, PUT_INTERRUPTED
+
+
+class TestCommandQueue(unittest.TestCase):
+
+    def test_fifo_across_ring_wrap(self):
+        queue = CommandQueue(3)
+        taken = []
+        for value in range(7):
+            self.assertEqual(queue.put(value), PUT_QUEUED)
+            if value: # Keep two queued so head and tail wrap around the ring
+                taken.append(queue.get())
+        queue.close()
+        while (command := queue.get()) is not None: # Closing still lets the worker drain
+            taken.append(command)
+        self.assertEqual(taken, list(range(7)))
+        self.assertEqual(queue.high_water, 2)
+
+    def test_full_queue_blocks_producer(self):
+        queue = CommandQueue(2)
+        queue.put(1)
+        queue.put(2)
+        results = []
+        producer = threading.Thread(target=lambda: results.append(queue.put(3)))
+        producer.start()
+        time.sleep(0.05)
+        self.assertEqual(results, []) # Backpressure: waiting for a free slot
+        self.assertEqual(queue.get(), 1)
+        producer.join(1.0)
+        self.assertEqual(results, [PUT_QUEUED])
+        self.assertEqual(queue.full_waits, 1)
+
+    def test_close_releases_both_sides(self):
+        queue = CommandQueue(1)
+        queue.put(1)
+        results = []
+        producer = threading.Thread(target=lambda: results.append(queue.put(2)))
+        producer.start()
+        queue.close()
+        producer.join(1.0)
+        self.assertEqual(results, [PUT_CLOSED])
+        self.assertEqual(queue.get(), 1)
+        self.assertIsNone(queue.get())
+
+    def test_swap_retracts_queued_commands_and_pauses_worker(self):
+        queue = CommandQueue(2)
+        queue.put('a')
+        queue.put('b')
+        queue.request_swap('tracks')
+        self.assertEqual(queue.put('c'), PUT_INTERRUPTED)
+
+        taken = []
+        worker = threading.Thread(target=lambda: taken.append(queue.get()))
+        worker.start()
+        payload, retracted = queue.take_swap()
+        self.assertEqual((payload, retracted), ('tracks', ['a', 'b']))
+        time.sleep(0.05)
+        self.assertEqual(taken, []) # The worker waits until the swap is finished
+        queue.put('a2')
+        queue.finish_swap()
+        worker.join(1.0)
+        self.assertEqual(taken, ['a2'])
+        self.assertEqual(queue.take_swap(), (None, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from patterns import compile_pattern, MAX_PATTERN_STEPS, STEP_TRACK_BUTTON, STEP_LEFT, STEP_RIGHT
+
+
+class TestCompilePattern(unittest.TestCase):
+
+    def test_plain_delays(self):
+        program = compile_pattern("100-50-200")
+        self.assertEqual(list(program.delay_min), [0.1, 0.05, 0.2])
+        self.assertEqual(list(program.delay_span), [0.0, 0.0, 0.0])
+        self.assertFalse(program.has_ranges or program.has_buttons or program.has_holds)
+
+    def test_repeats_and_nested_groups(self):
+        program = compile_pattern("(100-(50)x2)x2-200")
+        self.assertEqual([round(d * 1000) for d in program.delay_min], [100, 50, 50, 100, 50, 50, 200])
+        self.assertEqual(len(compile_pattern("100x5")), 5)
+
+    def test_ranges(self):
+        program = compile_pattern("80~120-10")
+        self.assertAlmostEqual(program.delay_min[0], 0.08)
+        self.assertAlmostEqual(program.delay_span[0], 0.04)
+        self.assertTrue(program.has_ranges)
+
+    def test_per_step_button_and_hold(self):
+        program = compile_pattern("100 - 90R@40 - 80l")
+        self.assertEqual(list(program.buttons), [STEP_TRACK_BUTTON, STEP_RIGHT, STEP_LEFT])
+        self.assertEqual(list(program.holds), [0.0, 0.04, 0.0])
+        self.assertTrue(program.has_buttons and program.has_holds)
+
+    def test_empty_items_are_skipped(self):
+        self.assertEqual(len(compile_pattern("100--50-")), 2)
+
+    def test_errors(self):
+        for pattern in ("", " - ", "abc", "(100", "()", "100x0", "100x1.5", "120~80", "100)", "100z",
+                        "100@200", "100@100", "80~120@90"):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    compile_pattern(pattern)
+
+    def test_error_reports_position(self):
+        with self.assertRaisesRegex(ValueError, r"konum 5"):
+            compile_pattern("100-z")
+
+    def test_step_limit(self):
+        with self.assertRaises(ValueError):
+            compile_pattern(f"1x{MAX_PATTERN_STEPS + 1}")
+        with self.assertRaises(ValueError):
+            compile_pattern("(1x1000)x1000")
+
+    def test_programs_are_cached(self):
+        self.assertIs(compile_pattern("10-20-30"), compile_pattern("10-20-30"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import json
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profiles import ProfileStore, PROFILE_FORMAT_VERSION
+
+
+class TestProfileStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "profiles.json")
+        self.profile = {'active_config': "Use Left Click Settings",
+                        'left': {'mode': 'Sabit', 'peak_cps': 12.0, 'timing_rand_ms': "10", 'jitter_px': "2"},
+                        'trigger': "key:f6"}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_file_is_empty(self):
+        store = ProfileStore(self.path)
+        store.load()
+        self.assertEqual(store.names(), [])
+        self.assertIsNone(store.last_used)
+
+    def test_round_trip_keeps_order_and_last_used(self):
+        store = ProfileStore(self.path)
+        store.put("Oyun", self.profile)
+        store.put("Yavaş", {**self.profile, 'active_config': "Use Right Click Settings"})
+        store.put("Oyun", self.profile) # Replacing keeps the hotkey position
+        store.save()
+
+        loaded = ProfileStore(self.path)
+        loaded.load()
+        self.assertEqual(loaded.names(), ["Oyun", "Yavaş"])
+        self.assertEqual(loaded.get("Oyun"), self.profile)
+        self.assertEqual(loaded.last_used, "Oyun")
+
+    def test_file_is_compact(self):
+        store = ProfileStore(self.path)
+        store.put("Oyun", self.profile)
+        store.save()
+        with open(self.path, encoding='utf-8') as f:
+            text = f.read()
+        self.assertNotIn("\n", text)
+        self.assertNotIn(": ", text)
+        self.assertEqual(json.loads(text)['version'], PROFILE_FORMAT_VERSION)
+        self.assertEqual(os.listdir(self.directory.name), ["profiles.json"]) # No temporary file left behind
+
+    def test_hotkeys_round_trip(self):
+        store = ProfileStore(self.path)
+        store.put("Oyun", self.profile)
+        store.save()
+        loaded = ProfileStore(self.path)
+        loaded.load()
+        self.assertIsNone(loaded.hotkeys) # Not written: the defaults apply
+
+        loaded.hotkeys = {"ctrl+alt+key:up": "cps+"}
+        loaded.save()
+        reloaded = ProfileStore(self.path)
+        reloaded.load()
+        self.assertEqual(reloaded.hotkeys, {"ctrl+alt+key:up": "cps+"})
+
+    def test_delete(self):
+        store = ProfileStore(self.path)
+        store.put("Oyun", self.profile)
+        store.delete("Oyun")
+        self.assertEqual(store.names(), [])
+        self.assertIsNone(store.last_used)
+        with self.assertRaises(KeyError):
+            store.get("Oyun")
+
+    def test_empty_name_rejected(self):
+        with self.assertRaises(ValueError):
+            ProfileStore(self.path).put("  ", self.profile)
+
+    def test_corrupt_file(self):
+        for content in ("{not json", "[]", '{"profiles": 3}', '{"version": 99, "profiles": {}}',
+                        '{"version": "2", "profiles": {}}', '{"version": null, "profiles": {}}'):
+            with self.subTest(content=content):
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    ProfileStore(self.path).load()
+
+    def test_file_that_failed_to_load_is_not_overwritten(self):
+        content = '{"version": 99, "profiles": {"Yeni": {}}}'
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        store = ProfileStore(self.path)
+        with self.assertRaises(ValueError):
+            store.load()
+        store.put("Oyun", self.profile)
+        with self.assertRaises(ValueError):
+            store.save()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import math
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rates import RateCurve, SineRate, PiecewiseLinearRate, TOLERANCE
+
+
+class TestRateCurves(unittest.TestCase):
+
+    def test_sine_cumulative_matches_numeric_integral(self):
+        curve = SineRate(10.0, 2.5, 1.5)
+        steps = 20000
+        t_end = 7.0
+        numeric = sum(curve.rate((i + 0.5) * t_end / steps) for i in range(steps)) * t_end / steps
+        self.assertAlmostEqual(curve.cumulative(t_end), numeric, places=5)
+
+    def test_sine_next_click_adds_one(self):
+        curve = SineRate(10.0, 2.5, 1.5)
+        t = 0.0
+        for _ in range(200):
+            following = curve.next_click(t)
+            self.assertGreater(following, t)
+            self.assertAlmostEqual(curve.cumulative(following) - curve.cumulative(t), 1.0, delta=TOLERANCE * 10)
+            t = following
+
+    def test_piecewise_linear(self):
+        curve = PiecewiseLinearRate([(0.0, 0.0), (0.3, 20.0), (0.7, 20.0), (1.0, 0.0)])
+        self.assertEqual(curve.end, 1.0)
+        self.assertAlmostEqual(curve.rate(0.15), 10.0)
+        self.assertAlmostEqual(curve.rate(0.85), 10.0)
+        self.assertEqual(curve.rate(1.0), 0.0)
+        self.assertAlmostEqual(curve.cumulative(1.0), 14.0) # Ramps 3 + 3, plateau 8
+        self.assertAlmostEqual(curve.time_at(3.0), 0.3)
+        self.assertAlmostEqual(curve.time_at(1.0), math.sqrt(2 * 0.3 / 20.0))
+        self.assertAlmostEqual(curve.time_at(13.0), 1.0 - math.sqrt(2 * 0.3 / 20.0))
+        self.assertEqual(curve.time_at(14.5), math.inf)
+        self.assertEqual(curve.next_click(0.99), math.inf)
+
+    def test_zero_length_segments_are_skipped(self):
+        curve = PiecewiseLinearRate([(0.0, 0.0), (0.5, 4.0), (0.5, 4.0), (1.0, 0.0)])
+        self.assertEqual(curve.times, [0.0, 0.5, 1.0])
+        self.assertAlmostEqual(curve.cumulative(1.0), 2.0)
+
+    def test_numeric_inversion_agrees_with_exact(self):
+        exact = PiecewiseLinearRate([(0.0, 1.0), (2.0, 9.0), (3.0, 0.5)])
+
+        class Numeric(RateCurve):
+            end = exact.end
+            rate = staticmethod(exact.rate)
+            cumulative = staticmethod(exact.cumulative)
+
+        numeric = Numeric()
+        for target in (0.5, 1.0, 7.3, 10.0, 14.0):
+            with self.subTest(target=target):
+                self.assertAlmostEqual(numeric.time_at(target), exact.time_at(target), places=7)
+
+
+if __name__ == '__main__':
+    unittest.main()
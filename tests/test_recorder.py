@@ -0,0 +1,153 @@
+import unittest
+import tempfile
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recorder import (SessionRecorder, ClickCapture, ClickTrace, read_session, open_trace,
+                      BUTTON_CODES, HEADER_SIZE)
+
+
+def write_trace(path, times_ms, moves=None):
+    """Writes a trace with the given click times (ms) and optional (dx, dy) per click."""
+    recorder = SessionRecorder(path, capacity=max(1, len(times_ms)), clock=iter([int(t * 1e6) for t in times_ms]).__next__)
+    recorder.open()
+    for index in range(len(times_ms)):
+        dx, dy = moves[index] if moves else (0, 0)
+        recorder.record('left', dx, dy, 0.0)
+    recorder.close()
+
+
+class TestSessionRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.clk")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        recorder = SessionRecorder(self.path, capacity=16)
+        recorder.open()
+        recorder.record('left', 2, -3, 12.5)
+        recorder.record('right', 0, 0, 7.0)
+        recorder.close()
+
+        log = read_session(self.path)
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log.session_id, recorder.session_id)
+        self.assertEqual(list(log.buttons), [BUTTON_CODES['left'], BUTTON_CODES['right']])
+        self.assertEqual((list(log.dx), list(log.dy)), ([2, 0], [-3, 0]))
+        self.assertEqual(list(log.requested_cps), [12.5, 7.0])
+        self.assertLessEqual(log.times_ns[0], log.times_ns[1])
+        self.assertEqual(log.summary()['by_button'], {'left': 1, 'right': 1})
+
+    def test_preallocated_then_trimmed(self):
+        recorder = SessionRecorder(self.path, capacity=1000)
+        recorder.open()
+        preallocated = os.path.getsize(self.path)
+        recorder.record('left', 0, 0, 10.0)
+        self.assertEqual(len(read_session(self.path)), 1) # Readable while still recording
+        recorder.close()
+        self.assertGreater(preallocated, os.path.getsize(self.path))
+        self.assertGreater(os.path.getsize(self.path), HEADER_SIZE)
+
+    def test_full_file_rotates_within_session(self):
+        recorder = SessionRecorder(self.path, capacity=4, backups=3)
+        recorder.open()
+        for index in range(10):
+            recorder.record('left', index, 0, 10.0)
+        recorder.close()
+
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        log = read_session(self.path)
+        self.assertEqual(list(log.dx), list(range(10)))
+        self.assertEqual(recorder.total, 10)
+
+    def test_new_session_rotates_previous(self):
+        first = SessionRecorder(self.path, capacity=4)
+        first.open()
+        first.record('left', 1, 0, 10.0)
+        first.close()
+        second = SessionRecorder(self.path, capacity=4)
+        second.open()
+        second.record('right', 2, 0, 5.0)
+        second.close()
+
+        self.assertEqual(list(read_session(self.path).dx), [2]) # Only the latest session
+        self.assertEqual(list(read_session(self.path + ".1").dx), [1])
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"x" * 64)
+        with self.assertRaises(ValueError):
+            read_session(self.path)
+        with self.assertRaises(ValueError):
+            read_session(self.path + ".missing")
+
+
+
+class TestClickTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.clk")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_capture_records_presses_and_movement(self):
+        capture = ClickCapture(self.path)
+        capture.open()
+        capture.on_click(100, 100, 'left', True)
+        capture.on_click(100, 100, 'left', False) # Releases are ignored
+        capture.on_click(104, 97, 'right', True)
+        capture.close()
+        capture.on_click(110, 110, 'left', True) # After closing: ignored
+
+        log = read_session(self.path)
+        self.assertEqual(capture.count, 2)
+        self.assertEqual((list(log.dx), list(log.dy)), ([0, 4], [0, -3]))
+        self.assertEqual(list(log.buttons), [BUTTON_CODES['left'], BUTTON_CODES['right']])
+
+    def test_steps_skip_pauses(self):
+        write_trace(self.path, [0, 100, 250, 5000, 5080], [(0, 0), (1, 2), (3, 4), (5, 6), (7, 8)])
+        trace = ClickTrace(self.path)
+        self.assertEqual(len(trace), 4)
+        self.assertEqual(trace.usable_steps, 3)
+        interval, dx, dy = trace.step(1)
+        self.assertAlmostEqual(interval, 0.15)
+        self.assertEqual((dx, dy), (1, 2))
+        self.assertIsNone(trace.step(2)) # The 4.75 s pause
+        self.assertAlmostEqual(trace.mean_cps, 3 / 0.33)
+
+    def test_unusable_trace_is_rejected(self):
+        write_trace(self.path, [0])
+        with self.assertRaisesRegex(ValueError, "aralığı yok"):
+            ClickTrace(self.path)
+        with self.assertRaises(ValueError):
+            open_trace(self.path + ".missing")
+
+    def test_open_trace_reuses_mapping_until_changed(self):
+        write_trace(self.path, [0, 100, 200])
+        trace = open_trace(self.path)
+        self.assertIs(open_trace(self.path), trace)
+        write_trace(self.path, [0, 50, 100, 150])
+        self.assertEqual(len(open_trace(self.path)), 3)
+
+    def test_capture_unmaps_cached_traces(self):
+        write_trace(self.path, [0, 100, 200])
+        trace = open_trace(self.path)
+        capture = ClickCapture(self.path) # Rotates the mapped trace away
+        capture.open()
+        capture.close()
+        self.assertTrue(trace._map.closed)
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertIsNot(open_trace(self.path + ".1"), trace)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler import ClickScheduler, ClickTrack, ParkedThread, RUN_STOPPED, RUN_FINISHED, SCHEDULE_CHUNK
+from click_modes import ClickMode, PatternClickMode
+from timing import MAX_CATCHUP_S
+
+
+class FakeMode(ClickMode):
+    """Constant-rate mode that records the elapsed times it was asked about."""
+    def __init__(self, cps, results=None):
+        super().__init__(MagicMock())
+        self.cps = cps
+        self.results = list(results) if results else None
+        self.elapsed_calls = []
+
+    def get_next_action(self, params, elapsed_time):
+        self.elapsed_calls.append(elapsed_time)
+        if self.results:
+            return self.results.pop(0)
+        return self.cps, 0, 0, 1.0
+
+
+def make_mode(cps, results=None):
+    return FakeMode(cps, results)
+
+
+class TestClickScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.stop_event = threading.Event()
+        self.clicks = []
+
+    def _inject(self, button, jitter_x, jitter_y):
+        self.clicks.append(button)
+
+    def _params(self):
+        return {'peak_cps': 0, 'jitter_px': 0, 'timing_rand_ms': 0}
+
+    def test_independent_rates_for_both_buttons(self):
+        left = ClickTrack('left', self._params(), make_mode(120.0))
+        right = ClickTrack('right', self._params(), make_mode(70.0))
+        scheduler = ClickScheduler([left, right])
+
+        threading.Timer(0.5, self.stop_event.set).start()
+        reason = scheduler.run(self.stop_event, self._inject)
+
+        self.assertEqual(reason, RUN_STOPPED)
+        # Each button follows its own rate (first click at t=0, so rate * 0.5 + 1)
+        self.assertAlmostEqual(self.clicks.count('left'), 61, delta=3)
+        self.assertAlmostEqual(self.clicks.count('right'), 36, delta=3)
+        summary = scheduler.summary()
+        self.assertAlmostEqual(summary['left']['scheduled_cps'], 120.0, delta=0.5)
+        self.assertAlmostEqual(summary['right']['scheduled_cps'], 70.0, delta=0.5)
+
+    def test_tracks_see_their_own_elapsed_time(self):
+        mode = make_mode(100.0)
+        scheduler = ClickScheduler([ClickTrack('left', self._params(), mode)])
+        threading.Timer(0.1, self.stop_event.set).start()
+        scheduler.run(self.stop_event, self._inject)
+
+        elapsed = mode.elapsed_calls
+        self.assertEqual(elapsed[0], 0.0)
+        self.assertAlmostEqual(elapsed[1], 0.01)
+        self.assertAlmostEqual(elapsed[2], 0.02)
+
+    def test_mode_zero_cps_finishes(self):
+        mode = make_mode(10.0, results=[(10.0, 0, 0, 1.0), (0, 0, 0, 1.0)])
+        track = ClickTrack('right', self._params(), mode)
+        reason = ClickScheduler([track]).run(self.stop_event, self._inject)
+        self.assertEqual(reason, RUN_FINISHED)
+        self.assertEqual(self.clicks, ['right'])
+
+    def test_stop_requested_after_cycle(self):
+        track = ClickTrack('left', self._params(), make_mode(10.0))
+        reason = ClickScheduler([track]).run(self.stop_event, self._inject, stop_requested=lambda: True)
+        self.assertEqual(reason, RUN_FINISHED)
+        self.assertEqual(self.clicks, [])
+
+    def test_on_click_callback(self):
+        on_click = MagicMock()
+        track = ClickTrack('left', self._params(), make_mode(50.0))
+        def inject(button, jitter_x, jitter_y):
+            self.stop_event.set()
+        ClickScheduler([track]).run(self.stop_event, inject, on_click)
+        on_click.assert_called_once_with(track, 50.0)
+        self.assertEqual(track.label, "Sol")
+
+    def test_track_consumes_precomputed_chunks(self):
+        mode = make_mode(100.0)
+        track = ClickTrack('left', self._params(), mode)
+        track.start(0.0)
+        clicks = [track.next_click() for _ in range(SCHEDULE_CHUNK + 1)]
+        # One chunk is generated up front, the next only once the first is exhausted
+        self.assertEqual(len(mode.elapsed_calls), 2 * SCHEDULE_CHUNK)
+        self.assertEqual(clicks[0], (100.0, 0.01, 0, 0, 'left', 0.0))
+        self.assertAlmostEqual(mode.elapsed_calls[SCHEDULE_CHUNK], SCHEDULE_CHUNK * 0.01)
+
+
+    def test_replace_tracks_continues_timeline(self):
+        old_mode, new_mode = make_mode(100.0), make_mode(200.0)
+        old = ClickTrack('left', self._params(), old_mode)
+        scheduler = ClickScheduler([old])
+        new = ClickTrack('left', self._params(), new_mode)
+        added = ClickTrack('right', self._params(), make_mode(50.0))
+
+        def inject(button, jitter_x, jitter_y):
+            self.clicks.append(button)
+            if len(self.clicks) == 3:
+                scheduler.replace_tracks([new, added])
+            elif len(self.clicks) == 10:
+                self.stop_event.set()
+        scheduler.run(self.stop_event, inject)
+
+        self.assertEqual(scheduler.tracks, [new, added])
+        self.assertIs(new.stats, old.stats)
+        self.assertEqual(new.start_time, old.start_time)
+        # The new mode picks up at the elapsed time of the next click instead of restarting at 0
+        self.assertAlmostEqual(new_mode.elapsed_calls[0], 0.03)
+        self.assertIn('right', self.clicks[3:])
+        self.assertEqual(old.stats.count, self.clicks.count('left')) # One record across the swap
+
+
+    def test_replace_tracks_rewinds_shared_mode(self):
+        # A live edit keeps the mode: the pattern continues where the fired clicks left it
+        mode = PatternClickMode(MagicMock())
+        params = {**self._params(), 'click_pattern': "2-2R-2R"}
+        scheduler = ClickScheduler([ClickTrack('left', params, mode)])
+
+        def inject(button, jitter_x, jitter_y):
+            self.clicks.append(button)
+            if len(self.clicks) == 5:
+                scheduler.replace_tracks([ClickTrack('left', {**params, 'jitter_px': 1}, mode)])
+            elif len(self.clicks) == 12:
+                self.stop_event.set()
+        scheduler.run(self.stop_event, inject)
+
+        self.assertEqual(self.clicks, ['left', 'right', 'right'] * 4)
+
+
+    def test_slow_injection_does_not_stall_producer(self):
+        mode = make_mode(200.0)
+        track = ClickTrack('left', self._params(), mode)
+        scheduler = ClickScheduler([track])
+
+        def inject(button, jitter_x, jitter_y):
+            self.clicks.append(button)
+            if len(self.clicks) == 2:
+                time.sleep(0.05) # e.g. a blocking backend call
+            elif len(self.clicks) == 20:
+                self.stop_event.set()
+        scheduler.run(self.stop_event, inject)
+
+        # The commands queued during the stall fire late instead of being recomputed
+        self.assertGreaterEqual(scheduler.queue.high_water, scheduler.queue.capacity - 1)
+        self.assertGreater(scheduler.queue.late, 0)
+        self.assertEqual(scheduler.queue.dropped, 0)
+
+    def test_stale_commands_are_dropped_after_a_stall(self):
+        track = ClickTrack('left', self._params(), make_mode(100.0))
+        scheduler = ClickScheduler([track])
+
+        def inject(button, jitter_x, jitter_y):
+            self.clicks.append(button)
+            if len(self.clicks) == 1:
+                time.sleep(MAX_CATCHUP_S + 0.1) # Longer than any catch-up burst is allowed to cover
+            elif len(self.clicks) == 5:
+                self.stop_event.set()
+        scheduler.run(self.stop_event, inject)
+
+        self.assertGreater(scheduler.queue.dropped, 0)
+        self.assertGreaterEqual(track.stats.resyncs, 1)
+
+
+
+class TestParkedThread(unittest.TestCase):
+
+    def test_runs_calls_in_order_on_one_thread(self):
+        parked = ParkedThread("test-parked")
+        seen = []
+        def task(value):
+            seen.append((value, threading.current_thread()))
+            if value == 1:
+                raise RuntimeError("ignored") # Must not kill the thread
+        done = [parked.submit(task, value) for value in range(3)]
+        self.assertTrue(done[-1].wait(1.0))
+        self.assertEqual([value for value, _ in seen], [0, 1, 2])
+        self.assertEqual({thread for _, thread in seen}, {parked.thread})
+
+    def test_scheduler_uses_parked_producer(self):
+        parked = ParkedThread("test-producer")
+        stop_event = threading.Event()
+        clicks = []
+        def inject(button, jitter_x, jitter_y):
+            clicks.append(threading.current_thread())
+            if len(clicks) == 3:
+                stop_event.set()
+        scheduler = ClickScheduler([ClickTrack('left', {'timing_rand_ms': 0, 'jitter_px': 0}, make_mode(200.0))])
+        self.assertEqual(scheduler.run(stop_event, inject, producer_thread=parked), RUN_STOPPED)
+        self.assertEqual(set(clicks), {threading.current_thread()})
+        self.assertFalse(parked._tasks) # The producer call has returned
+
+
+if __name__ == '__main__':
+    unittest.main()
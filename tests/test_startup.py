@@ -0,0 +1,36 @@
+import unittest
+import subprocess
+
+# Add project root to sys.path
+import sys
+import os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from startup import StartupTimer, parse_importtime
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _io\n"
+                  "import time:      3854 |      32883 | engine\n"
+                  "unrelated warning\n")
+        self.assertEqual(parse_importtime(stderr), [('_io', 120, 120), ('engine', 3854, 32883)])
+
+    def test_timer_phases(self):
+        timer = StartupTimer(started_at=0.0)
+        timer.phases = [("importlar", 0.05), ("arayüz", 0.08)]
+        self.assertAlmostEqual(timer.total_ms(), 80.0)
+        self.assertIn("30.0 ms", timer.format_phases()[1])
+
+    def test_engine_import_defers_heavy_dependencies(self):
+        code = ("import sys, engine; "
+                "print(sorted(m for m in ('numpy', 'gradient_noise', 'pyautogui', 'ctypes') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
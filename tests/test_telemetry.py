@@ -0,0 +1,118 @@
+import unittest
+import threading
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from telemetry import ClickTelemetry, TelemetrySnapshot, RateEstimator, RateStats
+
+
+class TestClickTelemetry(unittest.TestCase):
+
+    def test_initial_snapshot(self):
+        self.assertEqual(ClickTelemetry().snapshot, TelemetrySnapshot(0, 0, 0.0, 0.0, "", ()))
+
+    def test_publish_replaces_snapshot(self):
+        telemetry = ClickTelemetry()
+        telemetry.publish(1, 40.0, 40.0, "Sol", ())
+        telemetry.publish(2, 39.5, 40.0, "Sağ", ())
+        snapshot = telemetry.snapshot
+        self.assertEqual(snapshot.sequence, 2)
+        self.assertEqual(snapshot.click_count, 2)
+        self.assertEqual(snapshot.achieved_cps, 39.5)
+        self.assertEqual(snapshot.target_cps, 40.0)
+        self.assertEqual(snapshot.label, "Sağ")
+
+    def test_publish_count_keeps_rates(self):
+        telemetry = ClickTelemetry()
+        rates = (RateStats("Sol", 40.0, 39.0, 39.5, 24.0, 26.0, 0.5),)
+        telemetry.publish(1, 39.0, 40.0, "Sol", rates)
+        telemetry.publish_count(2)
+        self.assertEqual(telemetry.snapshot.click_count, 2)
+        self.assertEqual(telemetry.snapshot.rates, rates)
+        self.assertEqual(telemetry.snapshot.sequence, 2)
+
+    def test_reset_clears_counters_but_advances_sequence(self):
+        telemetry = ClickTelemetry()
+        telemetry.publish(5, 10.0, 10.0, "Sol", ())
+        telemetry.reset()
+        self.assertEqual(telemetry.snapshot.click_count, 0)
+        self.assertEqual(telemetry.snapshot.sequence, 2) # Reader still sees the change
+
+    def test_reader_never_sees_torn_snapshot(self):
+        telemetry = ClickTelemetry()
+        done = threading.Event()
+        def writer():
+            for n in range(1, 20001):
+                telemetry.publish(n, float(n), float(n), "Sol", ())
+            done.set()
+        threading.Thread(target=writer).start()
+        while not done.is_set():
+            snapshot = telemetry.snapshot
+            self.assertEqual(float(snapshot.click_count), snapshot.achieved_cps)
+        self.assertEqual(telemetry.snapshot.click_count, 20000)
+
+
+class TestRateEstimator(unittest.TestCase):
+
+    def _feed(self, estimator, intervals, start=0.0):
+        t = start
+        estimator.record(t)
+        for interval in intervals:
+            t += interval
+            estimator.record(t)
+        return t
+
+    def test_empty(self):
+        stats = RateEstimator().stats("Sol", 10.0)
+        self.assertEqual(stats, RateStats("Sol", 10.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+    def test_steady_rate(self):
+        estimator = RateEstimator()
+        self._feed(estimator, [0.025] * 400) # 10 s at 40 CPS
+        stats = estimator.stats()
+        self.assertAlmostEqual(stats.cps_1s, 40.0, places=6)
+        self.assertAlmostEqual(stats.cps_5s, 40.0, places=6)
+        self.assertAlmostEqual(stats.min_interval_ms, 25.0)
+        self.assertAlmostEqual(stats.max_interval_ms, 25.0)
+        self.assertAlmostEqual(stats.jitter_ms, 0.0, places=4)
+        # Only the last 1 s / 5 s of intervals are inside the windows
+        self.assertAlmostEqual(estimator.windows[0].count, 40, delta=1) # Boundary click may fall either side
+        self.assertAlmostEqual(estimator.windows[1].count, 200, delta=1)
+
+    def test_windows_see_rate_change(self):
+        estimator = RateEstimator()
+        t = self._feed(estimator, [0.1] * 50) # 5 s at 10 CPS
+        self._feed(estimator, [0.05] * 20, start=t + 0.05) # Then 1 s at 20 CPS
+        stats = estimator.stats()
+        self.assertAlmostEqual(stats.cps_1s, 20.0, places=6)
+        self.assertTrue(10.0 < stats.cps_5s < 20.0)
+        self.assertAlmostEqual(stats.min_interval_ms, 50.0)
+        self.assertAlmostEqual(stats.max_interval_ms, 100.0)
+        self.assertGreater(stats.jitter_ms, 0.0)
+
+    def test_min_max_expire_with_window(self):
+        estimator = RateEstimator()
+        t = self._feed(estimator, [0.5, 0.01]) # One long and one very short interval
+        self._feed(estimator, [0.1] * 60, start=t + 0.1)
+        stats = estimator.stats()
+        self.assertAlmostEqual(stats.min_interval_ms, 100.0)
+        self.assertAlmostEqual(stats.max_interval_ms, 100.0)
+
+    def test_low_rate_keeps_last_interval(self):
+        estimator = RateEstimator()
+        self._feed(estimator, [2.0, 2.0]) # 0.5 CPS, slower than the 1 s window
+        self.assertAlmostEqual(estimator.stats().cps_1s, 0.5)
+
+    def test_ring_buffer_overflow(self):
+        estimator = RateEstimator(capacity=64)
+        self._feed(estimator, [0.001] * 1000) # 1000 CPS: more clicks than fit in the buffer
+        stats = estimator.stats()
+        self.assertAlmostEqual(stats.cps_1s, 1000.0, places=3)
+        self.assertLessEqual(estimator.windows[1].count, 63)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import statistics
+import threading
+import time
+
+# Add project root to sys.path
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timing import (DeadlineWaiter, HighResWaiter, TimelineStats, WakeupHistogram, get_waiter_class,
+                    DEFAULT_SPIN_S, MAX_SPIN_S)
+
+
+class TestDeadlineWaiter(unittest.TestCase):
+
+    def setUp(self):
+        self.stop_event = threading.Event()
+        self.waiter = DeadlineWaiter(self.stop_event)
+
+    def test_reaches_deadline_accurately(self):
+        deadline = time.perf_counter() + 0.025 # One interval at 40 CPS
+        self.assertTrue(self.waiter.wait_until(deadline))
+        lateness = time.perf_counter() - deadline
+        self.assertGreaterEqual(lateness, 0.0)
+        self.assertLess(lateness, 0.002)
+
+    def test_past_deadline_returns_immediately(self):
+        self.assertTrue(self.waiter.wait_until(time.perf_counter() - 1.0))
+
+    def test_sleeps_instead_of_spinning(self):
+        cpu_start = time.process_time()
+        self.waiter.wait_until(time.perf_counter() + 0.2)
+        cpu_used = time.process_time() - cpu_start
+        # A busy-wait would burn ~0.2s of CPU; the hybrid waiter should only spin the final margin.
+        self.assertLess(cpu_used, 0.05)
+
+    def test_stop_event_interrupts_wait(self):
+        threading.Timer(0.02, self.stop_event.set).start()
+        started = time.perf_counter()
+        self.assertFalse(self.waiter.wait_until(started + 5.0))
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_already_stopped(self):
+        self.stop_event.set()
+        self.assertFalse(self.waiter.wait_until(time.perf_counter() + 1.0))
+
+    def test_spin_margin_adapts_to_oversleep(self):
+        self.assertEqual(self.waiter.spin_s, DEFAULT_SPIN_S)
+        for _ in range(50):
+            self.waiter._adapt(0.005) # Simulate a coarse platform timer
+        self.assertGreater(self.waiter.spin_s, 0.005)
+        self.assertLessEqual(self.waiter.spin_s, MAX_SPIN_S)
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "clock_nanosleep timer is Linux only")
+class TestHighResWaiter(unittest.TestCase):
+
+    def setUp(self):
+        self.stop_event = threading.Event()
+        self.waiter = HighResWaiter(self.stop_event)
+
+    def test_reaches_deadline_and_records_wakeups(self):
+        for _ in range(5):
+            deadline = time.perf_counter() + 0.005
+            self.assertTrue(self.waiter.wait_until(deadline))
+            self.assertGreaterEqual(time.perf_counter(), deadline)
+        self.assertEqual(self.waiter.wakeups.count, 5)
+        self.assertEqual(self.waiter.timer_slack_ns, 1)
+        self.assertIn("hrtimer", self.waiter.describe())
+
+    def test_stop_event_interrupts_long_wait(self):
+        threading.Timer(0.02, self.stop_event.set).start()
+        started = time.perf_counter()
+        self.assertFalse(self.waiter.wait_until(started + 5.0))
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_stop_mid_wait_returns_within_a_millisecond(self):
+        latencies = []
+        for _ in range(5):
+            stop_event = threading.Event()
+            waiter = HighResWaiter(stop_event)
+            deadline = time.perf_counter() + 0.05
+            stopped_at = []
+            def stop():
+                # Well inside what used to be the uninterruptible nanosleep slice
+                time.sleep(max(0.0, deadline - 0.015 - time.perf_counter()))
+                stopped_at.append(time.perf_counter())
+                stop_event.set()
+            threading.Thread(target=stop).start()
+            self.assertFalse(waiter.wait_until(deadline))
+            latencies.append(time.perf_counter() - stopped_at[0])
+        self.assertLess(statistics.median(latencies), 0.001)
+
+
+class TestWaiterSelection(unittest.TestCase):
+
+    def test_standard_and_unknown(self):
+        self.assertIs(get_waiter_class("standard"), DeadlineWaiter)
+        with self.assertRaises(ValueError):
+            get_waiter_class("olmayan")
+        with self.assertRaises(ValueError):
+            get_waiter_class("standard", realtime=True)
+
+
+class TestWakeupHistogram(unittest.TestCase):
+
+    def test_buckets_and_percentiles(self):
+        histogram = WakeupHistogram()
+        for latency_us in [5] * 90 + [150] * 9 + [8000]:
+            histogram.record(latency_us / 1e6)
+        summary = histogram.summary()
+        self.assertEqual(summary['wakeups'], 100)
+        self.assertEqual(summary['buckets_us']['<10'], 90)
+        self.assertEqual(summary['buckets_us']['<200'], 9)
+        self.assertEqual(summary['buckets_us']['>=5000'], 1)
+        self.assertEqual(summary['p50_us'], 10.0)
+        self.assertEqual(summary['p99_us'], 200.0)
+        self.assertAlmostEqual(summary['max_us'], 8000.0)
+        self.assertIn("<10 µs: 90", histogram.format_summary())
+
+    def test_early_wakeup_counts_as_zero(self):
+        histogram = WakeupHistogram()
+        histogram.record(-0.001)
+        self.assertEqual(histogram.counts[0], 1)
+        self.assertEqual(histogram.max, 0.0)
+
+
+class TestTimelineStats(unittest.TestCase):
+
+    def test_empty_summary(self):
+        summary = TimelineStats().summary()
+        self.assertEqual(summary['clicks'], 0)
+        self.assertEqual(summary['achieved_cps'], 0.0)
+
+    def test_constant_lateness_does_not_lower_cps(self):
+        stats = TimelineStats()
+        # 41 clicks on a 40 CPS timeline, each fired 0.3 ms late
+        for n in range(41):
+            deadline = n * 0.025
+            stats.record(deadline, deadline + 0.0003)
+        summary = stats.summary()
+        self.assertEqual(summary['clicks'], 41)
+        self.assertAlmostEqual(summary['scheduled_cps'], 40.0)
+        self.assertAlmostEqual(summary['achieved_cps'], 40.0)
+        self.assertAlmostEqual(summary['mean_lateness_ms'], 0.3)
+        self.assertAlmostEqual(summary['max_lateness_ms'], 0.3)
+        self.assertAlmostEqual(summary['drift_ms'], 0.3)
+
+    def test_growing_lateness_reported_as_drift(self):
+        stats = TimelineStats()
+        for n in range(11):
+            deadline = n * 0.1
+            stats.record(deadline, deadline + n * 0.001)
+        summary = stats.summary()
+        self.assertAlmostEqual(summary['drift_ms'], 10.0)
+        self.assertAlmostEqual(summary['max_lateness_ms'], 10.0)
+        self.assertLess(summary['achieved_cps'], summary['scheduled_cps'])
+        self.assertIn("CPS", stats.format_summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
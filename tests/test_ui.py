@@ -84,7 +84,8 @@ class TestAutoClickerUI(unittest.TestCase):
         # Need to ensure settings_widgets is populated correctly for this test
         # For instance, mode_combo is added to settings_widgets
         self.assertEqual(self.app_ui.mode_combo.cget("state"), "disabled")
-        self.assertEqual(self.app_ui.cps_scale.cget("state"), "disabled")
+        # CPS, timing randomness and jitter stay editable: they are applied to the running session
+        self.assertEqual(self.app_ui.cps_scale.cget("state"), "normal")
 
 
     def test_update_status_display_idle(self):
@@ -99,6 +100,15 @@ class TestAutoClickerUI(unittest.TestCase):
         self.app_ui.update_realtime_cps(12.34)
         self.assertEqual(self.app_ui.real_time_cps_label.cget("text"), "Anlık CPS: 12.3")
 
+    def test_update_realtime_cps_with_target(self):
+        self.app_ui.update_realtime_cps(39.84, "Sol", target_cps=40.0)
+        self.assertEqual(self.app_ui.real_time_cps_label.cget("text"), "Anlık Sol CPS: 39.8 (hedef 40.0)")
+
+    def test_update_rate_stats(self):
+        rate = MagicMock(label="Sol", cps_5s=39.9, min_interval_ms=24.1, max_interval_ms=26.0, jitter_ms=0.42)
+        self.app_ui.update_rate_stats([rate])
+        self.assertEqual(self.app_ui.rate_stats_label.cget("text"), "Sol 5 sn: 39.9 CPS | aralık 24.1-26.0 ms | sapma ±0.4 ms")
+
     def test_update_click_count(self):
         self.app_ui.update_click_count(123)
         self.assertEqual(self.app_ui.click_count_label.cget("text"), "Toplam Tıklama: 123")
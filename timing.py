@@ -0,0 +1,322 @@
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_right
+
+# Default busy-wait margin before a deadline. The remainder of every interval is slept.
+DEFAULT_SPIN_S = 0.0008
+# Upper bound for the adaptive margin so a single bad wakeup can't turn sleeping into spinning.
+MAX_SPIN_S = 0.02
+# If the click thread falls further behind its timeline than this (e.g. the machine was
+# suspended), the timeline is re-anchored instead of firing a catch-up burst.
+MAX_CATCHUP_S = 0.25
+# Upper bounds (µs) of the wakeup-latency histogram buckets; a last, open bucket takes the rest
+WAKEUP_BUCKETS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class WakeupHistogram:
+    """Counts how late the click thread's timed sleeps wake up, in log-spaced buckets."""
+    def __init__(self):
+        self.counts = [0] * (len(WAKEUP_BUCKETS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float):
+        latency_us = max(0.0, latency * 1e6)
+        self.counts[bisect_right(WAKEUP_BUCKETS_US, latency_us)] += 1
+        self.count += 1
+        self.total += latency_us
+        if latency_us > self.max:
+            self.max = latency_us
+
+    def percentile_us(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of wakeups, capped at the maximum seen."""
+        if not self.count:
+            return 0.0
+        rank, seen = fraction * self.count, 0
+        for bound, count in zip(WAKEUP_BUCKETS_US, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        labels = [f"<{bound}" for bound in WAKEUP_BUCKETS_US] + [f">={WAKEUP_BUCKETS_US[-1]}"]
+        return {
+            'wakeups': self.count,
+            'mean_us': self.total / self.count if self.count else 0.0,
+            'p50_us': self.percentile_us(0.5),
+            'p99_us': self.percentile_us(0.99),
+            'max_us': self.max,
+            'buckets_us': dict(zip(labels, self.counts)),
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        buckets = ", ".join(f"{label} µs: {count}" for label, count in s['buckets_us'].items() if count)
+        return (f"{s['wakeups']} uyanma, ort. {s['mean_us']:.0f} µs, p50 ≤{s['p50_us']:.0f} µs, "
+                f"p99 ≤{s['p99_us']:.0f} µs, maks. {s['max_us']:.0f} µs" + (f" | {buckets}" if buckets else ""))
+
+
+class DeadlineWaiter:
+    """
+    Hybrid sleep-then-spin waiter for the click thread.
+
+    Most of the interval is spent in a blocking `threading.Event.wait`, so the thread is
+    idle and can be woken immediately by setting the stop event. Only the last
+    `spin_s` seconds before the deadline are busy-waited to keep sub-millisecond accuracy.
+    The spin margin adapts to the observed oversleep of the platform's timed waits
+    (e.g. the coarse default timer on Windows) so deadlines are still met there.
+    """
+    name = "standart"
+
+    def __init__(self, stop_event: threading.Event, spin_s: float = DEFAULT_SPIN_S):
+        self.stop_event = stop_event
+        self.base_spin_s = spin_s
+        self.spin_s = spin_s
+        self._oversleep_ema = 0.0
+        self.wakeups = WakeupHistogram() # How late the timed waits woke up
+
+    def describe(self) -> str:
+        return self.name
+
+    def wait_until(self, deadline: float) -> bool:
+        """
+        Blocks until `time.perf_counter()` reaches `deadline`.
+
+        Args:
+            deadline (float): Absolute `time.perf_counter()` timestamp to wait for.
+
+        Returns:
+            bool: True if the deadline was reached, False if the stop event was set first.
+        """
+        stop_event = self.stop_event
+        perf_counter = time.perf_counter
+        sleep_s = deadline - perf_counter() - self.spin_s
+        if sleep_s > 0:
+            wake_target = perf_counter() + sleep_s
+            if stop_event.wait(sleep_s):
+                return False
+            oversleep = perf_counter() - wake_target
+            self.wakeups.record(oversleep)
+            self._adapt(oversleep)
+
+        while perf_counter() < deadline:
+            if stop_event.is_set():
+                return False
+        return not stop_event.is_set()
+
+    def _adapt(self, oversleep: float):
+        # Exponential moving average of how late timed waits wake up; spin a bit longer than that.
+        self._oversleep_ema += (max(0.0, oversleep) - self._oversleep_ema) * 0.1
+        self.spin_s = min(MAX_SPIN_S, max(self.base_spin_s, self._oversleep_ema * 1.5))
+
+
+# HighResWaiter: only this last stretch before the deadline is slept with clock_nanosleep, which
+# a stop request can't interrupt; it bounds the stop latency. Everything before it is an
+# interruptible event wait, already precise with the thread's minimal timer slack.
+NANOSLEEP_SLICE_S = 0.001
+HRTIMER_SPIN_S = 0.0001 # Starting busy-wait margin; nanosleep wakeups are far more punctual
+TIMER_SLACK_NS = 1 # Minimum the kernel accepts: no deliberate coalescing of our wakeups
+REALTIME_PRIORITY = 10 # SCHED_FIFO priority of the click thread with realtime=True
+REALTIME_NICE = -10 # Fallback when SCHED_FIFO isn't permitted
+
+_CLOCK_MONOTONIC = 1
+_TIMER_ABSTIME = 1
+_PR_SET_TIMERSLACK = 29
+_EINTR = 4
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith('linux'):
+            raise RuntimeError("Yüksek çözünürlüklü zamanlayıcı yalnızca Linux'ta kullanılabilir.")
+        clock = time.get_clock_info('perf_counter').implementation
+        if 'CLOCK_MONOTONIC' not in clock or 'RAW' in clock:
+            # Deadlines are perf_counter timestamps and are handed to the kernel unchanged
+            raise RuntimeError(f"perf_counter CLOCK_MONOTONIC kullanmıyor ({clock}).")
+        import ctypes # Imported here so startup doesn't pay for it unless the timer is used
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or "libc.so.6", use_errno=True)
+        libc.clock_nanosleep.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p]
+        libc.prctl.argtypes = [ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong]
+        _libc = libc
+    return _libc
+
+
+def raise_thread_priority() -> str | None:
+    """
+    Raises the calling thread's scheduling priority as far as permitted.
+
+    Returns:
+        str | None: What was applied ("SCHED_FIFO 10", "nice -10"), or None if nothing was permitted.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(REALTIME_PRIORITY))
+        return f"SCHED_FIFO {REALTIME_PRIORITY}"
+    except (AttributeError, OSError):
+        pass
+    try:
+        # On Linux the nice value is per thread; the native id targets just the click thread
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), REALTIME_NICE)
+        return f"nice {REALTIME_NICE}"
+    except (AttributeError, OSError):
+        return None
+
+
+class HighResWaiter(DeadlineWaiter):
+    """
+    Linux DeadlineWaiter that ends its sleeps with `clock_nanosleep` on the absolute
+    CLOCK_MONOTONIC deadline (the clock behind `time.perf_counter`), after lowering the click
+    thread's timer slack to the minimum. Optionally raises the thread's scheduling priority.
+    Must be created on the thread that waits: slack and priority are per thread.
+
+    Raises:
+        RuntimeError: If the platform doesn't support it.
+    """
+    name = "hrtimer"
+
+    def __init__(self, stop_event: threading.Event, spin_s: float = HRTIMER_SPIN_S, realtime: bool = False):
+        super().__init__(stop_event, spin_s)
+        import ctypes
+        libc = _load_libc()
+        self._clock_nanosleep = libc.clock_nanosleep
+        # Reused timespec so a sleep allocates nothing: two native longs, tv_sec and tv_nsec
+        self._timespec = (ctypes.c_long * 2)()
+        self._timespec_ref = ctypes.byref(self._timespec)
+        self.timer_slack_ns = TIMER_SLACK_NS if libc.prctl(_PR_SET_TIMERSLACK, TIMER_SLACK_NS, 0, 0, 0) == 0 else None
+        self.priority = raise_thread_priority() if realtime else None
+
+    def describe(self) -> str:
+        parts = [self.name, "slack varsayılan" if self.timer_slack_ns is None else f"slack {self.timer_slack_ns} ns"]
+        if self.priority:
+            parts.append(self.priority)
+        return ", ".join(parts)
+
+    def _sleep_until(self, target: float):
+        seconds = int(target)
+        self._timespec[0] = seconds
+        self._timespec[1] = int((target - seconds) * 1e9)
+        while self._clock_nanosleep(_CLOCK_MONOTONIC, _TIMER_ABSTIME, self._timespec_ref, None) == _EINTR:
+            pass # Interrupted by a signal: the absolute deadline makes retrying exact
+
+    def wait_until(self, deadline: float) -> bool:
+        stop_event = self.stop_event
+        perf_counter = time.perf_counter
+        # Long waits: the interruptible event wait covers all but the last slice
+        coarse_s = deadline - perf_counter() - NANOSLEEP_SLICE_S
+        slept = coarse_s > 0
+        if slept and stop_event.wait(coarse_s):
+            return False
+        wake_target = deadline - self.spin_s
+        if wake_target > perf_counter():
+            self._sleep_until(wake_target)
+            slept = True
+        if slept: # The event wait can overshoot the whole slice on a busy system: still a wakeup
+            oversleep = perf_counter() - wake_target
+            self.wakeups.record(oversleep)
+            self._adapt(oversleep)
+
+        while perf_counter() < deadline:
+            if stop_event.is_set():
+                return False
+        return not stop_event.is_set()
+
+
+WAITERS = {
+    "standard": DeadlineWaiter,
+    "hrtimer": HighResWaiter,
+}
+DEFAULT_TIMER = "standard"
+
+
+def get_waiter_class(name: str = DEFAULT_TIMER, realtime: bool = False):
+    """
+    Returns a factory `waiter(stop_event)` for the named timer, checked to work here.
+
+    Raises:
+        ValueError: If the name is unknown, or realtime is asked of a timer that doesn't support it.
+        RuntimeError: If the timer can't be used on this system.
+    """
+    if name not in WAITERS:
+        raise ValueError(f"Unknown timer: {name}")
+    if name == "hrtimer":
+        _load_libc()
+        return functools.partial(HighResWaiter, realtime=realtime)
+    if realtime:
+        raise ValueError("Gerçek zamanlı öncelik yalnızca hrtimer zamanlayıcısıyla kullanılabilir.")
+    return WAITERS[name]
+
+
+class TimelineStats:
+    """
+    Per-session lateness/drift statistics for an absolute-deadline click timeline.
+
+    Every click is recorded with the deadline it was scheduled for and the time it
+    actually fired. Because deadlines are derived from the session start plus the summed
+    intervals, injection cost shows up here as lateness instead of silently lowering the CPS.
+    """
+    def __init__(self):
+        self.count = 0
+        self.resyncs = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_inject = 0.0 # Time spent inside the backend's click call
+        self.max_inject = 0.0
+        self.first_deadline = None
+        self.first_fired = None
+        self.last_deadline = None
+        self.last_fired = None
+
+    def record(self, deadline: float, fired_at: float):
+        lateness = fired_at - deadline
+        if self.count == 0:
+            self.first_deadline, self.first_fired = deadline, fired_at
+        self.count += 1
+        self.total_lateness += lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        self.last_deadline, self.last_fired = deadline, fired_at
+
+    def record_injection(self, duration: float):
+        self.total_inject += duration
+        if duration > self.max_inject:
+            self.max_inject = duration
+
+    def summary(self) -> dict:
+        """Returns scheduled vs. achieved CPS, mean/max lateness and end-of-session drift."""
+        result = {
+            'clicks': self.count,
+            'scheduled_cps': 0.0,
+            'achieved_cps': 0.0,
+            'mean_lateness_ms': 0.0,
+            'max_lateness_ms': self.max_lateness * 1000.0,
+            'drift_ms': 0.0,
+            'resyncs': self.resyncs,
+            'inject_mean_us': 0.0,
+            'inject_max_us': self.max_inject * 1e6,
+        }
+        if self.count == 0:
+            return result
+        result['mean_lateness_ms'] = self.total_lateness / self.count * 1000.0
+        result['inject_mean_us'] = self.total_inject / self.count * 1e6
+        result['drift_ms'] = (self.last_fired - self.last_deadline) * 1000.0
+        scheduled_span = self.last_deadline - self.first_deadline
+        achieved_span = self.last_fired - self.first_fired
+        if scheduled_span > 0:
+            result['scheduled_cps'] = (self.count - 1) / scheduled_span
+        if achieved_span > 0:
+            result['achieved_cps'] = (self.count - 1) / achieved_span
+        return result
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        return (f"{s['clicks']} tıklama, hedef {s['scheduled_cps']:.2f} CPS, gerçekleşen {s['achieved_cps']:.2f} CPS, "
+                f"ort. gecikme {s['mean_lateness_ms']:.3f} ms, maks. {s['max_lateness_ms']:.3f} ms, "
+                f"sapma {s['drift_ms']:.3f} ms, yeniden senkron {s['resyncs']}, "
+                f"enjeksiyon ort. {s['inject_mean_us']:.0f} µs, maks. {s['inject_max_us']:.0f} µs")
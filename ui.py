@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 
+from recorder import DEFAULT_TRACE_PATH
+
 # --- SABİTLER ---
 COLOR_GREEN = "#009933"
 COLOR_RED = "#CC0000"
@@ -11,9 +13,30 @@ STATUS_RUNNING = "Durum: ÇALIŞIYOR"
 STATUS_IDLE = "Durum: Beklemede"
 STATUS_STOPPED = "Durum: Durduruldu"
 STATUS_ERROR = "Durum: Hatalı Ayar"
+ACTIVATION_TOGGLE = "Aç/Kapat" # Each trigger press starts or stops clicking
+ACTIVATION_HOLD = "Basılı Tut" # Clicks only while the trigger is held down
+ACTIVATION_MODES = (ACTIVATION_TOGGLE, ACTIVATION_HOLD)
 ASSIGN_KEY_PROMPT = "TUŞA BASIN VEYA FARE TUŞUNA TIKLAYIN... (İptal: ESC)"
 KEY_NOT_ASSIGNED = "ATANMADI"
 
+# Settings keys of `get_current_settings` and the tab variables holding them
+_SETTING_VARS = {
+    'mode': 'cps_mode_var',
+    'peak_cps': 'cps_var',
+    'timing_rand_ms': 'timing_rand_var',
+    'jitter_px': 'jitter_intensity_var',
+    'burst_duration': 'burst_duration_var',
+    'min_cps_random': 'min_cps_random_var',
+    'max_cps_random': 'max_cps_random_var',
+    'click_pattern': 'click_pattern_var',
+    'trace_path': 'trace_path_var',
+    'replay_speed': 'replay_speed_var',
+    'replay_order': 'replay_order_var',
+}
+REPLAY_ORDER_CHOICES = ["Sıralı", "Yeniden Örnekle"] # click_modes.REPLAY_ORDERS
+CAPTURE_START_TEXT = "İnsan Tıklamalarını Kaydet"
+CAPTURE_STOP_TEXT = "Kaydı Bitir"
+
 class Tooltip:
     """Widget'lar için fare üzerine gelince ipucu gösteren basit bir sınıf."""
     def __init__(self, widget, text):
@@ -39,13 +62,15 @@ class AutoClickerUI(tk.Tk):
         super().__init__()
         self.app_core = app_core
         self.title("Gelişmiş Otomatik Tıklayıcı v6.0")
-        self.geometry("550x750") # Increased width and height for tabs and more controls
+        self.geometry("550x910") # Increased width and height for tabs and more controls
         self.resizable(False, False)
         style = ttk.Style(self)
         style.theme_use('vista' if 'win' in sys.platform else 'clam')
 
         # Store all widgets that need to be enabled/disabled
         self.settings_widgets = []
+        # Settings that stay editable while running and are applied to the running session
+        self.live_widgets = []
         # Store widgets per tab to manage them easily
         self.left_click_widgets = {}
         self.right_click_widgets = {}
@@ -68,6 +93,8 @@ class AutoClickerUI(tk.Tk):
         self.status_label.pack(fill="x")
         self.real_time_cps_label = ttk.Label(status_info_frame, text="Anlık CPS: 0.0", font=("Segoe UI", 12, "italic"), anchor="center", foreground=COLOR_BLUE)
         self.real_time_cps_label.pack(fill="x")
+        self.rate_stats_label = ttk.Label(status_info_frame, text="", font=("Segoe UI", 9), anchor="center", justify="center")
+        self.rate_stats_label.pack(fill="x")
 
 
         # --- Notebook for Left and Right Click Settings ---
@@ -96,6 +123,7 @@ class AutoClickerUI(tk.Tk):
                                           state="readonly", width=25)
         active_click_combo.grid(row=0, column=1, sticky="ew", pady=(0,5))
         self.settings_widgets.append(active_click_combo) # Add to global list for enable/disable
+        self.active_click_config_var.trace_add('write', lambda *args: self.app_core.on_setting_changed())
 
         self.toggle_button = ttk.Button(global_controls_frame, text="Başlat", command=self.app_core.toggle_clicking, style="Accent.TButton") # Example of using a style
         self.toggle_button.grid(row=1, column=0, sticky="ew", pady=5, padx=(0,5))
@@ -109,6 +137,30 @@ class AutoClickerUI(tk.Tk):
                                            relief="sunken", padding=5)
         self.trigger_key_label.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(5,0))
 
+        # Profiles: stay usable while running, switching one applies it to the running session
+        profile_lbl = ttk.Label(global_controls_frame, text="Profil:")
+        profile_lbl.grid(row=3, column=0, sticky="w", pady=(10,5), padx=(0,5))
+        Tooltip(profile_lbl, "Ayarları adlandırıp kaydedin. Ctrl+Alt+F1-F9 ilk 9 profile geçer,\nçalışırken de kullanılabilir (kısayollar profil dosyasında değiştirilebilir).")
+        self.profile_var = tk.StringVar()
+        self.profile_combo = ttk.Combobox(global_controls_frame, textvariable=self.profile_var, width=25)
+        self.profile_combo.grid(row=3, column=1, sticky="ew", pady=(10,5))
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda e: self.app_core.load_profile(self.profile_var.get()))
+        ttk.Button(global_controls_frame, text="Profili Kaydet",
+                   command=lambda: self.app_core.save_profile(self.profile_var.get())).grid(row=4, column=0, sticky="ew", padx=(0,5))
+        ttk.Button(global_controls_frame, text="Profili Sil",
+                   command=lambda: self.app_core.delete_profile(self.profile_var.get())).grid(row=4, column=1, sticky="ew", padx=(5,0))
+
+        # Activation: toggle on each trigger press, or click only while the trigger is held
+        activation_lbl = ttk.Label(global_controls_frame, text="Tetikleme:")
+        activation_lbl.grid(row=5, column=0, sticky="w", pady=(10,0), padx=(0,5))
+        Tooltip(activation_lbl, "Aç/Kapat: her basış tıklamayı başlatır/durdurur.\nBasılı Tut: tetikleyici basılı tutulduğu sürece tıklar.")
+        self.activation_var = tk.StringVar(value=ACTIVATION_TOGGLE)
+        activation_combo = ttk.Combobox(global_controls_frame, textvariable=self.activation_var,
+                                        values=list(ACTIVATION_MODES), state="readonly", width=25)
+        activation_combo.grid(row=5, column=1, sticky="ew", pady=(10,0))
+        activation_combo.bind("<<ComboboxSelected>>", lambda e: self.app_core.set_activation(self.activation_var.get()))
+        self.settings_widgets.append(activation_combo)
+
 
         # --- Stats and Info ---
         stats_frame = ttk.Frame(main_frame)
@@ -133,13 +185,16 @@ class AutoClickerUI(tk.Tk):
         widgets_dict['min_cps_random_var'] = tk.StringVar(value="5.0")
         widgets_dict['max_cps_random_var'] = tk.StringVar(value="15.0")
         widgets_dict['click_pattern_var'] = tk.StringVar(value="100-80-120")
+        widgets_dict['trace_path_var'] = tk.StringVar(value=DEFAULT_TRACE_PATH)
+        widgets_dict['replay_speed_var'] = tk.StringVar(value="1.0")
+        widgets_dict['replay_order_var'] = tk.StringVar(value=REPLAY_ORDER_CHOICES[0])
 
 
         # Click Mode
         mode_lbl = ttk.Label(parent_frame, text="Tıklama Modu:")
         mode_lbl.grid(row=0, column=0, sticky="w", pady=5, padx=(0,5))
         mode_combo = ttk.Combobox(parent_frame, textvariable=widgets_dict['cps_mode_var'],
-                                  values=["Sabit", "Dalgalı (Sinüs)", "Patlama", "Gerçekçi (Perlin)", "Rastgele Aralık", "Pattern (Desen)"],
+                                  values=["Sabit", "Dalgalı (Sinüs)", "Patlama", "Gerçekçi (Perlin)", "Rastgele Aralık", "Pattern (Desen)", "Kayıt Tekrarı"],
                                   state="readonly")
         mode_combo.grid(row=0, column=1, sticky="ew", pady=5)
         mode_combo.bind("<<ComboboxSelected>>", lambda e, ct=click_type_prefix: self._on_mode_change(e, ct))
@@ -155,7 +210,7 @@ class AutoClickerUI(tk.Tk):
         widgets_dict['cps_scale'] = ttk.Scale(parent_frame, from_=1, to=40, orient="horizontal", variable=widgets_dict['cps_var'],
                                             command=lambda val, ct=click_type_prefix: self._update_cps_label_display(val, ct))
         widgets_dict['cps_scale'].grid(row=2, column=0, columnspan=2, sticky="ew", pady=(0,10))
-        self.settings_widgets.extend([widgets_dict['cps_title_label'], widgets_dict['cps_scale'], widgets_dict['cps_label_display']])
+        self.live_widgets.append(widgets_dict['cps_scale'])
 
 
         # --- Mode Specific Settings Frames (created once, shown/hidden in _on_mode_change) ---
@@ -183,11 +238,35 @@ class AutoClickerUI(tk.Tk):
         # Pattern Mode
         widgets_dict['pattern_mode_frame'] = ttk.Frame(parent_frame)
         pattern_lbl = ttk.Label(widgets_dict['pattern_mode_frame'], text="Pattern (gecikmeler ms, '-' ile ayrılmış):")
+        Tooltip(pattern_lbl, "Örnek: 100-50-200\n100x5: 5 kez tekrar, 80~120: aralıktan rastgele,\n(100-50)x3: grup, 120R / 90L: bu adımda sağ/sol tık,\n100@40: tuşu 40 ms basılı tut (gecikmeden kısa)")
         pattern_lbl.grid(row=0, column=0, sticky="w", columnspan=2)
         pattern_entry = ttk.Entry(widgets_dict['pattern_mode_frame'], textvariable=widgets_dict['click_pattern_var'], width=30)
         pattern_entry.grid(row=1, column=0, columnspan=2, sticky="ew")
         self.settings_widgets.extend([widgets_dict['pattern_mode_frame'], pattern_lbl, pattern_entry])
 
+        # Trace Replay Mode
+        replay_frame = widgets_dict['replay_frame'] = ttk.Frame(parent_frame)
+        replay_frame.columnconfigure(1, weight=1)
+        trace_lbl = ttk.Label(replay_frame, text="Kayıt Dosyası:")
+        Tooltip(trace_lbl, "Gerçek tıklamalarınızın kaydı. Kaydı başlatın, normal şekilde tıklayın\nve bitirin; aralıklar ve imleç hareketleri tekrarlanır.\n1 saniyeden uzun duraklamalar atlanır. İmleç hareketleri\nJitter Yoğunluğu ile sınırlanır; 0 iken imleç yerinde kalır.")
+        trace_lbl.grid(row=0, column=0, sticky="w")
+        trace_entry = ttk.Entry(replay_frame, textvariable=widgets_dict['trace_path_var'], width=30)
+        trace_entry.grid(row=0, column=1, sticky="ew")
+        speed_lbl = ttk.Label(replay_frame, text="Tekrar Hızı (x):")
+        speed_lbl.grid(row=1, column=0, sticky="w", pady=(5,0))
+        speed_entry = ttk.Entry(replay_frame, textvariable=widgets_dict['replay_speed_var'], width=12)
+        speed_entry.grid(row=1, column=1, sticky="e", pady=(5,0))
+        order_lbl = ttk.Label(replay_frame, text="Sıra:")
+        order_lbl.grid(row=2, column=0, sticky="w", pady=(5,0))
+        order_combo = ttk.Combobox(replay_frame, textvariable=widgets_dict['replay_order_var'],
+                                   values=REPLAY_ORDER_CHOICES, state="readonly", width=16)
+        order_combo.grid(row=2, column=1, sticky="e", pady=(5,0))
+        widgets_dict['capture_button'] = ttk.Button(replay_frame, text=CAPTURE_START_TEXT,
+                                                    command=lambda: self.app_core.toggle_capture(widgets_dict['trace_path_var'].get()))
+        widgets_dict['capture_button'].grid(row=3, column=0, columnspan=2, sticky="ew", pady=(5,0))
+        self.settings_widgets.extend([replay_frame, trace_lbl, trace_entry, speed_lbl, speed_entry, order_lbl, order_combo,
+                                      widgets_dict['capture_button']])
+
         # --- Common Settings (Timing, Jitter) ---
         # These are placed starting from row 3, after mode-specific settings might be inserted.
         # The mode-specific frames will be grid() or grid_remove() into row=3.
@@ -197,15 +276,19 @@ class AutoClickerUI(tk.Tk):
         timing_lbl.grid(row=current_row, column=0, sticky="w", pady=5, padx=(0,5))
         timing_entry = ttk.Entry(parent_frame, textvariable=widgets_dict['timing_rand_var'], width=12)
         timing_entry.grid(row=current_row, column=1, sticky="e", pady=5)
-        self.settings_widgets.extend([timing_lbl, timing_entry])
+        self.live_widgets.append(timing_entry)
         current_row += 1
 
         jitter_lbl = ttk.Label(parent_frame, text="Jitter Yoğunluğu (Piksel):")
         jitter_lbl.grid(row=current_row, column=0, sticky="w", pady=5, padx=(0,5))
         jitter_entry = ttk.Entry(parent_frame, textvariable=widgets_dict['jitter_intensity_var'], width=12)
         jitter_entry.grid(row=current_row, column=1, sticky="e", pady=5)
-        self.settings_widgets.extend([jitter_lbl, jitter_entry])
+        self.live_widgets.append(jitter_entry)
         current_row += 1
+
+        # Every edit is compiled ahead of the trigger; CPS, timing and jitter edits also reach a running session
+        for var_name in _SETTING_VARS.values():
+            widgets_dict[var_name].trace_add('write', lambda *args: self.app_core.on_setting_changed())
         # Note: The old "Mouse Button" selection is now replaced by the "Active Click Configuration" global setting.
 
     def _on_mode_change(self, event, click_type: str):
@@ -217,6 +300,7 @@ class AutoClickerUI(tk.Tk):
         widgets_dict['burst_frame'].grid_forget()
         widgets_dict['random_interval_frame'].grid_forget()
         widgets_dict['pattern_mode_frame'].grid_forget()
+        widgets_dict['replay_frame'].grid_forget()
 
         cps_title = "Hedef Hız (CPS):"
         show_main_cps_scale = True
@@ -238,6 +322,9 @@ class AutoClickerUI(tk.Tk):
             cps_title = "Ref. Jitter CPS:"
             show_main_cps_scale = False # CPS scale not directly used for pattern delays
             widgets_dict['pattern_mode_frame'].grid(row=mode_specific_frame_row, column=0, columnspan=2, sticky='ew', pady=5)
+        elif mode == "Kayıt Tekrarı":
+            show_main_cps_scale = False # The speed comes from the trace
+            widgets_dict['replay_frame'].grid(row=mode_specific_frame_row, column=0, columnspan=2, sticky='ew', pady=5)
 
         widgets_dict['cps_title_label'].config(text=cps_title)
 
@@ -278,12 +365,21 @@ class AutoClickerUI(tk.Tk):
                  # This can happen for frames or labels that are in settings_widgets but don't have a state
                 pass
 
-    def update_realtime_cps(self, cps, click_type_str: str = ""):
-        """Updates the real-time CPS display, optionally indicating click type."""
+    def update_realtime_cps(self, cps, click_type_str: str = "", target_cps: float | None = None):
+        """Updates the real-time CPS display, optionally indicating click type and the requested CPS."""
         if click_type_str:
-            self.real_time_cps_label.config(text=f"Anlık {click_type_str} CPS: {cps:.1f}")
+            text = f"Anlık {click_type_str} CPS: {cps:.1f}"
         else:
-            self.real_time_cps_label.config(text=f"Anlık CPS: {cps:.1f}")
+            text = f"Anlık CPS: {cps:.1f}"
+        if target_cps:
+            text += f" (hedef {target_cps:.1f})"
+        self.real_time_cps_label.config(text=text)
+
+    def update_rate_stats(self, rates):
+        """Shows the measured 5 s rate and interval min/max/jitter, one line per click type."""
+        lines = [f"{rate.label} 5 sn: {rate.cps_5s:.1f} CPS | aralık {rate.min_interval_ms:.1f}-{rate.max_interval_ms:.1f} ms"
+                 f" | sapma ±{rate.jitter_ms:.1f} ms" for rate in rates]
+        self.rate_stats_label.config(text="\n".join(lines))
 
 
     def update_click_count(self, count):
@@ -317,8 +413,45 @@ class AutoClickerUI(tk.Tk):
             settings['max_cps_random'] = widgets_dict['max_cps_random_var'].get()
         elif settings['mode'] == 'Pattern (Desen)':
             settings['click_pattern'] = widgets_dict['click_pattern_var'].get()
+        elif settings['mode'] == 'Kayıt Tekrarı':
+            settings['trace_path'] = widgets_dict['trace_path_var'].get()
+            settings['replay_speed'] = widgets_dict['replay_speed_var'].get()
+            settings['replay_order'] = widgets_dict['replay_order_var'].get()
         return settings
 
+    def apply_settings(self, settings: dict):
+        """Loads settings in the shape of `get_current_settings` into the widgets; missing values are kept."""
+        if settings.get('active_config'):
+            self.active_click_config_var.set(settings['active_config'])
+        for click_type in ('left', 'right'):
+            tab_settings = settings.get(click_type) or {}
+            widgets_dict = self.left_click_widgets if click_type == 'left' else self.right_click_widgets
+            for key, var_name in _SETTING_VARS.items():
+                if key in tab_settings:
+                    widgets_dict[var_name].set(tab_settings[key])
+            self._update_cps_label_display(widgets_dict['cps_var'].get(), click_type)
+            self._on_mode_change(event=None, click_type=click_type)
+
+    def update_capture_state(self, capturing: bool):
+        for widgets_dict in (self.left_click_widgets, self.right_click_widgets):
+            widgets_dict['capture_button'].config(text=CAPTURE_STOP_TEXT if capturing else CAPTURE_START_TEXT)
+
+    def nudge_cps(self, click_type: str, step: float) -> float:
+        """Moves a tab's CPS scale by `step`, within the scale's range; returns the new CPS."""
+        widgets_dict = self.left_click_widgets if click_type == 'left' else self.right_click_widgets
+        scale = widgets_dict['cps_scale']
+        cps = min(max(widgets_dict['cps_var'].get() + step, float(scale.cget('from'))), float(scale.cget('to')))
+        widgets_dict['cps_var'].set(cps)
+        self._update_cps_label_display(cps, click_type)
+        return cps
+
+    def update_activation_display(self, activation: str):
+        self.activation_var.set(activation)
+
+    def update_profile_list(self, names: list[str], current: str | None = None):
+        self.profile_combo.config(values=names)
+        self.profile_var.set(current or "")
+
     def get_current_settings(self) -> dict:
         """Returns a dictionary of all UI settings, including both tabs and global settings."""
         return {
@@ -333,6 +466,12 @@ if __name__ == '__main__':
         def set_assign_mode(self): print("Set Assign Mode")
         def emergency_shutdown(self): print("Emergency Shutdown"); app.destroy(); sys.exit()
         def on_mode_changed(self, mode_name, click_type): print(f"Mode for {click_type} changed to: {mode_name}")
+        def load_profile(self, name): print(f"Load profile: {name}")
+        def save_profile(self, name): print(f"Save profile: {name}")
+        def delete_profile(self, name): print(f"Delete profile: {name}")
+        def on_setting_changed(self): pass
+        def toggle_capture(self, path): print(f"Toggle capture: {path}")
+        def set_activation(self, activation): print(f"Activation: {activation}")
 
     core = MockAppCore()
     app = AutoClickerUI(core)